@@ -0,0 +1,203 @@
+"""initial schema
+
+Revision ID: 0f3a9c2d1b7e
+Revises:
+Create Date: 2026-01-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0f3a9c2d1b7e'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tabelas como existiam antes de 7395dace311a (até então criadas via create_all).
+# Colunas adicionadas pelas revisões seguintes ficam de fora.
+userrole = postgresql.ENUM('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole', create_type=False)
+operationstatus = postgresql.ENUM(
+    'CREATED', 'AT_ORIGIN', 'LOADED', 'IN_TRANSIT', 'AT_HUB', 'UNLOADED', 'COMPLETED', 'DELIVERED', 'CANCELED',
+    name='operationstatus', create_type=False,
+)
+movemententitytype = postgresql.ENUM(
+    'OPERATION', 'PRODUCT', 'USER', 'COMPANY', 'PARTNER', name='movemententitytype', create_type=False,
+)
+movementtype = postgresql.ENUM(
+    'OPERATION_CREATED', 'CREATION', 'DELETED', 'CANCELED', 'UPDATED', 'COMPLETED',
+    'INPUT', 'OUTPUT', 'ACTIVATED', 'DEACTIVATED', 'STATUS_CHANGED', 'LOADED', 'UNLOADED',
+    'IN_TRANSIT', 'ARRIVED_AT_HUB', 'DELAY_REPORTED', 'INCIDENT_REPORTED',
+    'LOGIN', 'LOGOUT', 'PASSWORD_CHANGE', 'ROLE_CHANGE',
+    name='movementtype', create_type=False,
+)
+ENUMS = (userrole, operationstatus, movemententitytype, movementtype)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # operationstatus é usado em mais de uma tabela: cria os tipos uma vez, antes delas
+    for enum in ENUMS:
+        enum.create(bind, checkfirst=True)
+
+    op.create_table(
+        'companies',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('cnpj', sa.String(length=14), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('cnpj'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_companies_id'), 'companies', ['id'], unique=False)
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('reset_password_token', sa.String(length=255), nullable=True),
+        sa.Column('reset_password_token_expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('role', userrole, nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='RESTRICT'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('reset_password_token')
+    )
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+
+    op.create_table(
+        'partners',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('document', sa.String(length=20), nullable=True),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=50), nullable=True),
+        sa.Column('city', sa.String(length=100), nullable=True),
+        sa.Column('state', sa.String(length=2), nullable=True),
+        sa.Column('address', sa.String(length=255), nullable=True),
+        sa.Column('is_customer', sa.Boolean(), nullable=True),
+        sa.Column('is_supplier', sa.Boolean(), nullable=True),
+        sa.Column('active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_partners_company_id'), 'partners', ['company_id'], unique=False)
+
+    # created_at/updated_at ainda em texto: df6e4e7668e5 converte para timestamp
+    op.create_table(
+        'products',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('description', sa.String(length=255), nullable=True),
+        sa.Column('sku', sa.String(length=80), nullable=True),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_by', sa.UUID(), nullable=True),
+        sa.Column('created_at', sa.VARCHAR(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.VARCHAR(), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_products_id'), 'products', ['id'], unique=False)
+    op.create_index(op.f('ix_products_company_id'), 'products', ['company_id'], unique=False)
+    op.create_index(op.f('ix_products_sku'), 'products', ['sku'], unique=False)
+
+    op.create_table(
+        'operations',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('status', operationstatus, nullable=False),
+        sa.Column('origin', sa.String(length=255), nullable=True),
+        sa.Column('destination', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_operations_company_id'), 'operations', ['company_id'], unique=False)
+
+    op.create_table(
+        'operation_items',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('operation_id', sa.UUID(), nullable=True),
+        sa.Column('product_id', sa.UUID(), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('unit_price', sa.Float(), nullable=True),
+        sa.Column('subtotal', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['operation_id'], ['operations.id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    op.create_table(
+        'movements',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=True),
+        sa.Column('entity_type', movemententitytype, nullable=False),
+        sa.Column('entity_id', sa.UUID(), nullable=False),
+        sa.Column('type', movementtype, nullable=False),
+        sa.Column('previous_status', operationstatus, nullable=True),
+        sa.Column('new_status', operationstatus, nullable=True),
+        sa.Column('description', sa.String(length=500), nullable=True),
+        sa.Column('created_by', sa.UUID(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id']),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_movements_company_id'), 'movements', ['company_id'], unique=False)
+    op.create_index(op.f('ix_movements_entity_id'), 'movements', ['entity_id'], unique=False)
+
+    op.create_table(
+        'system_settings',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('maintenance_mode', sa.Boolean(), nullable=False),
+        sa.Column('allow_registrations', sa.Boolean(), nullable=False),
+        sa.Column('session_timeout', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_by', sa.UUID(), nullable=True),
+        sa.ForeignKeyConstraint(['updated_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('system_settings')
+    op.drop_index(op.f('ix_movements_entity_id'), table_name='movements')
+    op.drop_index(op.f('ix_movements_company_id'), table_name='movements')
+    op.drop_table('movements')
+    op.drop_table('operation_items')
+    op.drop_index(op.f('ix_operations_company_id'), table_name='operations')
+    op.drop_table('operations')
+    op.drop_index(op.f('ix_products_sku'), table_name='products')
+    op.drop_index(op.f('ix_products_company_id'), table_name='products')
+    op.drop_index(op.f('ix_products_id'), table_name='products')
+    op.drop_table('products')
+    op.drop_index(op.f('ix_partners_company_id'), table_name='partners')
+    op.drop_table('partners')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_companies_id'), table_name='companies')
+    op.drop_table('companies')
+
+    bind = op.get_bind()
+    for enum in reversed(ENUMS):
+        enum.drop(bind, checkfirst=True)
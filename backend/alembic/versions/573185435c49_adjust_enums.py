@@ -21,7 +21,7 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_table('system_settings')
+    # system_settings continua em uso (model SystemSetting): não é removida
     op.alter_column('users', 'role',
                existing_type=postgresql.ENUM('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole'),
                type_=sa.Enum('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole', schema='public'),
@@ -36,14 +36,4 @@ def downgrade() -> None:
                existing_type=sa.Enum('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole', schema='public'),
                type_=postgresql.ENUM('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole'),
                existing_nullable=False)
-    op.create_table('system_settings',
-    sa.Column('id', sa.UUID(), autoincrement=False, nullable=False),
-    sa.Column('maintenance_mode', sa.BOOLEAN(), autoincrement=False, nullable=False),
-    sa.Column('allow_registrations', sa.BOOLEAN(), autoincrement=False, nullable=False),
-    sa.Column('session_timeout', sa.INTEGER(), autoincrement=False, nullable=False),
-    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), autoincrement=False, nullable=False),
-    sa.Column('updated_by', sa.UUID(), autoincrement=False, nullable=True),
-    sa.ForeignKeyConstraint(['updated_by'], ['users.id'], name=op.f('system_settings_updated_by_fkey')),
-    sa.PrimaryKeyConstraint('id', name=op.f('system_settings_pkey'))
-    )
     # ### end Alembic commands ###
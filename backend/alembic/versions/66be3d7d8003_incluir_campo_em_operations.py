@@ -24,7 +24,10 @@ def upgrade() -> None:
     op.add_column('operations', sa.Column('operation_number', sa.String(length=20), nullable=False))
     op.add_column('operations', sa.Column('partner_id', sa.UUID(), nullable=True))
     op.add_column('operations', sa.Column('total_value', sa.Numeric(precision=10, scale=2), nullable=True))
-    op.add_column('operations', sa.Column('type', sa.Enum('DELIVERY', 'PICKUP', 'TRANSFER', 'RETURN', name='operationtype'), nullable=False))
+    # add_column não emite CREATE TYPE: o enum precisa existir antes da coluna
+    operationtype = postgresql.ENUM('DELIVERY', 'PICKUP', 'TRANSFER', 'RETURN', name='operationtype', create_type=False)
+    operationtype.create(op.get_bind(), checkfirst=True)
+    op.add_column('operations', sa.Column('type', operationtype, nullable=False))
     op.create_index(op.f('ix_operations_operation_number'), 'operations', ['operation_number'], unique=True)
     op.create_index(op.f('ix_operations_partner_id'), 'operations', ['partner_id'], unique=False)
     op.drop_constraint(op.f('operations_updated_by_fkey'), 'operations', type_='foreignkey')
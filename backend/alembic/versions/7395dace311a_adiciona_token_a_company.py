@@ -1,7 +1,7 @@
 """Adiciona token a Company
 
 Revision ID: 7395dace311a
-Revises: 
+Revises: 0f3a9c2d1b7e
 Create Date: 2026-01-19 17:17:01.259773
 
 """
@@ -13,7 +13,7 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = '7395dace311a'
-down_revision: Union[str, Sequence[str], None] = None
+down_revision: Union[str, Sequence[str], None] = '0f3a9c2d1b7e'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
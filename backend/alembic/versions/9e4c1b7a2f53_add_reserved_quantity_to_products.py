@@ -0,0 +1,27 @@
+"""add reserved_quantity to products
+
+Revision ID: 9e4c1b7a2f53
+Revises: 5d2e8b7c9a31
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4c1b7a2f53'
+down_revision: Union[str, Sequence[str], None] = '5d2e8b7c9a31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('reserved_quantity', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('products', 'reserved_quantity')
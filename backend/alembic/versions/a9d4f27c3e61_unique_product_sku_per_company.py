@@ -0,0 +1,36 @@
+"""unique product sku per company (upsert target of the product import)
+
+Revision ID: a9d4f27c3e61
+Revises: f3c7a1e5b829
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4f27c3e61'
+down_revision: Union[str, Sequence[str], None] = 'f3c7a1e5b829'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # O índice falharia com duplicatas já gravadas; a mensagem aponta quais corrigir
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT company_id, sku, COUNT(*) FROM products "
+        "WHERE sku IS NOT NULL GROUP BY company_id, sku HAVING COUNT(*) > 1"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{company_id}/{sku} ({count}x)" for company_id, sku, count in duplicates[:20])
+        raise RuntimeError(f"SKUs duplicados por empresa; renomeie antes de migrar: {listed}")
+
+    op.create_index('uq_products_company_sku', 'products', ['company_id', 'sku'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_products_company_sku', table_name='products')
@@ -21,12 +21,7 @@ depends_on: Union[str, Sequence[str], None] = None
 def upgrade() -> None:
     """Upgrade schema."""
     # ### commands auto generated by Alembic - please adjust! ###
-    op.create_unique_constraint(None, 'companies', ['token'])
-    op.add_column('operations', sa.Column('updated_by', sa.UUID(), nullable=True))
-    op.create_foreign_key(None, 'operations', 'users', ['updated_by'], ['id'])
-    op.add_column('products', sa.Column('quantity', sa.Integer(), nullable=False, server_default='1'))
-    op.add_column('products', sa.Column('updated_by', sa.UUID(), nullable=True))
-    op.create_foreign_key(None, 'products', 'users', ['updated_by'], ['id'], ondelete='SET NULL')
+    # token, operations.updated_by e products.quantity/updated_by já vêm de 7395dace311a
     op.add_column('users', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
     op.alter_column('users', 'role',
                existing_type=postgresql.ENUM('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole'),
@@ -43,10 +38,4 @@ def downgrade() -> None:
                type_=postgresql.ENUM('ADMIN', 'MANAGER', 'USER', 'SYSTEM_ADMIN', name='userrole'),
                existing_nullable=False)
     op.drop_column('users', 'updated_at')
-    op.drop_constraint(None, 'products', type_='foreignkey')
-    op.drop_column('products', 'updated_by')
-    op.drop_column('products', 'quantity')
-    op.drop_constraint(None, 'operations', type_='foreignkey')
-    op.drop_column('operations', 'updated_by')
-    op.drop_constraint(None, 'companies', type_='unique')
     # ### end Alembic commands ###
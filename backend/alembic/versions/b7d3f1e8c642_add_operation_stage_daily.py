@@ -0,0 +1,49 @@
+"""add operation_stage_daily
+
+Revision ID: b7d3f1e8c642
+Revises: 9e4c1b7a2f53
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3f1e8c642'
+down_revision: Union[str, Sequence[str], None] = '9e4c1b7a2f53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'operation_stage_daily',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('partner_id', sa.UUID(), nullable=True),
+        sa.Column('stage', sa.String(length=32), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.Column('total_seconds', sa.Float(), nullable=False),
+        sa.Column('p50_seconds', sa.Float(), nullable=False),
+        sa.Column('p95_seconds', sa.Float(), nullable=False),
+        sa.Column('max_seconds', sa.Float(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_operation_stage_daily_day'), 'operation_stage_daily', ['day'], unique=False)
+    op.create_index('ix_operation_stage_daily_company_day', 'operation_stage_daily', ['company_id', 'day'], unique=False)
+    # Acelera o LAG por operação na leitura do histórico
+    op.create_index('ix_movements_entity_id_created_at', 'movements', ['entity_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movements_entity_id_created_at', table_name='movements')
+    op.drop_index('ix_operation_stage_daily_company_day', table_name='operation_stage_daily')
+    op.drop_index(op.f('ix_operation_stage_daily_day'), table_name='operation_stage_daily')
+    op.drop_table('operation_stage_daily')
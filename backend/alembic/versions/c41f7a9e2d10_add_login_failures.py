@@ -0,0 +1,43 @@
+"""add login_failures
+
+Revision ID: c41f7a9e2d10
+Revises: bf33b10b82f2
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7a9e2d10'
+down_revision: Union[str, Sequence[str], None] = 'bf33b10b82f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'login_failures',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('username', sa.String(length=255), nullable=False),
+        sa.Column('ip_address', sa.String(length=64), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('rate_limited', sa.Integer(), nullable=False),
+        sa.Column('first_attempt_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_attempt_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_login_failures_username'), 'login_failures', ['username'], unique=False)
+    op.create_index(op.f('ix_login_failures_ip_address'), 'login_failures', ['ip_address'], unique=False)
+    op.create_index(op.f('ix_login_failures_last_attempt_at'), 'login_failures', ['last_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_login_failures_last_attempt_at'), table_name='login_failures')
+    op.drop_index(op.f('ix_login_failures_ip_address'), table_name='login_failures')
+    op.drop_index(op.f('ix_login_failures_username'), table_name='login_failures')
+    op.drop_table('login_failures')
@@ -0,0 +1,34 @@
+"""add operation_counters (per-company operation number allocation)
+
+Revision ID: c6e1b9d4a27f
+Revises: a9d4f27c3e61
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e1b9d4a27f'
+down_revision: Union[str, Sequence[str], None] = 'a9d4f27c3e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sem carga inicial: a primeira reserva de cada empresa parte do MAX(operation_number) atual
+    op.create_table(
+        'operation_counters',
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('last_number', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('company_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('operation_counters')
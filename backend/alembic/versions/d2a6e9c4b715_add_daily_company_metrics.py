@@ -0,0 +1,51 @@
+"""add daily_company_metrics and rollup_watermarks
+
+Revision ID: d2a6e9c4b715
+Revises: b7d3f1e8c642
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6e9c4b715'
+down_revision: Union[str, Sequence[str], None] = 'b7d3f1e8c642'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_company_metrics',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('operations_created', sa.Integer(), nullable=False),
+        sa.Column('operations_completed', sa.Integer(), nullable=False),
+        sa.Column('operations_canceled', sa.Integer(), nullable=False),
+        sa.Column('total_value', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('logins', sa.Integer(), nullable=False),
+        sa.Column('new_products', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('company_id', 'day', name='uq_daily_company_metrics_company_day')
+    )
+    op.create_index(op.f('ix_daily_company_metrics_day'), 'daily_company_metrics', ['day'], unique=False)
+    op.create_table(
+        'rollup_watermarks',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rollup_watermarks')
+    op.drop_index(op.f('ix_daily_company_metrics_day'), table_name='daily_company_metrics')
+    op.drop_table('daily_company_metrics')
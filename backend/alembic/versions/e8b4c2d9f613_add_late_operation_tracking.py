@@ -0,0 +1,50 @@
+"""add late operation flag, partial indexes and late_operation_counts
+
+Revision ID: e8b4c2d9f613
+Revises: d2a6e9c4b715
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4c2d9f613'
+down_revision: Union[str, Sequence[str], None] = 'd2a6e9c4b715'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPEN_OPERATION_FILTER = "status NOT IN ('CANCELED', 'COMPLETED', 'DELIVERED')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('operations', sa.Column('late_flagged_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_operations_open_expected_delivery', 'operations', ['expected_delivery_date'], unique=False,
+        postgresql_where=sa.text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NULL"),
+        sqlite_where=sa.text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NULL"),
+    )
+    op.create_index(
+        'ix_operations_open_late_company', 'operations', ['company_id'], unique=False,
+        postgresql_where=sa.text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NOT NULL"),
+        sqlite_where=sa.text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NOT NULL"),
+    )
+    op.create_table(
+        'late_operation_counts',
+        sa.Column('company_id', sa.UUID(), nullable=False),
+        sa.Column('late_count', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('company_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('late_operation_counts')
+    op.drop_index('ix_operations_open_late_company', table_name='operations')
+    op.drop_index('ix_operations_open_expected_delivery', table_name='operations')
+    op.drop_column('operations', 'late_flagged_at')
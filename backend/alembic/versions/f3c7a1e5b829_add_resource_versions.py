@@ -0,0 +1,34 @@
+"""add resource_versions
+
+Revision ID: f3c7a1e5b829
+Revises: e8b4c2d9f613
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c7a1e5b829'
+down_revision: Union[str, Sequence[str], None] = 'e8b4c2d9f613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resource_versions',
+        sa.Column('scope', sa.String(length=36), nullable=False),
+        sa.Column('resource', sa.String(length=32), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'resource')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('resource_versions')
@@ -0,0 +1,50 @@
+'''Backfill dos rollups diários (daily_company_metrics e operation_stage_daily).
+
+Recalcula o intervalo em blocos (uma transação por bloco), sem mexer na marca
+d'água do job incremental. Pode ser repetido: cada dia é regravado por inteiro.
+
+Uso (a partir de backend/):
+    python -m app.commands.backfill_metrics --start 2025-01-01 [--end 2025-06-30] [--company UUID] [--stages]
+'''
+import argparse
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from app.database import SessionLocal
+from app.services.company_metrics_service import CompanyMetricsService
+from app.services.stage_analytics_service import StageAnalyticsService
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recalcula os rollups diários de um intervalo.")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="Primeiro dia (AAAA-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Último dia, inclusivo (padrão: hoje)")
+    parser.add_argument("--company", type=uuid.UUID, help="Restringe a uma empresa")
+    parser.add_argument("--chunk-days", type=int, default=31, help="Dias por transação")
+    parser.add_argument("--stages", action="store_true", help="Também recalcula operation_stage_daily")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    end = args.end or datetime.now(timezone.utc).date()
+    if end < args.start:
+        raise SystemExit("--end deve ser maior ou igual a --start")
+
+    with SessionLocal() as db:
+        written = CompanyMetricsService(db).backfill(args.start, end, args.company, args.chunk_days)
+        print(f"daily_company_metrics: {written} linhas ({args.start} a {end})")
+
+        if args.stages:
+            stages = StageAnalyticsService(db)
+            written = 0
+            chunk_start = args.start
+            while chunk_start <= end:
+                chunk_end = min(chunk_start + timedelta(days=args.chunk_days - 1), end)
+                written += stages.refresh(chunk_start, chunk_end, args.company)
+                chunk_start = chunk_end + timedelta(days=1)
+            print(f"operation_stage_daily: {written} linhas ({args.start} a {end})")
+
+
+if __name__ == "__main__":
+    main()
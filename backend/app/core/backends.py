@@ -0,0 +1,29 @@
+# Dependências
+import importlib
+
+# ---------------------------------------------------
+# Escolha de backend por configuração
+# ---------------------------------------------------
+# Rate limit, cache de respostas e eventos aceitam o mesmo formato de
+# configuração: "memory" (um worker), URL redis:// (vários workers) ou
+# "pacote.modulo:Classe" para um backend próprio.
+
+def load_backend(spec: str, memory_cls: type, redis_cls: type):
+    '''
+    Cria o backend descrito por `spec`.
+
+    :param spec: "memory", uma URL redis:// / rediss:// ou "pacote.modulo:Classe"
+        (backend próprio, instanciado sem argumentos).
+    :param memory_cls: Classe usada para "memory" (sem argumentos).
+    :param redis_cls: Classe usada para URLs redis (recebe a URL).
+    :return: Instância do backend.
+    :raises ValueError: Se `spec` não estiver em nenhum dos formatos.
+    '''
+    if spec.startswith(("redis://", "rediss://")):
+        return redis_cls(spec)
+    if spec == "memory":
+        return memory_cls()
+    if ":" in spec:
+        module_name, _, class_name = spec.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)()
+    raise ValueError(f"Backend desconhecido: {spec} (use 'memory', redis://... ou 'pacote.modulo:Classe')")
@@ -0,0 +1,205 @@
+# Dependências
+import zlib
+from typing import Iterable
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Codificações opcionais (instale "brotli" e/ou "zstandard" para habilitar)
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende do ambiente
+    zstandard = None
+
+# Tipos de conteúdo que compensam compressão
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+# -------------------------
+# Compressores
+# -------------------------
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        # Em streaming usa Z_SYNC_FLUSH para o cliente receber cada parte sem esperar o fim
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=min(level, 11))
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._obj.process(data) + (self._obj.finish() if final else self._obj.flush())
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        return self._obj.compress(data) + self._obj.flush(flush_mode)
+
+
+def available_encodings() -> dict[str, type]:
+    '''Retorna as codificações suportadas no ambiente atual {nome: compressor}.'''
+    encodings = {"gzip": _GzipCompressor}
+    if brotli is not None:
+        encodings["br"] = _BrotliCompressor
+    if zstandard is not None:
+        encodings["zstd"] = _ZstdCompressor
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, preferred: Iterable[str]) -> str | None:
+    '''
+    Escolhe a codificação a partir do cabeçalho Accept-Encoding.
+
+    :param accept_encoding: Valor do cabeçalho Accept-Encoding.
+    :param preferred: Codificações habilitadas, em ordem de preferência do servidor.
+    :return: Codificação escolhida ou None.
+    '''
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+
+    for encoding in preferred:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+# -------------------------
+# Middleware
+# -------------------------
+class CompressionMiddleware:
+    '''Middleware ASGI de compressão de respostas.
+
+    - Comprime apenas tipos de conteúdo da allowlist e corpos com pelo menos
+      `minimum_size` bytes.
+    - Negocia br/zstd (se instalados) e gzip via Accept-Encoding.
+    - Respostas em streaming (StreamingResponse) são comprimidas parte a
+      parte, com flush a cada parte e sem Content-Length.
+    - Respostas já codificadas (ex: .br/.gz da SPA) passam intactas.
+    '''
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: int = 6,
+        encodings: Iterable[str] = ("br", "zstd", "gzip"),
+        compressible_types: Iterable[str] = DEFAULT_COMPRESSIBLE_TYPES,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        supported = available_encodings()
+        self.compressors = {name: supported[name] for name in encodings if name in supported}
+        self.compressible_types = tuple(compressible_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""),
+            self.compressors.keys()
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def is_compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type.startswith(self.compressible_types)
+
+
+class _CompressionResponder:
+    '''Intercepta as mensagens de uma resposta e decide se/como comprimir.'''
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Segura o início até ver o primeiro corpo
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+
+            if not self.middleware.is_compressible(headers) or (
+                not more_body and len(body) < self.middleware.minimum_size
+            ):
+                self.passthrough = True
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            self.compressor = self.middleware.compressors[self.encoding](self.middleware.level)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if more_body:
+                # Streaming: tamanho final desconhecido
+                del headers["Content-Length"]
+                await self._send(self.start_message)
+            else:
+                compressed = self.compressor.compress(body, final=True)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+        await self._send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
@@ -11,4 +11,93 @@ JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 60))
 
 # Validação das variáveis de ambiente obrigatórias
 if not JWT_SECRET_KEY:
-    raise ValueError("JWT_SECRET_KEY environment variable is not set")
\ No newline at end of file
+    raise ValueError("JWT_SECRET_KEY environment variable is not set")
+
+# Modo de manutenção: por quanto tempo cada worker reaproveita a flag lida do banco
+MAINTENANCE_CACHE_SECONDS = float(os.getenv("MAINTENANCE_CACHE_SECONDS", 5))
+
+# Verificação do estado das migrations no startup: "strict" (falha), "warn" ou "off"
+MIGRATION_CHECK_MODE = os.getenv("MIGRATION_CHECK_MODE", "warn").lower()
+
+# Compressão de respostas HTTP
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))  # Em bytes
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 6))  # Nível do gzip (1-9)
+COMPRESSION_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.getenv("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(",")
+    if encoding.strip()
+]
+# Content-Types comprimidos (prefixos; "text/" cobre text/html, text/css, ...)
+COMPRESSION_CONTENT_TYPES = [
+    content_type.strip().lower()
+    for content_type in os.getenv(
+        "COMPRESSION_CONTENT_TYPES",
+        "application/json,application/javascript,application/xml,image/svg+xml,text/"
+    ).split(",")
+    if content_type.strip()
+]
+
+# Caminho rápido de serialização JSON (orjson + projeções SQL nas listagens)
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# Pool dedicado para hash/verificação de senhas (bcrypt)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 16))  # Pedidos aguardando além dos workers
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", 1))  # Em segundos (resposta 429)
+
+# Esquemas de hash de senha: o primeiro é usado para novos hashes, os demais
+# continuam aceitos e são migrados no próximo login ("argon2" exige argon2-cffi)
+PASSWORD_SCHEMES = [
+    scheme.strip()
+    for scheme in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",")
+    if scheme.strip()
+]
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 19456))  # Em KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+
+# Rate limit do login (token bucket por IP e por usuário)
+LOGIN_RATE_LIMIT_BACKEND = os.getenv("LOGIN_RATE_LIMIT_BACKEND", "memory")  # "memory" ou URL redis://
+LOGIN_RATE_LIMIT_IP_CAPACITY = int(os.getenv("LOGIN_RATE_LIMIT_IP_CAPACITY", 20))
+LOGIN_RATE_LIMIT_IP_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_IP_PER_MINUTE", 10))
+LOGIN_RATE_LIMIT_USER_CAPACITY = int(os.getenv("LOGIN_RATE_LIMIT_USER_CAPACITY", 10))
+LOGIN_RATE_LIMIT_USER_PER_MINUTE = float(os.getenv("LOGIN_RATE_LIMIT_USER_PER_MINUTE", 5))
+
+# Gravação em lote das falhas de login
+LOGIN_FAILURE_FLUSH_SIZE = int(os.getenv("LOGIN_FAILURE_FLUSH_SIZE", 100))  # Tentativas acumuladas
+LOGIN_FAILURE_FLUSH_SECONDS = int(os.getenv("LOGIN_FAILURE_FLUSH_SECONDS", 30))
+
+# Revogação de tokens (denylist em memória + tabela token_revocations)
+TOKEN_REVOCATION_BLOOM_CAPACITY = int(os.getenv("TOKEN_REVOCATION_BLOOM_CAPACITY", 100_000))
+TOKEN_REVOCATION_SYNC_SECONDS = int(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", 60))  # Sincronização e purge
+
+# Criação de operações em lote (POST /operations/bulk)
+OPERATIONS_BULK_MAX_SIZE = int(os.getenv("OPERATIONS_BULK_MAX_SIZE", 500))  # Operações por requisição
+
+# Agendador em processo (rollups); só o worker com o advisory lock executa os jobs
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() in ("1", "true", "yes")
+SCHEDULER_TICK_SECONDS = int(os.getenv("SCHEDULER_TICK_SECONDS", 30))
+SCHEDULER_LOCK_KEY = int(os.getenv("SCHEDULER_LOCK_KEY", 7_301_044))  # Chave do pg_try_advisory_lock
+COMPANY_METRICS_REFRESH_SECONDS = int(os.getenv("COMPANY_METRICS_REFRESH_SECONDS", 300))
+STAGE_ROLLUP_REFRESH_SECONDS = int(os.getenv("STAGE_ROLLUP_REFRESH_SECONDS", 900))
+LATE_OPERATIONS_SWEEP_SECONDS = int(os.getenv("LATE_OPERATIONS_SWEEP_SECONDS", 60))
+
+# Eventos de operação (GET /operations/events, SSE)
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")  # "memory" ou URL redis:// (vários workers)
+EVENTS_SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENTS_SUBSCRIBER_QUEUE_SIZE", 100))  # Eventos pendentes por conexão
+EVENTS_HEARTBEAT_SECONDS = int(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))  # Comentário SSE para manter a conexão
+EVENTS_RECONNECT_MAX_SECONDS = int(os.getenv("EVENTS_RECONNECT_MAX_SECONDS", 30))  # Backoff máximo do listener redis
+
+# KPIs ao vivo (WebSocket /dashboard/live): um estado por empresa, deltas para todos os painéis
+LIVE_KPI_DEBOUNCE_SECONDS = float(os.getenv("LIVE_KPI_DEBOUNCE_SECONDS", 0.25))  # Agrupa rajadas de eventos
+LIVE_KPI_ROLLOVER_CHECK_SECONDS = int(os.getenv("LIVE_KPI_ROLLOVER_CHECK_SECONDS", 60))  # Virada do dia sem eventos
+
+# Cache de respostas GET (por empresa/papel/query); invalidado pelas escritas via tags
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")  # "memory" ou URL redis:// (vários workers)
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))  # Limite de vida de cada resposta
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048))  # LRU do backend em memória
+
+# Importação de produtos (POST /products/import, CSV/XLSX)
+PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", 500))  # Linhas por upsert/commit
+PRODUCT_IMPORT_MAX_ERRORS = int(os.getenv("PRODUCT_IMPORT_MAX_ERRORS", 1000))  # Erros detalhados no relatório
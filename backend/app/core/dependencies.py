@@ -1,39 +1,49 @@
 # Importações de terceiros
+from dataclasses import dataclass
 from datetime import timezone, datetime
-from fastapi import HTTPException, Depends, status
+from fastapi import HTTPException, Depends, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
 from uuid import UUID
-from typing import List, Callable
+from typing import Callable, Optional
 
 # Importações locais
-from app.core.config import JWT_ALGORITHM, JWT_SECRET_KEY
+from app.core.security import decode_access_token
+from app.core.token_denylist import token_denylist
+from app.core.maintenance import ensure_not_in_maintenance
+from app.core.permissions import Permission, has_permission, permission_mask, role_mask
 from app.database import get_db
 from app.models.user import User
 from app.models.enum import UserRole
-from app.models.system_setting import SystemSetting
 
 # Definição do esquema OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# Mesmo esquema, sem 401 automático (o token pode vir por outro canal)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 # ---------------------------------------------------
 # Dependências de autenticação e autorização
 # ---------------------------------------------------
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+@dataclass(frozen=True)
+class TokenPrincipal:
     """
-    Dependência para obter o usuário autenticado a partir do token JWT.
-    
-    Args:
-        token (str, optional): Token JWT. Padrão é Depends(oauth2_scheme).
-        db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-    Returns:
-        User: Usuário autenticado.
+    Identidade extraída do JWT, sem consulta ao banco.
+
+    Expõe os mesmos atributos usados para escopo de tenant (`id`, `role`,
+    `company_id`), então rotas de leitura podem trocar `get_current_user`
+    por `get_token_principal` sem mudar o corpo.
+    """
+    id: UUID
+    role: UserRole
+    company_id: Optional[UUID]
+
+
+def _decode_claims(token: str) -> TokenPrincipal:
+    """
+    Valida assinatura, expiração, claims obrigatórias e a denylist.
+
     Raises:
-        HTTPException: Se o token for inválido ou o usuário não for encontrado.
+        HTTPException: 401 se o token for inválido ou revogado.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,11 +51,7 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token,
-            JWT_SECRET_KEY,
-            algorithms=[JWT_ALGORITHM],
-        )
+        payload = decode_access_token(token)
 
         user_id_raw = payload.get("sub")
         role = payload.get("role")
@@ -56,31 +62,103 @@ def get_current_user(
 
         user_id = UUID(user_id_raw)
         company_id = UUID(company_id_raw) if company_id_raw not in (None, "") else None
+        role = UserRole(role)
 
         # SYSTEM_ADMIN pode não ter company
-        if role != UserRole.SYSTEM_ADMIN.value and not company_id:
+        if not has_permission(role, Permission.ALL_COMPANIES) and not company_id:
             raise credentials_exception
 
-    except (JWTError, ValueError):
+    except ValueError:
+        raise credentials_exception
+
+    if token_denylist.is_revoked(payload):
         raise credentials_exception
 
+    return TokenPrincipal(id=user_id, role=role, company_id=company_id)
+
+
+def get_token_principal(
+    token: str = Depends(oauth2_scheme)
+) -> TokenPrincipal:
+    """
+    Dependência leve para rotas de leitura: confia nas claims do JWT.
+
+    Não consulta o banco. Desativação, troca de papel e exclusão de usuários
+    (ou empresas) revogam os tokens existentes via denylist. O modo de
+    manutenção vem da flag em cache (ver app.core.maintenance). Rotas de
+    escrita continuam usando `get_current_user`.
+
+    Args:
+        token (str, optional): Token JWT. Padrão é Depends(oauth2_scheme).
+    Returns:
+        TokenPrincipal: Usuário, papel e empresa do token.
+    Raises:
+        HTTPException: 401 se o token for inválido ou revogado; 503 em manutenção.
+    """
+    principal = _decode_claims(token)
+    ensure_not_in_maintenance(principal.role)
+    return principal
+
+
+def get_stream_principal(
+    bearer: Optional[str] = Depends(optional_oauth2_scheme),
+    token: Optional[str] = Query(None, description="Token JWT (EventSource não envia Authorization)")
+) -> TokenPrincipal:
+    """
+    Igual a `get_token_principal`, aceitando também o token na query string.
+
+    Para streams consumidos por EventSource, que não permite cabeçalhos; o
+    cabeçalho Authorization tem precedência quando presente.
+
+    Args:
+        bearer (str, optional): Token do cabeçalho Authorization.
+        token (str, optional): Token do parâmetro `?token=`.
+    Returns:
+        TokenPrincipal: Usuário, papel e empresa do token.
+    Raises:
+        HTTPException: 401 sem token ou com token inválido; 503 em manutenção.
+    """
+    if not (bearer or token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return get_token_principal(bearer or token)
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependência para obter o usuário autenticado a partir do token JWT.
+    
+    Args:
+        token (str, optional): Token JWT. Padrão é Depends(oauth2_scheme).
+        db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
+    Returns:
+        User: Usuário autenticado.
+    Raises:
+        HTTPException: Se o token for inválido ou o usuário não for encontrado.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    principal = _decode_claims(token)
+    user_id, role, company_id = principal.id, principal.role.value, principal.company_id
+
     query = db.query(User).filter(
         User.id == user_id,
         User.is_active == True
     )
 
-    if role != UserRole.SYSTEM_ADMIN.value:
+    if not has_permission(role, Permission.ALL_COMPANIES):
         query = query.filter(User.company_id == company_id)
 
-    settings = db.query(SystemSetting).first()
-
-    if settings and settings.maintenance_mode:
-        if role != UserRole.SYSTEM_ADMIN.value:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="O sistema está em modo de manutenção. Por favor, tente novamente mais tarde.",
-                headers={"Retry-After": "3600"}
-            )
+    ensure_not_in_maintenance(role, db)
 
     user = query.first()
 
@@ -90,27 +168,30 @@ def get_current_user(
     return user
 
 # ---------------------------------------------------
-# Dependências de autorização por papéis
+# Dependência de autorização por permissões
 # ---------------------------------------------------
-def require_roles(roles: List[UserRole]) -> Callable:
+def require_permission(*permissions: Permission) -> Callable:
     """
-    Dependência para verificar se o usuário possui um dos papéis permitidos.
+    Fábrica única de guards: exige que o papel do usuário tenha todas as permissões.
+
+    A máscara exigida é calculada uma vez, na declaração da rota; a checagem
+    por requisição é um AND com a máscara pré-compilada do papel
+    (ver app.core.permissions).
 
     Args:
-        roles (List[UserRole]): Lista de papéis permitidos.
+        permissions (Permission): Permissões exigidas.
     Returns:
-        Callable: Função de dependência que verifica o papel do usuário.
+        Callable: Função de dependência que retorna o usuário autenticado.
     Raises:
-        HTTPException: Se o usuário não possuir um dos papéis permitidos.
+        HTTPException: 403 se o papel do usuário não tiver as permissões.
     """
+    required = permission_mask(*permissions)
 
-    allowed_roles = {role.value for role in roles}
-
-    def role_checker(
+    def permission_checker(
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db)
     ) -> User:
-        if current_user.role not in allowed_roles:
+        if role_mask(current_user.role) & required != required:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Acesso Negado: Privilégios insuficientes"
@@ -126,26 +207,6 @@ def require_roles(roles: List[UserRole]) -> Callable:
     
         return current_user
 
-    return role_checker
-
-# ---------------------------------------------------
-# Dependência específica para ADMIN ou MANAGER
-# ---------------------------------------------------
-def check_admin_or_manager(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """
-    Dependência para verificar se o usuário é ADMIN ou MANAGER.
-    Args:
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(get_current_user).
-    Returns:
-        User: Usuário autenticado se for ADMIN ou MANAGER.
-    Raises:
-        HTTPException: Se o usuário não for ADMIN ou MANAGER.
-    """
-    if current_user.role not in {UserRole.ADMIN.value, UserRole.MANAGER.value}:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Operation not permitted"
-        )
-    return current_user
\ No newline at end of file
+    # Exposto para introspecção (ex: teste da matriz rota x papel)
+    permission_checker.permissions = permissions
+    return permission_checker
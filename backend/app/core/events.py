@@ -0,0 +1,195 @@
+# Dependências
+import asyncio
+import json
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from app.core.backends import load_backend
+from app.core.config import EVENTS_BACKEND, EVENTS_RECONNECT_MAX_SECONDS, EVENTS_SUBSCRIBER_QUEUE_SIZE
+
+# ---------------------------------------------------
+# Pub/sub de eventos de operação
+# ---------------------------------------------------
+# Os serviços publicam um dict por evento (sempre com "company_id") depois do
+# commit; cada conexão SSE é uma assinatura filtrada por empresa. O backend
+# decide o alcance: em memória só entrega no próprio processo; o redis
+# replica entre workers/instâncias.
+
+class Subscription:
+    '''
+    Fila de eventos de uma conexão, consumida no event loop que a criou.
+
+    Se a fila encher (cliente lento), novos eventos são descartados e `lagged`
+    fica True: o cliente deve recarregar os dados em vez de confiar na sequência.
+
+    :param company_id: Empresa filtrada (None recebe todas).
+    :param max_queue: Eventos pendentes antes do descarte.
+    '''
+
+    def __init__(self, company_id=None, max_queue: int = EVENTS_SUBSCRIBER_QUEUE_SIZE):
+        self.company_id = None if company_id is None else str(company_id)
+        self.lagged = False
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def matches(self, event: dict) -> bool:
+        return self.company_id is None or event.get("company_id") == self.company_id
+
+    def push(self, event: dict) -> None:
+        '''Entrega um evento (de qualquer thread).'''
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            pass  # Loop já encerrado (conexão fechada)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        '''Próximo evento, ou None se nada chegar em `timeout` segundos.'''
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def mark_lagged(self) -> None:
+        '''Sinaliza eventos perdidos fora da fila (de qualquer thread).'''
+        try:
+            self._loop.call_soon_threadsafe(setattr, self, "lagged", True)
+        except RuntimeError:
+            pass  # Loop já encerrado (conexão fechada)
+
+    def _put(self, event: dict) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+
+class EventBroker:
+    '''Interface dos backends de eventos (em memória, redis, ...).'''
+
+    def __init__(self):
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event: dict) -> None:
+        '''Publica um evento para todos os assinantes (síncrono, seguro entre threads).'''
+        raise NotImplementedError
+
+    def subscribe(self, company_id=None) -> Subscription:
+        '''Cria uma assinatura (chamar dentro do event loop).'''
+        subscription = Subscription(company_id)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def _deliver(self, event: dict) -> None:
+        '''Entrega aos assinantes deste processo.'''
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.matches(event):
+                subscription.push(event)
+
+    def _mark_all_lagged(self) -> None:
+        '''Todos os assinantes deste processo devem recarregar os dados.'''
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.mark_lagged()
+
+
+class InMemoryEventBroker(EventBroker):
+    '''
+    Backend local ao processo (testes e deploy com um único worker). Com vários
+    workers cada um só vê os eventos que ele mesmo publicou.
+    '''
+
+    def publish(self, event: dict) -> None:
+        self._deliver(event)
+
+
+class RedisEventBroker(EventBroker):
+    '''
+    Backend compartilhado entre workers (requer o pacote opcional `redis`).
+
+    Publica no canal do redis; uma thread por processo escuta o canal e entrega
+    aos assinantes locais (inclusive os eventos publicados pelo próprio processo).
+    Se a conexão cair, a thread reconecta com backoff exponencial (até
+    EVENTS_RECONNECT_MAX_SECONDS) e marca os assinantes como `lagged`, já que
+    os eventos publicados durante a queda foram perdidos.
+    '''
+
+    def __init__(self, url: str, channel: str = "logistiq:operation-events"):
+        import redis
+
+        super().__init__()
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._connection_errors = (redis.RedisError, OSError)
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, event: dict) -> None:
+        self._client.publish(self.channel, json.dumps(event, default=str))
+
+    def subscribe(self, company_id=None) -> Subscription:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="events-listener", daemon=True)
+                self._listener.start()
+        return super().subscribe(company_id)
+
+    def _listen(self) -> None:
+        delay, reconnecting = 1.0, False
+        while True:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                if reconnecting:
+                    self._mark_all_lagged()
+                delay, reconnecting = 1.0, True
+                for message in pubsub.listen():
+                    try:
+                        self._deliver(json.loads(message["data"]))
+                    except (TypeError, ValueError) as e:
+                        print(f"Invalid operation event: {e}")
+            except self._connection_errors as e:
+                print(f"Operation events listener disconnected, retrying in {delay:.0f}s: {e}")
+            finally:
+                try:
+                    pubsub.close()
+                except self._connection_errors:
+                    pass
+            time.sleep(delay)
+            delay = min(delay * 2, EVENTS_RECONNECT_MAX_SECONDS)
+
+
+def create_broker(spec: str) -> EventBroker:
+    '''
+    Cria o backend a partir da configuração (ver app.core.backends.load_backend).
+
+    :param spec: "memory", uma URL redis:// / rediss:// ou "pacote.modulo:Classe"
+        (backend próprio, subclasse de EventBroker sem argumentos).
+    '''
+    return load_backend(spec, InMemoryEventBroker, RedisEventBroker)
+
+
+@lru_cache(maxsize=1)
+def get_event_broker() -> EventBroker:
+    '''Retorna o broker de eventos configurado (criado no primeiro uso).'''
+    return create_broker(EVENTS_BACKEND)
+
+
+def publish_event(event: dict) -> None:
+    '''
+    Publica sem deixar uma falha do broker derrubar a requisição: o dado já
+    foi gravado e os clientes ainda recarregam por conta própria.
+    '''
+    try:
+        get_event_broker().publish(event)
+    except Exception as e:
+        print(f"Failed to publish operation event: {e}")
@@ -0,0 +1,88 @@
+# Dependências
+import threading
+import time
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import MAINTENANCE_CACHE_SECONDS
+from app.core.permissions import Permission, has_permission
+from app.database import SessionLocal
+from app.models.system_setting import SystemSetting
+
+# ---------------------------------------------------
+# Modo de manutenção (flag em cache por processo)
+# ---------------------------------------------------
+# Rotas autenticadas só pelo token (TokenPrincipal) e respostas servidas do
+# cache não consultam o banco a cada requisição, mas precisam respeitar o
+# modo de manutenção. A flag de system_settings é relida no máximo a cada
+# MAINTENANCE_CACHE_SECONDS por worker; o worker que atende o PUT
+# /system-admins/settings passa a valer na hora.
+
+class MaintenanceFlag:
+    '''
+    Cópia local de `SystemSetting.maintenance_mode` com TTL.
+
+    :param ttl_seconds: Por quanto tempo o valor lido vale sem voltar ao banco.
+    '''
+
+    def __init__(self, ttl_seconds: float = MAINTENANCE_CACHE_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._active = False
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def is_active(self, db: Optional[Session] = None) -> bool:
+        '''
+        Indica se o sistema está em manutenção (relê o banco se o valor expirou).
+
+        :param db: Sessão a usar na releitura (padrão: uma sessão própria).
+        '''
+        if time.monotonic() < self._expires_at:
+            return self._active
+
+        if db is not None:
+            row = db.query(SystemSetting.maintenance_mode).first()
+        else:
+            with SessionLocal() as session:
+                row = session.query(SystemSetting.maintenance_mode).first()
+
+        self.set(bool(row and row[0]))
+        return self._active
+
+    def expired(self) -> bool:
+        '''Indica se a próxima checagem vai reler o banco.'''
+        return time.monotonic() >= self._expires_at
+
+    def set(self, active: bool) -> None:
+        '''Grava o valor atual (ex: após o PUT das configurações) e renova o TTL.'''
+        with self._lock:
+            self._active = active
+            self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def clear(self) -> None:
+        '''Descarta o valor em cache; a próxima checagem relê o banco.'''
+        with self._lock:
+            self._expires_at = 0.0
+
+
+maintenance_flag = MaintenanceFlag()
+
+
+def ensure_not_in_maintenance(role, db: Optional[Session] = None) -> None:
+    '''
+    Bloqueia papéis sem SYSTEM_MANAGE enquanto o modo de manutenção estiver ativo.
+
+    :param role: Papel do usuário autenticado.
+    :param db: Sessão a usar se a flag precisar ser relida.
+    :raises HTTPException: 503 (com Retry-After) durante a manutenção.
+    '''
+    if has_permission(role, Permission.SYSTEM_MANAGE):
+        return
+    if maintenance_flag.is_active(db):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="O sistema está em modo de manutenção. Por favor, tente novamente mais tarde.",
+            headers={"Retry-After": "3600"}
+        )
@@ -0,0 +1,147 @@
+# Dependências
+import ast
+import os
+from functools import lru_cache
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+# Pasta do Alembic (backend/alembic)
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../alembic")
+VERSIONS_DIR = os.path.join(ALEMBIC_DIR, "versions")
+
+# Resultado das verificações já feitas neste processo, por (banco, head)
+_verified: set[tuple[str, tuple[str, ...]]] = set()
+
+
+class MigrationStateError(RuntimeError):
+    '''Banco de dados fora da head das migrations do Alembic.'''
+    pass
+
+
+class DatabaseUnavailableError(RuntimeError):
+    '''Não foi possível consultar o banco para ler a revisão aplicada.'''
+    pass
+
+
+def _read_revision(path: str) -> tuple[str | None, tuple[str, ...]]:
+    '''
+    Extrai `revision` e `down_revision` de um arquivo de migration.
+
+    :param path: Caminho do arquivo de migration.
+    :return: Tupla (revisão, revisões anteriores).
+    '''
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    # Só os identificadores são avaliados: o resto do módulo pode ter expressões quaisquer
+    values = {}
+    for node in tree.body:
+        if isinstance(node, ast.AnnAssign) and node.value is not None:
+            target = node.target
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+        else:
+            continue
+        if isinstance(target, ast.Name) and target.id in ("revision", "down_revision"):
+            values[target.id] = ast.literal_eval(node.value)
+
+    down = values.get("down_revision")
+    if down is None:
+        down = ()
+    elif isinstance(down, str):
+        down = (down,)
+
+    return values.get("revision"), tuple(down)
+
+
+@lru_cache(maxsize=1)
+def get_script_heads() -> tuple[str, ...]:
+    '''
+    Retorna as heads das migrations presentes no código.
+
+    Lê os arquivos de `alembic/versions` sem importar o Alembic, cujo
+    import (runtime + dialetos DDL) custa ~200 ms no boot de cada worker.
+
+    :return: Tupla ordenada com as revisões head.
+    '''
+    revisions = set()
+    parents = set()
+
+    for filename in os.listdir(VERSIONS_DIR):
+        if not filename.endswith(".py"):
+            continue
+        revision, down_revisions = _read_revision(os.path.join(VERSIONS_DIR, filename))
+        if revision:
+            revisions.add(revision)
+            parents.update(down_revisions)
+
+    return tuple(sorted(revisions - parents))
+
+
+def get_database_heads(engine: Engine) -> tuple[str, ...]:
+    '''
+    Lê a(s) revisão(ões) aplicadas no banco (tabela alembic_version).
+
+    Só consulta (existência da tabela e versão) e nunca emite DDL. Erros de
+    conexão não são tratados aqui: banco inacessível não é banco sem migration.
+
+    :param engine: Engine do banco de dados.
+    :return: Tupla ordenada com as revisões aplicadas (vazia se não houver).
+    :raises DBAPIError: Se o banco não puder ser consultado.
+    '''
+    with engine.connect() as connection:
+        if not inspect(connection).has_table("alembic_version"):
+            # Tabela inexistente: banco nunca migrado
+            return ()
+        rows = connection.execute(text("SELECT version_num FROM alembic_version")).all()
+    return tuple(sorted(row[0] for row in rows))
+
+
+def check_migration_state(engine: Engine, mode: str = "warn") -> bool:
+    '''
+    Compara a head do Alembic com a revisão aplicada no banco.
+
+    O resultado positivo fica em cache por (banco, revisão), então novas
+    chamadas no mesmo processo não voltam ao banco.
+
+    :param engine: Engine do banco de dados.
+    :param mode: "strict" lança erro em divergência, "warn" apenas avisa e "off" não verifica.
+    :return: True se o banco estiver na head, False caso contrário.
+    :raises MigrationStateError: Em divergência com mode="strict".
+    :raises DatabaseUnavailableError: Banco inacessível com mode="strict".
+    '''
+    if mode == "off":
+        return True
+
+    script_heads = get_script_heads()
+    cache_key = (engine.url.render_as_string(hide_password=True), script_heads)
+
+    if cache_key in _verified:
+        return True
+
+    try:
+        database_heads = get_database_heads(engine)
+    except DBAPIError as e:
+        # Falha de conexão não é divergência de revisão: reporta à parte
+        message = f"Não foi possível ler a revisão do banco: {e}"
+        if mode == "strict":
+            raise DatabaseUnavailableError(message) from e
+        print(f"⚠️ AVISO: {message}")
+        return False
+
+    if database_heads == script_heads:
+        _verified.add(cache_key)
+        return True
+
+    message = (
+        f"Banco de dados fora da head das migrations: "
+        f"banco={list(database_heads) or None}, código={list(script_heads)}. "
+        f"Execute 'alembic upgrade head'."
+    )
+
+    if mode == "strict":
+        raise MigrationStateError(message)
+
+    print(f"⚠️ AVISO: {message}")
+    return False
@@ -0,0 +1,133 @@
+# Dependências
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# ---------------------------------------------------
+# Pool limitado para hash de senhas
+# ---------------------------------------------------
+# bcrypt é CPU-bound e libera o GIL, então threads dedicadas bastam. O pool
+# separado evita que um pico de logins ocupe o threadpool compartilhado pelas
+# rotas síncronas, e o limite de admissão recusa (429) em vez de enfileirar
+# sem fim.
+
+class PasswordPoolSaturated(RuntimeError):
+    '''Levantada quando o pool de hash de senhas está cheio.'''
+
+
+@dataclass
+class PasswordPoolMetrics:
+    '''Contadores do pool: tempo na fila (wait) vs. tempo de hash (hash).'''
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    hash_seconds_total: float = 0.0
+    hash_seconds_max: float = 0.0
+
+    def record(self, wait_seconds: float, hash_seconds: float) -> None:
+        self.completed += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.hash_seconds_total += hash_seconds
+        self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+
+
+class PasswordHashPool:
+    '''
+    Executa funções de hash em um número fixo de threads, com admissão limitada.
+
+    :param workers: Número de threads de hash.
+    :param max_queue: Quantos pedidos podem aguardar além dos que estão executando.
+    '''
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, max_queue)
+        self.metrics = PasswordPoolMetrics()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="password-hash",
+        )
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        '''
+        Agenda `fn(*args)` no pool.
+
+        :raises PasswordPoolSaturated: Se já houver `capacity` pedidos em andamento.
+        '''
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.metrics.rejected += 1
+                raise PasswordPoolSaturated("Password hashing pool is saturated")
+            self._in_flight += 1
+            self.metrics.submitted += 1
+
+        queued_at = time.perf_counter()
+        timings: dict[str, float] = {}
+
+        def run():
+            timings["started"] = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                timings["finished"] = time.perf_counter()
+
+        def release(_future: Future):
+            with self._lock:
+                self._in_flight -= 1
+                # Pedidos cancelados antes de executar não entram nas métricas de tempo
+                if "finished" in timings:
+                    self.metrics.record(
+                        wait_seconds=timings["started"] - queued_at,
+                        hash_seconds=timings["finished"] - timings["started"],
+                    )
+
+        try:
+            future = self._executor.submit(run)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+
+        future.add_done_callback(release)
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        '''Versão bloqueante, para rotas e serviços síncronos.'''
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        '''Versão awaitable: não ocupa o event loop nem o threadpool das rotas.'''
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def snapshot(self) -> dict:
+        '''Retorna as métricas atuais (tempos médios e máximos em ms).'''
+        with self._lock:
+            m = self.metrics
+            completed = m.completed or 1
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "submitted": m.submitted,
+                "completed": m.completed,
+                "rejected": m.rejected,
+                "wait_ms_avg": round(m.wait_seconds_total / completed * 1000, 3),
+                "wait_ms_max": round(m.wait_seconds_max * 1000, 3),
+                "hash_ms_avg": round(m.hash_seconds_total / completed * 1000, 3),
+                "hash_ms_max": round(m.hash_seconds_max * 1000, 3),
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,111 @@
+# Dependências
+from enum import Enum
+from functools import reduce
+
+from app.models.enum import UserRole
+
+# ---------------------------------------------------
+# Permissões
+# ---------------------------------------------------
+class Permission(str, Enum):
+    '''Ações protegidas da API. Cada rota exige uma (ou mais) delas.'''
+    # Escopo
+    ALL_COMPANIES = "ALL_COMPANIES"                      # Enxerga/age sobre dados de todas as empresas
+    SYSTEM_MANAGE = "SYSTEM_MANAGE"                      # Painel do sistema (auditoria, stats, settings)
+
+    # Empresas
+    COMPANY_CREATE = "COMPANY_CREATE"
+    COMPANY_MANAGE = "COMPANY_MANAGE"                    # Listar/editar/ativar/excluir qualquer empresa
+    COMPANY_VIEW_OWN = "COMPANY_VIEW_OWN"                # Dados e usuários da própria empresa
+    COMPANY_UPDATE_OWN = "COMPANY_UPDATE_OWN"
+    COMPANY_SETTINGS_UPDATE = "COMPANY_SETTINGS_UPDATE"
+
+    # Usuários
+    USER_REGISTER = "USER_REGISTER"
+    USER_LIST = "USER_LIST"
+    USER_CREATE = "USER_CREATE"
+    USER_UPDATE = "USER_UPDATE"
+    USER_DELETE = "USER_DELETE"
+    USER_TOGGLE = "USER_TOGGLE"
+    USER_ACTIVITY_VIEW = "USER_ACTIVITY_VIEW"
+    USER_VIEW_ADMINS = "USER_VIEW_ADMINS"                # Enxerga usuários ADMIN da empresa
+    USER_ASSIGN_ROLES = "USER_ASSIGN_ROLES"              # Cria usuários com papel diferente de USER
+
+    # Produtos
+    PRODUCT_TOGGLE = "PRODUCT_TOGGLE"
+
+    # Relatórios
+    ANALYTICS_VIEW = "ANALYTICS_VIEW"                    # Tempo em etapa / SLA da própria empresa
+
+
+# ---------------------------------------------------
+# Registro central: papel -> permissões
+# ---------------------------------------------------
+_MANAGER = {
+    Permission.COMPANY_VIEW_OWN,
+    Permission.COMPANY_SETTINGS_UPDATE,
+    Permission.USER_LIST,
+    Permission.USER_UPDATE,
+    Permission.PRODUCT_TOGGLE,
+    Permission.ANALYTICS_VIEW,
+}
+
+_ADMIN = _MANAGER | {
+    Permission.COMPANY_UPDATE_OWN,
+    Permission.USER_REGISTER,
+    Permission.USER_CREATE,
+    Permission.USER_TOGGLE,
+    Permission.USER_ACTIVITY_VIEW,
+    Permission.USER_VIEW_ADMINS,
+}
+
+ROLE_PERMISSIONS: dict[UserRole, frozenset[Permission]] = {
+    UserRole.SYSTEM_ADMIN: frozenset(Permission),
+    UserRole.ADMIN: frozenset(_ADMIN),
+    UserRole.MANAGER: frozenset(_MANAGER),
+    UserRole.USER: frozenset(),
+}
+
+# ---------------------------------------------------
+# Compilação em bitmasks (no import)
+# ---------------------------------------------------
+# Cada permissão vira um bit; cada papel, a OR das suas permissões. A checagem
+# em runtime é um lookup em dict + um AND de inteiros.
+PERMISSION_BITS: dict[Permission, int] = {permission: 1 << i for i, permission in enumerate(Permission)}
+
+ROLE_MASKS: dict[str, int] = {
+    role.value: reduce(lambda mask, permission: mask | PERMISSION_BITS[permission], permissions, 0)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
+def permission_mask(*permissions: Permission) -> int:
+    '''
+    Combina permissões em uma única máscara.
+
+    :param permissions: Permissões exigidas.
+    :return: Máscara com os bits correspondentes.
+    '''
+    return reduce(lambda mask, permission: mask | PERMISSION_BITS[permission], permissions, 0)
+
+
+def role_mask(role) -> int:
+    '''
+    Máscara de um papel (aceita UserRole ou a string do banco/token).
+
+    :param role: Papel do usuário.
+    :return: Máscara de permissões (0 para papéis desconhecidos).
+    '''
+    return ROLE_MASKS.get(getattr(role, "value", role), 0)
+
+
+def has_permission(role, *permissions: Permission) -> bool:
+    '''
+    Verifica se o papel possui todas as permissões informadas.
+
+    :param role: Papel do usuário.
+    :param permissions: Permissões exigidas.
+    :return: True se todas forem concedidas.
+    '''
+    required = permission_mask(*permissions)
+    return role_mask(role) & required == required
@@ -0,0 +1,157 @@
+# Dependências
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from app.core.backends import load_backend
+from app.core.config import (
+    LOGIN_RATE_LIMIT_BACKEND,
+    LOGIN_RATE_LIMIT_IP_CAPACITY,
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+    LOGIN_RATE_LIMIT_USER_CAPACITY,
+    LOGIN_RATE_LIMIT_USER_PER_MINUTE,
+)
+
+# ---------------------------------------------------
+# Token bucket
+# ---------------------------------------------------
+# Cada chave tem um balde com `capacity` fichas que se recarrega a
+# `refill_per_second`. Uma tentativa consome uma ficha; sem fichas, a
+# resposta é o tempo (em segundos) até a próxima estar disponível.
+
+class RateLimitBackend:
+    '''Interface dos backends de rate limit (em memória, redis, ...).'''
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        '''
+        Tenta consumir uma ficha do balde `key`.
+
+        :return: 0 se permitido; caso contrário, segundos até haver ficha.
+        '''
+        raise NotImplementedError
+
+
+class InMemoryTokenBucket(RateLimitBackend):
+    '''
+    Backend local ao processo. Com vários workers/instâncias cada um tem seus
+    próprios baldes; para um limite global use um backend compartilhado.
+
+    :param max_keys: Limite de chaves em memória (as menos usadas são descartadas).
+    '''
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+class RedisTokenBucket(RateLimitBackend):
+    '''
+    Backend compartilhado entre instâncias (requer o pacote opcional `redis`).
+    O balde é atualizado atomicamente por um script Lua com o relógio do Redis.
+    '''
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = "logistiq:ratelimit:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        return float(self._script(keys=[self.prefix + key], args=[capacity, refill_per_second]))
+
+
+def create_backend(spec: str) -> RateLimitBackend:
+    '''
+    Cria o backend a partir da configuração (ver app.core.backends.load_backend).
+
+    :param spec: "memory", uma URL redis:// / rediss:// ou "pacote.modulo:Classe"
+        (backend próprio, subclasse de RateLimitBackend sem argumentos).
+    '''
+    return load_backend(spec, InMemoryTokenBucket, RedisTokenBucket)
+
+
+# ---------------------------------------------------
+# Limite de login
+# ---------------------------------------------------
+class LoginRateLimiter:
+    '''
+    Limita tentativas de login por IP e por usuário (email).
+
+    O IP barra credential stuffing de uma origem contra várias contas; o
+    usuário barra ataques distribuídos contra uma única conta.
+    '''
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        ip_capacity: int = LOGIN_RATE_LIMIT_IP_CAPACITY,
+        ip_per_minute: float = LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+        user_capacity: int = LOGIN_RATE_LIMIT_USER_CAPACITY,
+        user_per_minute: float = LOGIN_RATE_LIMIT_USER_PER_MINUTE,
+    ):
+        self.backend = backend
+        self.ip_capacity = ip_capacity
+        self.ip_rate = ip_per_minute / 60
+        self.user_capacity = user_capacity
+        self.user_rate = user_per_minute / 60
+
+    def check(self, ip: Optional[str], username: str) -> float:
+        '''
+        Consome uma ficha de cada balde.
+
+        :return: 0 se a tentativa pode seguir; senão, segundos para o Retry-After.
+        '''
+        waits = [
+            self.backend.consume(f"login:user:{username.strip().lower()}", self.user_capacity, self.user_rate)
+        ]
+        if ip:
+            waits.append(self.backend.consume(f"login:ip:{ip}", self.ip_capacity, self.ip_rate))
+        return max(waits)
+
+
+@lru_cache(maxsize=1)
+def get_login_rate_limiter() -> LoginRateLimiter:
+    '''Retorna o limitador de login configurado (criado no primeiro uso).'''
+    return LoginRateLimiter(create_backend(LOGIN_RATE_LIMIT_BACKEND))
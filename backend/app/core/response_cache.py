@@ -0,0 +1,420 @@
+# Dependências
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from fastapi.security.utils import get_authorization_scheme_param
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.backends import load_backend
+from app.core.config import RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+from app.core.dependencies import get_token_principal
+from app.core.maintenance import maintenance_flag
+from app.core.permissions import Permission, has_permission
+
+# ---------------------------------------------------
+# Cache de respostas GET por tenant
+# ---------------------------------------------------
+# A rota marcada com @cached_response guarda a resposta já serializada
+# (bytes + cabeçalhos) por rota, query, papel e empresa. Cada tag tem uma
+# geração por escopo (empresa ou "*" para listagens globais) que entra na
+# chave: as escritas marcam tags na sessão (`mark_stale`) e, depois do commit,
+# as gerações sobem e as entradas antigas ficam inalcançáveis (saem por
+# LRU/TTL). Uma leitura que começou antes do commit grava sob a geração
+# antiga, então nunca reaparece.
+
+BYPASS_HEADER = "X-Cache-Bypass"
+GLOBAL_SCOPE = "*"
+
+# Cabeçalhos da rota guardados com o corpo
+STORED_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    '''If-None-Match contém `etag` (comparação fraca, aceita "*").'''
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    '''Resposta serializada guardada no cache.'''
+    status_code: int
+    headers: tuple[tuple[str, str], ...]
+    body: bytes
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        headers = tuple((name, value) for name, value in response.headers.items() if name in STORED_HEADERS)
+        return cls(response.status_code, headers, response.body)
+
+    def to_bytes(self) -> bytes:
+        head = json.dumps({"status_code": self.status_code, "headers": self.headers})
+        return head.encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        head, _, body = raw.partition(b"\n")
+        meta = json.loads(head)
+        return cls(meta["status_code"], tuple(tuple(header) for header in meta["headers"]), body)
+
+    def to_response(self, request: Request, outcome: str) -> Response:
+        ''' Reconstrói a resposta; 304 se o cliente já tem o ETag guardado.
+
+        :param request: Requisição atual (If-None-Match).
+        :param outcome: Valor do cabeçalho X-Cache.
+        '''
+        headers = dict(self.headers)
+        headers["X-Cache"] = outcome
+        etag = headers.get("etag")
+        if etag and etag_matches(request, etag):
+            headers.pop("content-type", None)
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, status_code=self.status_code, headers=headers)
+
+
+# ---------------------------------------------------
+# Backends
+# ---------------------------------------------------
+class ResponseCacheBackend:
+    '''Interface dos backends de cache de respostas (em memória, redis, ...).'''
+
+    # True quando as chamadas fazem I/O (executadas no threadpool)
+    blocking = False
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        raise NotImplementedError
+
+    def generations(self, names: list[str]) -> list[int]:
+        '''Geração atual de cada tag (0 se nunca invalidada).'''
+        raise NotImplementedError
+
+    def bump(self, names: list[str]) -> None:
+        '''Incrementa as gerações (invalida as entradas que dependem delas).'''
+        raise NotImplementedError
+
+
+class InMemoryResponseCache(ResponseCacheBackend):
+    '''
+    LRU com TTL local ao processo. Com vários workers cada um tem seu cache e
+    só vê as invalidações feitas por ele mesmo: nos demais, a resposta vive
+    até o TTL. Para invalidação imediata entre workers use o redis.
+
+    :param max_entries: Respostas guardadas antes de descartar as menos usadas.
+    '''
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._generations: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, names: list[str]) -> list[int]:
+        with self._lock:
+            return [self._generations.get(name, 0) for name in names]
+
+    def bump(self, names: list[str]) -> None:
+        with self._lock:
+            for name in names:
+                self._generations[name] += 1
+
+
+class RedisResponseCache(ResponseCacheBackend):
+    '''
+    Backend compartilhado entre workers (requer o pacote opcional `redis`).
+    Respostas expiram pelo TTL do redis; gerações são contadores INCR.
+    '''
+
+    blocking = True
+
+    def __init__(self, url: str, prefix: str = "logistiq:response-cache:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raw = self._client.get(f"{self.prefix}entry:{key}")
+        return CachedResponse.from_bytes(raw) if raw else None
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        self._client.set(f"{self.prefix}entry:{key}", entry.to_bytes(), px=int(ttl * 1000))
+
+    def generations(self, names: list[str]) -> list[int]:
+        values = self._client.mget([f"{self.prefix}gen:{name}" for name in names])
+        return [int(value or 0) for value in values]
+
+    def bump(self, names: list[str]) -> None:
+        pipe = self._client.pipeline()
+        for name in names:
+            pipe.incr(f"{self.prefix}gen:{name}")
+        pipe.execute()
+
+
+def create_backend(spec: str) -> ResponseCacheBackend:
+    '''
+    Cria o backend a partir da configuração (ver app.core.backends.load_backend).
+
+    :param spec: "memory", uma URL redis:// / rediss:// ou "pacote.modulo:Classe"
+        (backend próprio, subclasse de ResponseCacheBackend sem argumentos).
+    '''
+    return load_backend(spec, InMemoryResponseCache, RedisResponseCache)
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCacheBackend:
+    '''Retorna o backend de cache configurado (criado no primeiro uso).'''
+    return create_backend(RESPONSE_CACHE_BACKEND)
+
+
+# ---------------------------------------------------
+# Métricas (por processo)
+# ---------------------------------------------------
+class ResponseCacheStats:
+    '''Acertos, faltas e bypasses por rota.'''
+
+    OUTCOMES = ("hits", "misses", "bypasses")
+
+    def __init__(self):
+        self._counts: dict[str, dict[str, int]] = defaultdict(lambda: dict.fromkeys(self.OUTCOMES, 0))
+        self._lock = threading.Lock()
+
+    def record(self, route: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[route][outcome] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def snapshot(self) -> dict:
+        ''' Contadores e hit ratio (acertos / consultas, sem bypasses).
+
+        :return: {"totals": {...}, "routes": {rota: {...}}}.
+        '''
+        with self._lock:
+            routes = {route: dict(counts) for route, counts in self._counts.items()}
+        totals = {outcome: sum(counts[outcome] for counts in routes.values()) for outcome in self.OUTCOMES}
+
+        for counts in (*routes.values(), totals):
+            lookups = counts["hits"] + counts["misses"]
+            counts["hit_ratio"] = round(counts["hits"] / lookups, 4) if lookups else 0.0
+        return {"totals": totals, "routes": routes}
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+# ---------------------------------------------------
+# Invalidação por tags (escritas)
+# ---------------------------------------------------
+_STALE_KEY = "response_cache_stale"
+_COMMITTED_KEY = "response_cache_committed"
+
+
+def mark_stale(db: Session, company_id, *tags: str) -> None:
+    ''' Marca tags alteradas pela transação atual da sessão.
+
+    As gerações só sobem depois do commit (e nada acontece em rollback), então
+    uma leitura concorrente não volta a guardar o dado antigo como novo.
+
+    :param db: Sessão que fará o commit da escrita.
+    :param company_id: Empresa dos registros alterados (None para registros sem empresa).
+    :param tags: Tags alteradas (ex: "products").
+    '''
+    company = None if company_id is None else str(company_id)
+    db.info.setdefault(_STALE_KEY, set()).update((company, tag) for tag in tags)
+
+
+def invalidate(stale: Iterable[tuple[Optional[str], str]]) -> None:
+    ''' Sobe as gerações das tags (escopo da empresa e escopo global).
+
+    :param stale: Pares (company_id, tag).
+    '''
+    names = set()
+    for company_id, tag in stale:
+        names.add(f"{GLOBAL_SCOPE}:{tag}")
+        if company_id is not None:
+            names.add(f"{company_id}:{tag}")
+    if not names:
+        return
+    try:
+        get_response_cache().bump(sorted(names))
+    except Exception as e:
+        # Sem invalidação as respostas ainda expiram pelo TTL
+        print(f"Failed to invalidate response cache: {e}")
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_commit(session: Session) -> None:
+    session.info[_COMMITTED_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _invalidate_after_commit(session: Session, transaction) -> None:
+    # after_commit também dispara para SAVEPOINTs; só a transação externa conta
+    committed = session.info.pop(_COMMITTED_KEY, False)
+    if transaction.parent is not None:
+        return
+    stale = session.info.pop(_STALE_KEY, None)
+    if committed and stale:
+        invalidate(stale)
+
+
+# ---------------------------------------------------
+# Rotas cacheadas
+# ---------------------------------------------------
+@dataclass(frozen=True)
+class CachePolicy:
+    '''
+    Configuração do cache de uma rota.
+
+    :param tags: Tags que, alteradas, invalidam a resposta.
+    :param ttl: Vida máxima da resposta, em segundos.
+
+    A chave é sempre a empresa do usuário (SYSTEM_ADMIN usa o escopo global):
+    a rota precisa filtrar os dados por essa empresa.
+    '''
+    tags: tuple[str, ...]
+    ttl: float
+
+
+def cached_response(*tags: str, ttl: Optional[float] = None) -> Callable:
+    '''
+    Marca uma rota GET para o cache de respostas (usar abaixo de @router.get,
+    em routers com `route_class=CachedRoute`).
+
+    A rota deve ser de leitura, autenticada por token (get_token_principal) e
+    depender apenas de dados cobertos pelas tags.
+    '''
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.response_cache = CachePolicy(tuple(tags), ttl or RESPONSE_CACHE_TTL_SECONDS)
+        return endpoint
+    return decorator
+
+
+class CachedRoute(APIRoute):
+    '''APIRoute que serve do cache as rotas marcadas com @cached_response (as demais não mudam).'''
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        policy = getattr(self.endpoint, "response_cache", None)
+        if policy is None or "GET" not in self.methods:
+            return handler
+
+        async def cached_handler(request: Request) -> Response:
+            return await serve_cached(request, handler, policy, self.name)
+
+        return cached_handler
+
+
+async def _call(cache: ResponseCacheBackend, method: Callable, *args):
+    if cache.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+
+def _request_principal(request: Request):
+    '''Principal do token Bearer, ou None se ausente/inválido/em manutenção (a rota responde o 401/503).'''
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return get_token_principal(token)
+    except HTTPException:
+        return None
+
+
+def _cache_key(request: Request, principal, generations: list[int]) -> str:
+    parts = [
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        principal.role.value,
+        str(principal.company_id),
+        generations,
+    ]
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+async def serve_cached(request: Request, handler: Callable, policy: CachePolicy, route_name: str) -> Response:
+    ''' Responde do cache ou executa a rota e guarda a resposta 200.
+
+    :param request: Requisição.
+    :param handler: Handler original da rota (dependências + serialização).
+    :param policy: Configuração do cache da rota.
+    :param route_name: Nome da rota nas métricas.
+    :return: Resposta com o cabeçalho X-Cache (HIT, MISS ou BYPASS).
+    '''
+    # O principal também aplica o modo de manutenção (acertos não pulam o 503);
+    # se a flag venceu, ela é relida fora do event loop
+    if maintenance_flag.expired():
+        await run_in_threadpool(maintenance_flag.is_active)
+    principal = _request_principal(request)
+    if principal is None:
+        return await handler(request)
+
+    if request.headers.get(BYPASS_HEADER):
+        response_cache_stats.record(route_name, "bypasses")
+        response = await handler(request)
+        response.headers["X-Cache"] = "BYPASS"
+        return response
+
+    scope = GLOBAL_SCOPE if has_permission(principal.role, Permission.ALL_COMPANIES) else str(principal.company_id)
+
+    cache = get_response_cache()
+    try:
+        generations = await _call(cache, cache.generations, [f"{scope}:{tag}" for tag in policy.tags])
+        key = _cache_key(request, principal, generations)
+        entry = await _call(cache, cache.get, key)
+    except Exception as e:
+        print(f"Response cache unavailable: {e}")
+        return await handler(request)
+
+    if entry is not None:
+        response_cache_stats.record(route_name, "hits")
+        return entry.to_response(request, "HIT")
+
+    response_cache_stats.record(route_name, "misses")
+    response = await handler(request)
+    # 304 (ETag da própria rota), erros e streams não são guardados
+    if response.status_code == 200 and isinstance(getattr(response, "body", None), bytes):
+        try:
+            await _call(cache, cache.set, key, CachedResponse.from_response(response), policy.ttl)
+        except Exception as e:
+            print(f"Failed to store cached response: {e}")
+    response.headers["X-Cache"] = "MISS"
+    return response
@@ -0,0 +1,147 @@
+# Dependências
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+# ---------------------------------------------------
+# Eleição de líder (advisory lock do Postgres)
+# ---------------------------------------------------
+class AdvisoryLockLeader:
+    '''
+    Garante que só um worker (entre todos os processos/instâncias) rode os jobs.
+
+    O líder segura `pg_try_advisory_lock(key)` em uma conexão dedicada; se o
+    processo morrer, a conexão cai e o Postgres libera o lock para outro
+    worker. Em outros bancos (ex: SQLite nos testes) o processo é sempre líder.
+
+    :param engine: Engine do SQLAlchemy.
+    :param key: Chave inteira do advisory lock.
+    '''
+
+    def __init__(self, engine: Engine, key: int):
+        self.engine = engine
+        self.key = key
+        self._connection: Optional[Connection] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None or self.engine.dialect.name != "postgresql"
+
+    def acquire(self) -> bool:
+        '''Tenta virar (ou continuar) líder. Não bloqueia.'''
+        if self.engine.dialect.name != "postgresql":
+            return True
+
+        if self._connection is not None:
+            try:
+                self._connection.execute(text("SELECT 1"))
+                self._connection.commit()
+                return True
+            except Exception:
+                # Conexão perdida: o lock foi junto
+                self._discard()
+
+        connection = self.engine.connect()
+        try:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            ).scalar()
+            connection.commit()
+        except Exception:
+            connection.close()
+            raise
+
+        if acquired:
+            self._connection = connection
+        else:
+            connection.close()
+        return bool(acquired)
+
+    def release(self) -> None:
+        '''Libera o lock (no shutdown).'''
+        if self._connection is None:
+            return
+        try:
+            self._connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            self._connection.commit()
+        except Exception as e:
+            print(f"Failed to release scheduler lock: {e}")
+        self._discard()
+
+    def _discard(self) -> None:
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+# ---------------------------------------------------
+# Agendador em processo
+# ---------------------------------------------------
+@dataclass
+class ScheduledJob:
+    '''Job síncrono executado a cada `interval_seconds` (no threadpool).'''
+    name: str
+    interval_seconds: float
+    func: Callable[[], object]
+    last_run: float = 0.0
+    last_error: Optional[str] = None
+
+
+class Scheduler:
+    '''
+    Loop simples para jobs periódicos, iniciado no lifespan.
+
+    A cada tick tenta manter a liderança; só o líder executa os jobs vencidos.
+    Erros de um job são registrados e não derrubam o loop.
+
+    :param leader: Eleição de líder.
+    :param tick_seconds: Intervalo entre verificações.
+    '''
+
+    def __init__(self, leader: AdvisoryLockLeader, tick_seconds: float = 30):
+        self.leader = leader
+        self.tick_seconds = tick_seconds
+        self.jobs: list[ScheduledJob] = []
+
+    def add_job(self, name: str, interval_seconds: float, func: Callable[[], object]) -> None:
+        self.jobs.append(ScheduledJob(name, interval_seconds, func))
+
+    async def run_pending(self) -> list[str]:
+        '''Executa os jobs vencidos (se este worker for o líder). Retorna os nomes executados.'''
+        try:
+            is_leader = await run_in_threadpool(self.leader.acquire)
+        except Exception as e:
+            print(f"Scheduler leader election failed: {e}")
+            return []
+        if not is_leader:
+            return []
+
+        executed = []
+        for job in self.jobs:
+            if time.monotonic() - job.last_run < job.interval_seconds and job.last_run:
+                continue
+            job.last_run = time.monotonic()
+            try:
+                await run_in_threadpool(job.func)
+                job.last_error = None
+            except Exception as e:
+                job.last_error = str(e)
+                print(f"Scheduled job {job.name} failed: {e}")
+            executed.append(job.name)
+        return executed
+
+    async def run(self) -> None:
+        '''Loop do lifespan (cancelado no shutdown).'''
+        try:
+            while True:
+                await self.run_pending()
+                await asyncio.sleep(self.tick_seconds)
+        finally:
+            await run_in_threadpool(self.leader.release)
@@ -1,31 +1,112 @@
 # Dependências
+import uuid
 from datetime import timedelta, datetime, timezone
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
-from jose import jwt
-from passlib.context import CryptContext
 
 # Configurações
 from app.core.config import (
     JWT_SECRET_KEY,
     JWT_ALGORITHM,
     JWT_EXPIRE_MINUTES,
+    PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_SCHEMES,
+    BCRYPT_ROUNDS,
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
 )
-
-# Contexto de criptografia para senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.password_pool import PasswordHashPool
 
 # -------------------------
 # Senhas
 # -------------------------
+# passlib/bcrypt e jose (backend cryptography) são importados sob demanda:
+# custam ~100 ms no import e só são usados no login e na validação de tokens.
+def build_pwd_context(
+    schemes: list[str],
+    bcrypt_rounds: int = BCRYPT_ROUNDS,
+    argon2_time_cost: int = ARGON2_TIME_COST,
+    argon2_memory_cost: int = ARGON2_MEMORY_COST,
+    argon2_parallelism: int = ARGON2_PARALLELISM,
+):
+    '''
+    Monta um CryptContext com os esquemas e custos informados.
+
+    O primeiro esquema gera os novos hashes; os demais ficam obsoletos. Os
+    custos são fixados (min = max = padrão), então qualquer hash com custo
+    diferente do configurado é marcado por `needs_update` e refeito no login.
+
+    :param schemes: Esquemas aceitos (ex: ["argon2", "bcrypt"]).
+    :param bcrypt_rounds: Fator de custo do bcrypt (log2 das iterações).
+    :param argon2_time_cost: Iterações do argon2id.
+    :param argon2_memory_cost: Memória do argon2id em KiB.
+    :param argon2_parallelism: Paralelismo do argon2id.
+    :return: Instância de CryptContext.
+    '''
+    from passlib.context import CryptContext
+
+    settings = {}
+    if "bcrypt" in schemes:
+        settings.update(
+            bcrypt__default_rounds=bcrypt_rounds,
+            bcrypt__min_rounds=bcrypt_rounds,
+            bcrypt__max_rounds=bcrypt_rounds,
+        )
+    if "argon2" in schemes:
+        settings.update(
+            argon2__type="ID",
+            argon2__rounds=argon2_time_cost,
+            argon2__memory_cost=argon2_memory_cost,
+            argon2__parallelism=argon2_parallelism,
+        )
+
+    return CryptContext(schemes=schemes, deprecated="auto", **settings)
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    '''
+    Retorna o contexto de criptografia para senhas (criado no primeiro uso).
+
+    :return: Instância de CryptContext.
+    '''
+    return build_pwd_context(PASSWORD_SCHEMES)
+
+
+@lru_cache(maxsize=1)
+def get_password_pool() -> PasswordHashPool:
+    '''
+    Retorna o pool dedicado de hash de senhas (criado no primeiro uso).
+
+    :return: Instância de PasswordHashPool.
+    '''
+    return PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+
+def _hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(password, hashed_password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return get_pwd_context().verify_and_update(password, hashed_password)
+
+
 def hash_password(password: str) -> str:
     '''
     Gera um hash seguro para a senha fornecida.
     
     :param password: Senha em texto simples.
     :return: Hash da senha.
+    :raises PasswordPoolSaturated: Se o pool de hash estiver cheio.
     '''
-    return pwd_context.hash(password)
+    return get_password_pool().run(_hash, password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -35,8 +116,31 @@ def verify_password(password: str, hashed_password: str) -> bool:
     :param password: Senha em texto simples.
     :param hashed_password: Hash da senha armazenada.
     :return: True se a senha corresponder ao hash, False caso contrário.
+    :raises PasswordPoolSaturated: Se o pool de hash estiver cheio.
+    '''
+    return get_password_pool().run(_verify, password, hashed_password)
+
+
+def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
     '''
-    return pwd_context.verify(password, hashed_password)
+    Verifica a senha e, se o hash estiver em esquema/custo antigo, gera um novo.
+
+    :param password: Senha em texto simples.
+    :param hashed_password: Hash da senha armazenada.
+    :return: (senha confere, novo hash ou None se não precisar atualizar).
+    :raises PasswordPoolSaturated: Se o pool de hash estiver cheio.
+    '''
+    return get_password_pool().run(_verify_and_update, password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    '''Versão awaitable de `hash_password` (para rotas assíncronas).'''
+    return await get_password_pool().run_async(_hash, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    '''Versão awaitable de `verify_password` (para rotas assíncronas).'''
+    return await get_password_pool().run_async(_verify, password, hashed_password)
 
 
 # -------------------------
@@ -58,7 +162,10 @@ def create_access_token(
     :param expires_delta: Tempo opcional para expiração do token.
     :return: Token JWT como string.
     '''
-    expire = datetime.now(timezone.utc) + (
+    from jose import jwt
+
+    now = datetime.now(timezone.utc)
+    expire = now + (
         expires_delta or timedelta(minutes=JWT_EXPIRE_MINUTES)
     )
 
@@ -66,7 +173,25 @@ def create_access_token(
         "sub": str(subject),              # ✅ sempre string
         "role": role,
         "company_id": str(company_id) if company_id else None,
+        "iat": now.timestamp(),           # Usado pela denylist (revogação por usuário/empresa)
+        "jti": uuid.uuid4().hex,          # Identificador do token (revogação individual, ex: logout)
         "exp": expire.timestamp(),
     }
 
-    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
\ No newline at end of file
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def decode_access_token(token: str) -> dict:
+    '''
+    Valida a assinatura e a expiração de um token JWT.
+
+    :param token: Token JWT.
+    :return: Payload do token.
+    :raises ValueError: Se o token for inválido ou estiver expirado.
+    '''
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except JWTError as e:
+        raise ValueError(str(e)) from e
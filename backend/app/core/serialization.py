@@ -0,0 +1,68 @@
+# Dependências
+from functools import lru_cache
+from typing import Any, Iterable, Mapping
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# ---------------------------------------------------
+# Serialização rápida de listagens
+# ---------------------------------------------------
+# Caminho padrão: ORM -> validação do response_model -> jsonable -> json (stdlib).
+# Caminho rápido: projeção SQL (apenas colunas) -> TypeAdapter (pydantic-core) -> bytes JSON.
+
+@lru_cache(maxsize=None)
+def get_list_adapter(schema: type) -> TypeAdapter:
+    '''
+    Retorna (e compila uma única vez) o TypeAdapter de `list[schema]`.
+
+    :param schema: Schema Pydantic de cada linha.
+    :return: TypeAdapter reutilizável.
+    '''
+    return TypeAdapter(list[schema])
+
+
+def rows_to_dicts(rows: Iterable[Any], nested: Iterable[str] = ()) -> list[dict]:
+    '''
+    Converte linhas de uma projeção SQL em dicts.
+
+    Colunas rotuladas como "<prefixo>__<campo>" são agrupadas em um objeto
+    aninhado `<prefixo>`, que vira None quando `<prefixo>__id` é nulo
+    (ex: LEFT JOIN sem correspondência).
+
+    :param rows: Linhas (Row ou Mapping) retornadas pela consulta.
+    :param nested: Prefixos de objetos aninhados.
+    :return: Lista de dicts prontos para validação.
+    '''
+    nested = tuple(nested)
+    result = []
+
+    for row in rows:
+        data = dict(row._mapping) if hasattr(row, "_mapping") else dict(row)
+
+        for prefix in nested:
+            marker = f"{prefix}__"
+            child = {
+                key[len(marker):]: data.pop(key)
+                for key in list(data)
+                if key.startswith(marker)
+            }
+            data[prefix] = child if child.get("id") is not None else None
+
+        result.append(data)
+
+    return result
+
+
+def serialize_list(schema: type, rows: list[Mapping[str, Any]]) -> Response:
+    '''
+    Valida e serializa uma lista de linhas direto para bytes JSON.
+
+    :param schema: Schema Pydantic de cada linha (o mesmo do response_model).
+    :param rows: Linhas já convertidas em dicts.
+    :return: Resposta JSON pronta (o FastAPI não re-serializa).
+    '''
+    adapter = get_list_adapter(schema)
+    return Response(
+        content=adapter.dump_json(adapter.validate_python(rows)),
+        media_type="application/json",
+    )
@@ -0,0 +1,156 @@
+# Dependências
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+# Arquivos gerados pelo Vite em assets/ com hash de 8 caracteres antes da extensão
+# (ex: assets/index-DFLcuNFa.js); arquivos de public/ (ex: apple-touch-icon.png) revalidam
+HASHED_ASSET_PATTERN = re.compile(r"^assets/(?:.+/)?[^/]+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+
+# Cabeçalhos de cache
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Variantes pré-comprimidas, na ordem de preferência
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    '''Entrada do manifesto da pasta dist.
+
+    Attributes:
+        path (str): Caminho absoluto do arquivo.
+        media_type (str): Content-Type do arquivo.
+        etag (str): ETag forte do arquivo original (as variantes comprimidas recebem o sufixo da codificação).
+        immutable (bool): Indica se é um asset do Vite com hash no nome (pode ser cacheado para sempre).
+        encodings (dict[str, str]): Variantes pré-comprimidas disponíveis {encoding: caminho}.
+    '''
+    path: str
+    media_type: str
+    etag: str
+    immutable: bool
+    encodings: dict[str, str]
+
+
+class SpaManifest:
+    '''Manifesto em memória da pasta dist do frontend.
+
+    Construído uma única vez no startup: as requisições não tocam o sistema
+    de arquivos para descobrir se um caminho existe.
+    '''
+
+    def __init__(self, dist_dir: str):
+        self.dist_dir = os.path.abspath(dist_dir)
+        self.assets: dict[str, StaticAsset] = {}
+        self.index_html: bytes = b""
+        self.index_etag: str = ""
+        self._build()
+
+    def _build(self):
+        for root, _, files in os.walk(self.dist_dir):
+            for filename in files:
+                # Variantes comprimidas são anexadas ao arquivo original
+                if filename.endswith((".br", ".gz")):
+                    continue
+
+                path = os.path.join(root, filename)
+                relative = os.path.relpath(path, self.dist_dir).replace(os.sep, "/")
+
+                encodings = {
+                    encoding: path + suffix
+                    for encoding, suffix in PRECOMPRESSED_ENCODINGS
+                    if os.path.isfile(path + suffix)
+                }
+
+                with open(path, "rb") as f:
+                    content = f.read()
+
+                self.assets[relative] = StaticAsset(
+                    path=path,
+                    media_type=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    etag=f'"{hashlib.md5(content).hexdigest()}"',
+                    immutable=bool(HASHED_ASSET_PATTERN.match(relative)),
+                    encodings=encodings,
+                )
+
+                if relative == "index.html":
+                    self.index_html = content
+                    self.index_etag = self.assets[relative].etag
+
+    def serve(self, full_path: str, request: Request) -> Response:
+        '''
+        Entrega um arquivo do manifesto ou o index.html (rotas do React).
+
+        :param full_path: Caminho solicitado (sem a barra inicial).
+        :param request: Requisição atual (Accept-Encoding / If-None-Match).
+        :return: Resposta com cabeçalhos de cache adequados.
+        '''
+        asset = self.assets.get(full_path)
+
+        if asset is None or full_path == "index.html":
+            # Asset com hash inexistente não deve virar index.html
+            if full_path.startswith("assets/"):
+                return Response(status_code=404)
+            return self._serve_index(request)
+
+        # Cada codificação é outra sequência de bytes: ETag forte próprio (RFC 7232)
+        encoding = _negotiate_encoding(request, asset.encodings)
+        etag = asset.etag if encoding is None else f'{asset.etag[:-1]}-{encoding}"'
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL,
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+        }
+
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        path = asset.path
+        if encoding:
+            path = asset.encodings[encoding]
+            headers["Content-Encoding"] = encoding
+
+        return FileResponse(path, media_type=asset.media_type, headers=headers)
+
+    def _serve_index(self, request: Request) -> Response:
+        headers = {
+            "Cache-Control": REVALIDATE_CACHE_CONTROL,
+            "ETag": self.index_etag,
+        }
+
+        if _etag_matches(request, self.index_etag):
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=self.index_html, media_type="text/html", headers=headers)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    '''Verifica o cabeçalho If-None-Match contra o ETag do arquivo.'''
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _negotiate_encoding(request: Request, available: dict[str, str]) -> str | None:
+    '''Escolhe a variante pré-comprimida aceita pelo cliente (br > gzip).'''
+    if not available:
+        return None
+
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+
+    for encoding, _ in PRECOMPRESSED_ENCODINGS:
+        if encoding in available and encoding in accepted:
+            return encoding
+    return None
@@ -0,0 +1,156 @@
+# Dependências
+import hashlib
+import math
+import threading
+import time
+from typing import Optional
+
+from app.core.config import JWT_EXPIRE_MINUTES, TOKEN_REVOCATION_BLOOM_CAPACITY
+
+# ---------------------------------------------------
+# Denylist de tokens (em memória)
+# ---------------------------------------------------
+# Permite validar o JWT sem consultar o banco: em vez de reler o usuário a
+# cada requisição, revogamos os tokens emitidos antes de uma mudança que
+# invalida as claims (desativação, troca de papel, exclusão) ou um token
+# específico pelo `jti` (logout). Uma entrada só precisa viver o tempo de
+# vida de um token; depois disso é descartada. A cópia persistente fica na
+# tabela token_revocations (ver app.services.token_revocation_service).
+
+class BloomFilter:
+    '''
+    Filtro de Bloom simples (bytearray + double hashing com blake2b).
+
+    Responde "com certeza não está" ou "talvez esteja"; a grande maioria dos
+    tokens nunca foi revogada, então a checagem exata quase nunca é necessária.
+
+    :param capacity: Número esperado de elementos.
+    :param error_rate: Taxa de falso positivo desejada.
+    '''
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenDenylist:
+    '''
+    Revoga tokens por `jti`, por usuário (`sub`) ou por empresa (`company_id`).
+
+    - `jti`: Bloom filter na frente de um conjunto exato (jti -> expiração).
+    - usuário/empresa: o token é revogado se foi emitido (`iat`) até o instante
+      da revogação. Tokens emitidos depois (ex: após reativar o usuário) valem.
+
+    :param ttl_seconds: Por quanto tempo manter revogações de usuário/empresa.
+    :param bloom_capacity: Capacidade inicial do Bloom filter (cresce se preciso).
+    '''
+
+    def __init__(
+        self,
+        ttl_seconds: float = JWT_EXPIRE_MINUTES * 60,
+        bloom_capacity: int = TOKEN_REVOCATION_BLOOM_CAPACITY
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._jtis: dict[str, float] = {}
+        self._bloom = BloomFilter(bloom_capacity)
+        self._subjects: dict[str, float] = {}
+        self._companies: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        '''Revoga um token específico até sua expiração (`exp`).'''
+        with self._lock:
+            self._jtis[jti] = expires_at
+            if len(self._jtis) > self._bloom.capacity:
+                self._rebuild_bloom(self._bloom.capacity * 2)
+            else:
+                self._bloom.add(jti)
+
+    def revoke_subject(self, user_id, at: Optional[float] = None) -> None:
+        '''Revoga todos os tokens do usuário emitidos até `at` (padrão: agora).'''
+        self.purge()
+        with self._lock:
+            key = str(user_id)
+            at = at if at is not None else time.time()
+            self._subjects[key] = max(at, self._subjects.get(key, at))
+
+    def revoke_company(self, company_id, at: Optional[float] = None) -> None:
+        '''Revoga todos os tokens dos usuários da empresa emitidos até `at`.'''
+        self.purge()
+        with self._lock:
+            key = str(company_id)
+            at = at if at is not None else time.time()
+            self._companies[key] = max(at, self._companies.get(key, at))
+
+    def is_revoked(self, payload: dict) -> bool:
+        '''
+        Verifica o payload de um token já decodificado.
+
+        :param payload: Claims do JWT (`jti`, `sub`, `company_id`, `iat`).
+        :return: True se o token foi revogado.
+        '''
+        jti = payload.get("jti")
+        if jti and jti in self._bloom and jti in self._jtis:
+            return True
+
+        issued_at = float(payload.get("iat") or 0)
+
+        revoked_at = self._subjects.get(str(payload.get("sub")))
+        if revoked_at is not None and issued_at <= revoked_at:
+            return True
+
+        company_id = payload.get("company_id")
+        if company_id:
+            revoked_at = self._companies.get(str(company_id))
+            if revoked_at is not None and issued_at <= revoked_at:
+                return True
+
+        return False
+
+    def purge(self, now: Optional[float] = None) -> int:
+        '''Remove tokens já expirados e revogações mais antigas que um token.'''
+        now = now if now is not None else time.time()
+        cutoff = now - self.ttl_seconds
+        removed = 0
+        with self._lock:
+            for entries in (self._subjects, self._companies):
+                for key in [k for k, at in entries.items() if at < cutoff]:
+                    del entries[key]
+                    removed += 1
+
+            expired = [jti for jti, exp in self._jtis.items() if exp < now]
+            for jti in expired:
+                del self._jtis[jti]
+            # Bloom filter não remove itens: reconstrói a partir do conjunto exato
+            if expired:
+                self._rebuild_bloom(self._bloom.capacity)
+            removed += len(expired)
+        return removed
+
+    def _rebuild_bloom(self, capacity: int) -> None:
+        bloom = BloomFilter(max(capacity, len(self._jtis)))
+        for jti in self._jtis:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def __len__(self) -> int:
+        return len(self._jtis) + len(self._subjects) + len(self._companies)
+
+
+# Instância única do processo
+token_denylist = TokenDenylist()
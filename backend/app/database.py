@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from typing import Generator
+from fastapi import Depends, Request
 import os
 from dotenv import load_dotenv
 
@@ -17,6 +18,19 @@ if not DATABASE_URL:
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# URL da réplica de leitura (opcional)
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+if DATABASE_READ_URL and DATABASE_READ_URL.startswith("postgres://"):
+    DATABASE_READ_URL = DATABASE_READ_URL.replace("postgres://", "postgresql://", 1)
+
+# Janela (em segundos) em que o usuário fica fixado no primário após uma escrita
+READ_PIN_SECONDS = int(os.getenv("DATABASE_READ_PIN_SECONDS", 10))
+
+# Cookie / header que fixam a leitura no primário (read-your-writes)
+READ_PIN_COOKIE = "lq_primary_pin"
+READ_PIN_HEADER = "X-Read-Primary"
+
 # -------------------------
 # Engine
 # -------------------------
@@ -26,6 +40,13 @@ engine = create_engine(
     future=True
 )
 
+# Engine da réplica (None quando não configurada)
+read_engine = create_engine(
+    DATABASE_READ_URL,
+    pool_pre_ping=True,
+    future=True
+) if DATABASE_READ_URL else None
+
 # -------------------------
 # Session
 # -------------------------
@@ -36,6 +57,13 @@ SessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False
+) if read_engine is not None else None
+
 # -------------------------
 # Base
 # -------------------------
@@ -49,4 +77,33 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def is_pinned_to_primary(request: Request) -> bool:
+    '''Indica se a requisição deve ler do primário (escrita recente do cliente).'''
+    if request.cookies.get(READ_PIN_COOKIE):
+        return True
+    return request.headers.get(READ_PIN_HEADER, "").lower() in ("1", "true")
+
+
+def get_read_db(
+    request: Request,
+    db: Session = Depends(get_db)
+) -> Generator[Session, None, None]:
+    '''Sessão para endpoints somente leitura.
+
+    Usa a réplica (`DATABASE_READ_URL`) quando configurada. Se o cliente fez
+    uma escrita recente (cookie/header de pin), ou se não houver réplica,
+    reaproveita a sessão do primário. A sessão do primário é preguiçosa e
+    não abre conexão se não for usada.
+    '''
+    if ReadSessionLocal is None or is_pinned_to_primary(request):
+        yield db
+        return
+
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+from app.models.enum import MovementType, OperationStatus
+from app.domain.operation_state_machine import can_transition
+
+# ---------------------------------------------------
+# Projeção do status a partir das movimentações
+# ---------------------------------------------------
+# As movimentações OPERATION_CREATED e STATUS_CHANGED formam o log de eventos
+# da operação. Reaplicá-las em ordem reconstrói o status atual e o instante em
+# que cada etapa começou, sem depender de operations.status/updated_at. Serve
+# para auditoria (divergências entre o log e a tabela) e para calcular tempo
+# em cada etapa.
+
+@dataclass
+class OperationProjection:
+    '''
+    Estado de uma operação reconstruído a partir das suas movimentações.
+
+    :param operation_id: ID da operação (entity_id das movimentações).
+    :param status: Status após o último evento.
+    :param history: Sequência (status, início da etapa), na ordem dos eventos.
+    :param anomalies: Eventos inconsistentes com a máquina de estados.
+    '''
+    operation_id: object
+    status: Optional[OperationStatus] = None
+    history: list[tuple[OperationStatus, datetime]] = field(default_factory=list)
+    anomalies: list[str] = field(default_factory=list)
+
+    @property
+    def entered_at(self) -> dict[OperationStatus, datetime]:
+        '''Primeira entrada em cada status.'''
+        entered = {}
+        for status, at in self.history:
+            entered.setdefault(status, at)
+        return entered
+
+    def apply(self, movement) -> None:
+        '''Aplica um evento (OPERATION_CREATED ou STATUS_CHANGED); os demais são ignorados.'''
+        if movement.type == MovementType.OPERATION_CREATED:
+            if self.history:
+                self.anomalies.append(f"Criação repetida em {movement.created_at}")
+            self._enter(OperationStatus.CREATED, movement.created_at)
+            return
+
+        if movement.type != MovementType.STATUS_CHANGED or movement.new_status is None:
+            return
+
+        previous = movement.previous_status
+        if self.status is not None and previous is not None and previous != self.status:
+            self.anomalies.append(
+                f"Status anterior {previous} diverge do projetado {self.status} em {movement.created_at}"
+            )
+        source = previous if previous is not None else self.status
+        if source is not None and not can_transition(source, movement.new_status):
+            self.anomalies.append(f"Transição inválida {source} → {movement.new_status} em {movement.created_at}")
+
+        self._enter(movement.new_status, movement.created_at)
+
+    def stage_durations(self, until: Optional[datetime] = None) -> dict[OperationStatus, float]:
+        '''
+        Segundos passados em cada status (somando visitas repetidas, ex: AT_HUB).
+
+        :param until: Fim da etapa atual; se None, a etapa atual não é contada.
+        :return: Duração por status.
+        '''
+        durations: dict[OperationStatus, float] = {}
+        ends = [at for _, at in self.history[1:]] + [until]
+        for (status, started_at), ended_at in zip(self.history, ends):
+            if ended_at is not None:
+                durations[status] = durations.get(status, 0.0) + (ended_at - started_at).total_seconds()
+        return durations
+
+    def _enter(self, status: OperationStatus, at: datetime) -> None:
+        self.status = status
+        self.history.append((status, at))
+
+
+def project_operations(movements: Iterable) -> dict[object, OperationProjection]:
+    '''
+    Reconstrói várias operações em uma única passada.
+
+    :param movements: Movimentações ordenadas por created_at (podem vir misturadas
+                      entre operações; basta a ordem dentro de cada uma).
+    :return: Projeção por ID de operação.
+    '''
+    projections: dict[object, OperationProjection] = {}
+    for movement in movements:
+        projection = projections.get(movement.entity_id)
+        if projection is None:
+            projection = projections[movement.entity_id] = OperationProjection(movement.entity_id)
+        projection.apply(movement)
+    return projections
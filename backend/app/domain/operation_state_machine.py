@@ -1,4 +1,5 @@
 from app.models.operation import OperationStatus
+from app.models.enum import OperationType
 
 # Define as transições permitidas entre os estados da operação
 ALLOWED_TRANSITIONS: dict[OperationStatus, set[OperationStatus]] = {
@@ -30,10 +31,118 @@ ALLOWED_TRANSITIONS: dict[OperationStatus, set[OperationStatus]] = {
     },
 
     OperationStatus.UNLOADED: {
+        OperationStatus.DELIVERED,
         OperationStatus.COMPLETED,
         OperationStatus.CANCELED,
     },
 
+    # Entregue ao destinatário: final, assim como COMPLETED (ver KPIs)
+    OperationStatus.DELIVERED: set(),
     OperationStatus.COMPLETED: set(),
     OperationStatus.CANCELED: set(),
 }
+
+
+# ---------------------------------------------------
+# Efeitos no estoque (ver app.services.inventory_service)
+# ---------------------------------------------------
+# Ao entrar em LOADED a carga sai do estoque disponível (reserva); ao entrar em
+# COMPLETED ou DELIVERED a reserva vira baixa definitiva. Cancelar uma operação que ainda
+# segura reserva devolve as quantidades ao disponível.
+STOCK_RESERVE_STATUS = OperationStatus.LOADED
+STOCK_COMMIT_STATUSES: set[OperationStatus] = {
+    OperationStatus.COMPLETED,
+    OperationStatus.DELIVERED,
+}
+
+# Status em que a operação mantém reserva de estoque
+STOCK_RESERVED_STATUSES: set[OperationStatus] = {
+    OperationStatus.LOADED,
+    OperationStatus.IN_TRANSIT,
+    OperationStatus.AT_HUB,
+    OperationStatus.UNLOADED,
+}
+
+# Tipos de operação que trazem carga para o estoque (baixa vira entrada, sem reserva)
+INBOUND_OPERATION_TYPES: set[OperationType] = {
+    OperationType.PICKUP,
+    OperationType.RETURN,
+}
+
+
+# ---------------------------------------------------
+# Tabelas pré-computadas (no import)
+# ---------------------------------------------------
+# Cada status vira um índice inteiro. TRANSITION_MASKS[i] tem o bit j ligado se
+# i -> j é permitido; REACHABLE_MASKS[i], se j é alcançável em um ou mais
+# passos. DISTANCES/NEXT_HOP guardam o menor caminho entre cada par (BFS a
+# partir de cada status; -1 = inalcançável).
+STATES: tuple[OperationStatus, ...] = tuple(OperationStatus)
+STATE_INDEX: dict[OperationStatus, int] = {state: index for index, state in enumerate(STATES)}
+
+TRANSITION_MASKS: tuple[int, ...] = tuple(
+    sum(1 << STATE_INDEX[target] for target in ALLOWED_TRANSITIONS.get(state, ()))
+    for state in STATES
+)
+
+
+def _bfs(source: int) -> tuple[list[int], list[int]]:
+    distances = [-1] * len(STATES)
+    next_hop = [-1] * len(STATES)
+    distances[source] = 0
+    frontier = [source]
+    while frontier:
+        following = []
+        for current in frontier:
+            for target in range(len(STATES)):
+                if TRANSITION_MASKS[current] >> target & 1 and distances[target] == -1:
+                    distances[target] = distances[current] + 1
+                    next_hop[target] = target if current == source else next_hop[current]
+                    following.append(target)
+        frontier = following
+    return distances, next_hop
+
+
+_TABLES = [_bfs(source) for source in range(len(STATES))]
+DISTANCES: tuple[tuple[int, ...], ...] = tuple(tuple(distances) for distances, _ in _TABLES)
+NEXT_HOP: tuple[tuple[int, ...], ...] = tuple(tuple(next_hop) for _, next_hop in _TABLES)
+# Alcançável = algum sucessor direto alcança o destino (inclui ciclos, ex: IN_TRANSIT <-> AT_HUB)
+REACHABLE_MASKS: tuple[int, ...] = tuple(
+    sum(
+        1 << target
+        for target in range(len(STATES))
+        if any(TRANSITION_MASKS[source] >> hop & 1 and DISTANCES[hop][target] >= 0 for hop in range(len(STATES)))
+    )
+    for source in range(len(STATES))
+)
+TERMINAL_STATES: frozenset[OperationStatus] = frozenset(
+    state for state in STATES if not TRANSITION_MASKS[STATE_INDEX[state]]
+)
+del _TABLES
+
+
+def can_transition(current_status: OperationStatus, new_status: OperationStatus) -> bool:
+    '''Transição direta permitida (um teste de bit).'''
+    return bool(TRANSITION_MASKS[STATE_INDEX[current_status]] >> STATE_INDEX[new_status] & 1)
+
+
+def is_reachable(current_status: OperationStatus, new_status: OperationStatus) -> bool:
+    '''Existe caminho (um ou mais passos) de `current_status` até `new_status`.'''
+    return bool(REACHABLE_MASKS[STATE_INDEX[current_status]] >> STATE_INDEX[new_status] & 1)
+
+
+def shortest_path(current_status: OperationStatus, new_status: OperationStatus) -> list[OperationStatus] | None:
+    '''
+    Menor sequência de status de `current_status` até `new_status` (inclusive).
+
+    :return: Lista de status a percorrer, [] se já está no destino, None se inalcançável.
+    '''
+    source, target = STATE_INDEX[current_status], STATE_INDEX[new_status]
+    if DISTANCES[source][target] < 0:
+        return None
+
+    path = []
+    while source != target:
+        source = NEXT_HOP[source][target]
+        path.append(STATES[source])
+    return path
@@ -1,5 +1,5 @@
 from app.models.operation import OperationStatus
-from app.domain.operation_state_machine import ALLOWED_TRANSITIONS
+from app.domain.operation_state_machine import can_transition
 
 # Exceção personalizada para transições inválidas
 class InvalidOperationTransition(Exception):
@@ -18,11 +18,8 @@ def validate_status_transition(
     Raises:
         InvalidOperationTransition: Se a transição não for permitida.
     '''
-    # Obtém os estados permitidos para a transição atual
-    allowed = ALLOWED_TRANSITIONS.get(current_status, set())
-
-    # Verifica se a transição é permitida
-    if new_status not in allowed:
+    # Verifica na matriz pré-computada se a transição é permitida
+    if not can_transition(current_status, new_status):
         raise InvalidOperationTransition(
             f"Transição inválida: {current_status} → {new_status}"
         )
\ No newline at end of file
@@ -1,12 +1,28 @@
+import asyncio
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from contextlib import asynccontextmanager
-from app.database import engine
-from app.models.base import Base
-from app.routes import auth, products, users, companies, system_admin, operations, movements, dashboard, partner
+from contextlib import asynccontextmanager, suppress
+from app.database import engine, SessionLocal, READ_PIN_COOKIE, READ_PIN_SECONDS
+from app.core.config import (
+    COMPRESSION_CONTENT_TYPES, COMPRESSION_ENCODINGS, COMPRESSION_LEVEL, COMPRESSION_MINIMUM_SIZE,
+    MIGRATION_CHECK_MODE, FAST_JSON_RESPONSES,
+    PASSWORD_HASH_RETRY_AFTER, TOKEN_REVOCATION_SYNC_SECONDS, LOGIN_FAILURE_FLUSH_SECONDS,
+    SCHEDULER_ENABLED, SCHEDULER_TICK_SECONDS,
+    SCHEDULER_LOCK_KEY, COMPANY_METRICS_REFRESH_SECONDS, STAGE_ROLLUP_REFRESH_SECONDS, LATE_OPERATIONS_SWEEP_SECONDS
+)
+from app.core.compression import CompressionMiddleware
+from app.core.password_pool import PasswordPoolSaturated
+from app.core.migrations import check_migration_state
+from app.core.scheduler import AdvisoryLockLeader, Scheduler
+from app.core.spa import SpaManifest
+from app.services.login_failure_service import login_failure_buffer, run_login_failure_flush
+from app.services.token_revocation_service import run_token_revocation_sync
+from app.services.company_metrics_service import refresh_company_metrics
+from app.services.stage_analytics_service import refresh_stage_rollup
+from app.services.late_operation_service import sweep_late_operations
+from app.routes import auth, products, users, companies, system_admin, operations, movements, dashboard, partner, analytics
 
 # =================================================================
 # 1. Configuração do Caminho do Frontend (Dist)
@@ -21,16 +37,38 @@ DIST_DIR = os.path.join(BASE_DIR, "../dist")
 # =================================================================
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Cria as tabelas do banco
+    # Startup: Verifica se o banco está na head das migrations (sem DDL).
+    # O schema é responsabilidade do Alembic ("alembic upgrade head").
     print("Inicializando LogistiQ API...")
-    # DEBUG: Imprime as tabelas que serão criadas (ajuda a identificar erros de modelagem)
-    print(Base.metadata.tables.keys())
-    
-    
-    Base.metadata.create_all(bind=engine)
+    check_migration_state(engine, mode=MIGRATION_CHECK_MODE)
+    # Carrega e mantém sincronizada a denylist de tokens (com purge dos expirados)
+    revocation_sync = asyncio.create_task(run_token_revocation_sync(TOKEN_REVOCATION_SYNC_SECONDS))
+    # Falhas de login em memória: cada worker grava o próprio lote quando vence
+    failure_flush = asyncio.create_task(run_login_failure_flush(LOGIN_FAILURE_FLUSH_SECONDS))
+    # Rollups diários: um único worker (advisory lock) roda os jobs
+    scheduler_task = None
+    if SCHEDULER_ENABLED:
+        scheduler = Scheduler(AdvisoryLockLeader(engine, SCHEDULER_LOCK_KEY), tick_seconds=SCHEDULER_TICK_SECONDS)
+        scheduler.add_job("daily_company_metrics", COMPANY_METRICS_REFRESH_SECONDS, refresh_company_metrics)
+        scheduler.add_job("operation_stage_daily", STAGE_ROLLUP_REFRESH_SECONDS, refresh_stage_rollup)
+        scheduler.add_job("late_operations", LATE_OPERATIONS_SWEEP_SECONDS, sweep_late_operations)
+        scheduler_task = asyncio.create_task(scheduler.run())
     yield
 
     print("Encerrando LogistiQ API...")
+    background_tasks = [task for task in (revocation_sync, failure_flush, scheduler_task) if task is not None]
+    for task in background_tasks:
+        task.cancel()
+    # Espera o encerramento: o scheduler libera o advisory lock (e a conexão dele) no finally
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    # Grava as falhas de login ainda em memória
+    with SessionLocal() as db:
+        try:
+            login_failure_buffer.flush(db)
+        except Exception as e:
+            print(f"Failed to flush login failures: {e}")
 
 # =================================================================
 # 3. Inicialização do App
@@ -41,6 +79,9 @@ app = FastAPI(
     description="Sistema SaaS para gestão logística multiempresa.", 
     lifespan=lifespan,
 
+    # Serialização JSON via orjson quando o caminho rápido estiver habilitado
+    default_response_class=ORJSONResponse if FAST_JSON_RESPONSES else JSONResponse,
+
     docs_url= None if os.getenv("ENV") == "production" else "/docs",
     redoc_url= None if os.getenv("ENV") == "production" else "/redoc",
     openapi_url= None if os.getenv("ENV") == "production" else "/openapi.json",
@@ -65,6 +106,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# =================================================================
+# 4.1 Compressão das respostas (gzip / br / zstd)
+# =================================================================
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MINIMUM_SIZE,
+    level=COMPRESSION_LEVEL,
+    encodings=COMPRESSION_ENCODINGS,
+    compressible_types=COMPRESSION_CONTENT_TYPES,
+)
+
+# =================================================================
+# 4.2 Read-your-writes (réplica de leitura)
+# =================================================================
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+@app.middleware("http")
+async def pin_primary_after_write(request: Request, call_next):
+    # Após uma escrita bem-sucedida, fixa o cliente no primário por alguns
+    # segundos para que as leituras seguintes vejam o que acabou de gravar
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            READ_PIN_COOKIE,
+            "1",
+            max_age=READ_PIN_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+# =================================================================
+# 4.3 Admissão do pool de hash de senhas
+# =================================================================
+@app.exception_handler(PasswordPoolSaturated)
+async def password_pool_saturated_handler(request: Request, exc: PasswordPoolSaturated):
+    # Pool de bcrypt cheio: recusa rápido em vez de enfileirar indefinidamente
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Muitas requisições de autenticação. Tente novamente em instantes."},
+        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER)},
+    )
+
 # =================================================================
 # 5. Rotas da API (DEVEM vir antes dos arquivos estáticos)
 # =================================================================
@@ -77,32 +161,26 @@ app.include_router(movements.router)
 app.include_router(operations.router)
 app.include_router(dashboard.router)
 app.include_router(partner.router)
+app.include_router(analytics.router)
 
 # =================================================================
 # 6. Servindo o Frontend (React/Vite)
 # =================================================================
 
 if os.path.exists(DIST_DIR):
-    # A. Monta a pasta de assets (JS, CSS, Imagens do Vite)
-    # O Vite coloca tudo em dist/assets, então servimos em /assets
-    assets_dir = os.path.join(DIST_DIR, "assets")
-    if os.path.exists(assets_dir):
-        app.mount("/assets", StaticFiles(directory=assets_dir), name="assets")
+    # Manifesto em memória da dist (construído uma vez no startup).
+    # - Assets com hash (dist/assets/*-<hash>.js|css) recebem Cache-Control immutable
+    # - Variantes .br/.gz pré-comprimidas são servidas conforme Accept-Encoding
+    # - index.html usa ETag e responde 304 quando não mudou
+    spa_manifest = SpaManifest(DIST_DIR)
 
-    # B. Rota "Catch-All" para SPA (Single Page Application)
+    # Rota "Catch-All" para SPA (Single Page Application)
     # Qualquer rota que NÃO for da API, cai aqui.
-    # Se o arquivo existir (ex: favicon.ico), entrega ele.
+    # Se o arquivo existir no manifesto (ex: /assets/..., favicon), entrega ele.
     # Se não, entrega o index.html e deixa o React lidar com a rota.
     @app.get("/{full_path:path}")
-    async def serve_react_app(full_path: str):
-        file_path = os.path.join(DIST_DIR, full_path)
-        
-        # Se for um arquivo físico que existe, retorna ele
-        if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        
-        # Caso contrário, retorna o index.html (React Router assume)
-        return FileResponse(os.path.join(DIST_DIR, "index.html"))
+    async def serve_react_app(full_path: str, request: Request):
+        return spa_manifest.serve(full_path, request)
 else:
     print(f"⚠️ AVISO: Pasta 'dist' não encontrada em: {DIST_DIR}")
     print("O frontend não será carregado. Verifique se você moveu a pasta build/dist.")
@@ -8,4 +8,12 @@ from app.models.operation import Operation
 from app.models.movement import Movement
 from app.models.partner import Partner
 from app.models.system_setting import SystemSetting
-from app.models.operation_item import OperationItem
\ No newline at end of file
+from app.models.operation_item import OperationItem
+from app.models.login_failure import LoginFailure
+from app.models.token_revocation import TokenRevocation
+from app.models.operation_stage_daily import OperationStageDaily
+from app.models.daily_company_metrics import DailyCompanyMetrics
+from app.models.rollup_watermark import RollupWatermark
+from app.models.late_operation_count import LateOperationCount
+from app.models.resource_version import ResourceVersion
+from app.models.operation_counter import OperationCounter
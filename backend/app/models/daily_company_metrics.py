@@ -0,0 +1,34 @@
+import uuid
+from sqlalchemy import Date, DateTime, Integer, Numeric, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class DailyCompanyMetrics(Base):
+    '''Contadores diários por empresa, mantidos pelo agendador (ver app.services.company_metrics_service).
+
+    Os dashboards leem daqui em vez de recontar as tabelas vivas. O dia é o
+    dia (UTC) do evento: criação da operação/produto, mudança de status ou login.
+    '''
+    __tablename__ = "daily_company_metrics"
+    __table_args__ = (
+        UniqueConstraint("company_id", "day", name="uq_daily_company_metrics_company_day"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    day: Mapped[str] = mapped_column(Date, nullable=False, index=True)
+    company_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+
+    operations_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    operations_completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    operations_canceled: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_value: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    logins: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    new_products: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    refreshed_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
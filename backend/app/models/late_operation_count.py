@@ -0,0 +1,19 @@
+import uuid
+from sqlalchemy import DateTime, Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class LateOperationCount(Base):
+    '''Quantidade de operações em aberto e atrasadas por empresa.
+
+    Recalculada pelo sweeper (ver app.services.late_operation_service); os KPIs
+    leem daqui em vez de varrer operations por expected_delivery_date.
+    '''
+    __tablename__ = "late_operation_counts"
+
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("companies.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    late_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    refreshed_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
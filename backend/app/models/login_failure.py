@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class LoginFailure(Base):
+    '''Tentativas de login malsucedidas, agregadas por (usuário, IP) e janela de flush.
+
+    Em vez de um Movement por tentativa, as falhas ficam em memória e são
+    gravadas em lote (ver app.services.login_failure_service).
+    '''
+    __tablename__ = "login_failures"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    username: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    ip_address: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+    # Quantas dessas tentativas foram barradas pelo rate limit (sem consulta ao banco nem hash)
+    rate_limited: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    first_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
 # Importação de bibliotecas padrão
 import uuid
-from sqlalchemy import String, DateTime, Enum, ForeignKey
+from sqlalchemy import String, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -31,6 +31,10 @@ class Movement(Base):
         created_at (str): Timestamp de quando o movimento foi criado.
     '''
     __tablename__ = "movements"
+    __table_args__ = (
+        # Histórico por entidade em ordem cronológica (LAG das análises de etapa)
+        Index("ix_movements_entity_id_created_at", "entity_id", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -1,6 +1,6 @@
 # Importações padrão
 import uuid
-from sqlalchemy import Numeric, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Numeric, String, DateTime, Enum, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -9,6 +9,9 @@ from sqlalchemy.sql import func
 from app.models.base import Base
 from app.models.enum import OperationStatus, OperationType
 
+# Operações em aberto (status fora de DELIVERED/COMPLETED/CANCELED); o Enum grava o nome
+OPEN_OPERATION_FILTER = "status NOT IN ('CANCELED', 'COMPLETED', 'DELIVERED')"
+
 # Definição do modelo Operation
 class Operation(Base):
     '''Modelo que representa uma operação dentro do sistema.
@@ -25,11 +28,29 @@ class Operation(Base):
         origin (str | None): Local de origem da operação.
         destination (str | None): Local de destino da operação.
         expected_delivery_date (str | None): Data prevista para entrega.
+        late_flagged_at (str | None): Quando o sweeper marcou a operação como atrasada.
         created_at (str): Timestamp de criação da operação.
         updated_at (str): Timestamp da última atualização da operação.
         updated_by (uuid.UUID | None): Identificador do usuário que realizou a última atualização.
     '''
     __tablename__ = "operations"
+    __table_args__ = (
+        # Índices parciais só com operações em aberto (ver app.services.late_operation_service):
+        # candidatas a atraso ainda não marcadas, por data prevista...
+        Index(
+            "ix_operations_open_expected_delivery",
+            "expected_delivery_date",
+            postgresql_where=text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NULL"),
+            sqlite_where=text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NULL"),
+        ),
+        # ...e atrasadas já marcadas, por empresa (contagem materializada)
+        Index(
+            "ix_operations_open_late_company",
+            "company_id",
+            postgresql_where=text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NOT NULL"),
+            sqlite_where=text(f"{OPEN_OPERATION_FILTER} AND late_flagged_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -94,6 +115,11 @@ class Operation(Base):
         nullable=True
     )
 
+    late_flagged_at: Mapped[str | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+
     observation: Mapped[str | None] = mapped_column(
         String(500),
         nullable=True
@@ -0,0 +1,19 @@
+import uuid
+from sqlalchemy import Integer, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class OperationCounter(Base):
+    '''Último número de operação reservado por empresa.
+
+    Incrementado com um upsert atômico (ver OperationService._next_operation_numbers):
+    a linha fica travada até o commit, então criações concorrentes na mesma
+    empresa recebem blocos de números disjuntos.
+    '''
+    __tablename__ = "operation_counters"
+
+    company_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("companies.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    last_number: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -0,0 +1,37 @@
+import uuid
+from sqlalchemy import Date, DateTime, Float, Index, Integer, String, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class OperationStageDaily(Base):
+    '''Rollup diário do tempo das operações em cada etapa, por empresa e parceiro.
+
+    Calculado a partir das movimentações (ver app.services.stage_analytics_service);
+    os relatórios leem daqui em vez de reprocessar o histórico. `partner_id` nulo
+    é a linha da empresa inteira. `stage` é um OperationStatus ou "LEAD_TIME"
+    (da criação até COMPLETED/DELIVERED). O dia é o dia (UTC) em que a etapa terminou.
+    '''
+    __tablename__ = "operation_stage_daily"
+    __table_args__ = (
+        Index("ix_operation_stage_daily_company_day", "company_id", "day"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    day: Mapped[str] = mapped_column(Date, nullable=False, index=True)
+    company_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+    partner_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    stage: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    samples: Mapped[int] = mapped_column(Integer, nullable=False)
+    total_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    p50_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    p95_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    max_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+
+    refreshed_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
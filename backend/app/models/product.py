@@ -1,6 +1,6 @@
 # Importações padrão
 import uuid
-from sqlalchemy import Column, DateTime, Integer, String, Numeric, Boolean, ForeignKey, func
+from sqlalchemy import Column, DateTime, Index, Integer, String, Numeric, Boolean, ForeignKey, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -17,7 +17,8 @@ class Product(Base):
         name (str): Nome do produto.
         description (str): Descrição do produto.
         sku (str): Código SKU do produto.
-        quantity (int): Quantidade disponível do produto.
+        quantity (int): Quantidade em estoque do produto.
+        reserved_quantity (int): Quantidade reservada por operações carregadas e ainda não concluídas.
         price (Decimal): Preço do produto.
         is_active (bool): Indica se o produto está ativo.
         created_by (UUID): Identificador do usuário que criou o produto.
@@ -28,6 +29,10 @@ class Product(Base):
         company (Company): Empresa proprietária do produto.
     '''
     __tablename__ = "products"
+    __table_args__ = (
+        # SKU único por empresa (alvo do upsert da importação de produtos)
+        Index("uq_products_company_sku", "company_id", "sku", unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, index=True, default=uuid.uuid4)
 
@@ -44,6 +49,7 @@ class Product(Base):
     description = Column(String(255), nullable=True)
     sku = Column(String(80), nullable=True, index=True)
     quantity = Column(Integer, default=0, nullable=False)
+    reserved_quantity = Column(Integer, default=0, server_default="0", nullable=False)
     price = Column(Numeric(10, 2), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
 
@@ -0,0 +1,18 @@
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class ResourceVersion(Base):
+    '''Contador de versão de um recurso listável por empresa (ETag das listagens).
+
+    Incrementado na mesma transação de cada escrita (ver
+    app.services.resource_version_service). `scope` é o ID da empresa em texto
+    ("-" para registros sem empresa); sem FK, para que a soma global usada
+    pelo SYSTEM_ADMIN nunca diminua.
+    '''
+    __tablename__ = "resource_versions"
+
+    scope: Mapped[str] = mapped_column(String(36), primary_key=True)
+    resource: Mapped[str] = mapped_column(String(32), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,10 @@
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class RollupWatermark(Base):
+    '''Marca d'água de cada rollup: até onde os eventos de origem já foram processados.'''
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    watermark: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
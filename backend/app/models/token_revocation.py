@@ -0,0 +1,30 @@
+import uuid
+from sqlalchemy import String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class TokenRevocation(Base):
+    '''Revogação de tokens JWT, espelhada em memória pela denylist.
+
+    Tipos (`kind`):
+        jti: um token específico (ex: logout); `key` é o jti.
+        user: todos os tokens do usuário emitidos até `revoked_at`.
+        company: todos os tokens da empresa emitidos até `revoked_at`.
+
+    Linhas com `expires_at` no passado não têm mais efeito e são removidas
+    periodicamente.
+    '''
+    __tablename__ = "token_revocations"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    key: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    revoked_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    expires_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
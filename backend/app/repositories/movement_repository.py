@@ -13,6 +13,7 @@ class MovementRepository:
     Métodos:
         - create: Cria uma nova movimentação.
         - list_by_entity: Lista movimentações por tipo e ID da entidade.
+        - list_lifecycle: Lista criação e mudanças de status de várias operações.
     '''
 
     @staticmethod
@@ -83,4 +84,26 @@ class MovementRepository:
             )
             .order_by(Movement.created_at.asc())
             .all()
-        )
\ No newline at end of file
+        )
+    @staticmethod
+    def list_lifecycle(
+        db: Session,
+        *,
+        operation_ids: list[UUID],
+    ) -> list[Movement]:
+        '''Lista os eventos de ciclo de vida (criação e mudanças de status) de várias operações.
+
+        Parâmetros:
+            - db: Sessão do banco de dados.
+            - operation_ids: IDs das operações.
+        '''
+        return (
+            db.query(Movement)
+            .filter(
+                Movement.entity_type == MovementEntityType.OPERATION,
+                Movement.entity_id.in_(operation_ids),
+                Movement.type.in_([MovementType.OPERATION_CREATED, MovementType.STATUS_CHANGED])
+            )
+            .order_by(Movement.created_at.asc(), Movement.id)
+            .all()
+        )
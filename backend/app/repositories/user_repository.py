@@ -1,8 +1,11 @@
 # Importação padrão
+from datetime import datetime
 from sqlalchemy.orm import Session
 
 # Importação local
 from app.models.user import User
+from app.models.company import Company
+from app.core.serialization import rows_to_dicts
 
 # Função para obter um usuário pelo email
 def get_user_by_email(
@@ -15,4 +18,65 @@ def get_user_by_email(
         db (Session): Sessão do banco de dados.
         email (str): Email do usuário a ser buscado.
     '''
-    return db.query(User).filter(User.email == email).first()
\ No newline at end of file
+    return db.query(User).filter(User.email == email).first()
+
+# Função para contar usuários ativos recentemente
+def count_active_users_since(
+    db: Session,
+    cutoff_time: datetime
+) -> int:
+    '''Conta os usuários ativos com atividade a partir de um horário de corte.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        cutoff_time (datetime): Horário de corte para a última atividade.
+    '''
+    return (
+        db.query(User)
+        .filter(User.is_active.is_(True))
+        .filter(User.last_active_at.is_not(None))
+        .filter(User.last_active_at >= cutoff_time)
+        .count()
+    )
+
+
+# Função para listar usuários como projeção (caminho rápido de serialização)
+def list_user_rows(
+    db: Session,
+    company_id=None,
+    exclude_role: str | None = None
+) -> list[dict]:
+    '''Lista usuários no formato do UserResponse, sem carregar entidades ORM.
+
+    Args:
+        db (Session): Sessão do banco de dados.
+        company_id (uuid.UUID | None): Filtra pela empresa (None = todas).
+        exclude_role (str | None): Papel a ser excluído da listagem.
+    '''
+    query = (
+        db.query(
+            User.id,
+            User.name,
+            User.email,
+            User.role,
+            User.company_id,
+            User.updated_at,
+            User.created_at,
+            User.notification_stock_alert,
+            User.notification_weekly_summary,
+            User.theme_preference,
+            User.is_active,
+            Company.id.label("company__id"),
+            Company.name.label("company__name"),
+            Company.cnpj.label("company__cnpj"),
+            Company.stock_alert_limit.label("company__stock_alert_limit"),
+        )
+        .outerjoin(Company, Company.id == User.company_id)
+    )
+
+    if company_id is not None:
+        query = query.filter(User.company_id == company_id)
+    if exclude_role is not None:
+        query = query.filter(User.role != exclude_role)
+
+    return rows_to_dicts(query.all(), nested=("company",))
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.database import get_db, get_read_db
+from app.core.dependencies import require_permission
+from app.core.permissions import Permission, has_permission
+from app.models.user import User
+from app.schemas.analytics import StageRollupSchema, StageRollupRefreshSchema
+from app.services.stage_analytics_service import StageAnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+DEFAULT_RANGE_DAYS = 30
+
+
+def _date_range(start: Optional[date], end: Optional[date]) -> tuple[date, date]:
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return start, end
+
+# ----------------------------------------------
+# GET /analytics/stages
+# ----------------------------------------------
+@router.get("/stages", response_model=List[StageRollupSchema])
+def get_stage_report(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    stage: Optional[str] = None,
+    partner_id: Optional[UUID] = None,
+    by_partner: bool = False,
+    company_id: Optional[UUID] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_permission(Permission.ANALYTICS_VIEW))
+):
+    '''Tempo em cada etapa (mediana, p95, máximo) por dia, lido do rollup diário.
+
+    Parâmetros:
+    - `start`/`end`: Intervalo de dias (padrão: últimos 30 dias).
+    - `stage`: Etapa (status da operação) ou `LEAD_TIME` (criação até a conclusão).
+    - `partner_id`/`by_partner`: Filtra um parceiro ou retorna uma linha por parceiro.
+    - `company_id`: Apenas para quem enxerga todas as empresas.
+
+    Retorna:
+    - Linhas do rollup ordenadas por dia e etapa.
+    '''
+    if not (company_id and has_permission(current_user.role, Permission.ALL_COMPANIES)):
+        company_id = current_user.company_id
+    if company_id is None:
+        raise HTTPException(status_code=400, detail="company_id is required")
+
+    start, end = _date_range(start, end)
+    return StageAnalyticsService(db).report(
+        company_id, start, end, stage=stage, partner_id=partner_id, by_partner=by_partner
+    )
+
+# ----------------------------------------------
+# POST /analytics/stages/refresh
+# ----------------------------------------------
+@router.post("/stages/refresh", response_model=StageRollupRefreshSchema)
+def refresh_stage_rollup(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_permission(Permission.SYSTEM_MANAGE))
+):
+    '''Recalcula o rollup de tempo em etapa para um intervalo de dias (todas as empresas).'''
+    start, end = _date_range(start, end)
+    rows = StageAnalyticsService(db).refresh(start, end)
+    return {"start": start, "end": end, "rows": rows}
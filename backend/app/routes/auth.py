@@ -1,4 +1,5 @@
 # Importações padrão
+import math
 import secrets
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, status, Request
@@ -9,12 +10,16 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 from app.schemas.auth import ForgotPasswordRequest, RegisterRequest, ResetPasswordRequest, TokenResponse, UserMeResponse
-from app.core.security import create_access_token, hash_password, verify_password
-from app.core.dependencies import get_current_user, require_roles
+from app.core.security import create_access_token, decode_access_token, hash_password, verify_and_update_password
+from app.core.dependencies import get_current_user, oauth2_scheme, require_permission
+from app.core.permissions import Permission, has_permission
 from app.models.enum import UserRole
 from app.models.company import Company
 from app.services.movement_service import MovementEntityType, MovementType, MovementService
 from app.core.utils import get_real_ip
+from app.core.rate_limit import get_login_rate_limiter
+from app.services.login_failure_service import login_failure_buffer
+from app.services.token_revocation_service import TokenRevocationService
 from app.models.system_setting import SystemSetting
 
 # Definição do roteador
@@ -108,7 +113,20 @@ def get_me(current_user: User = Depends(get_current_user)):
         },
         response_model=TokenResponse)
 def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-   
+    ip_address = get_real_ip(request)
+
+    # Rate limit por IP e por usuário: barra antes de qualquer consulta ou hash
+    retry_after = get_login_rate_limiter().check(ip_address, form_data.username)
+    if retry_after:
+        login_failure_buffer.record(form_data.username, ip_address, rate_limited=True)
+        # Sob ataque quase tudo cai aqui: o lote também precisa ser gravado neste caminho
+        login_failure_buffer.flush_if_due(db)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Muitas tentativas de login. Tente novamente mais tarde.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
     user = (
         db.query(User)
         .filter(User.email == form_data.username, User.is_active == True)
@@ -118,7 +136,7 @@ def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db
     settings = db.query(SystemSetting).first()
 
     if settings and settings.maintenance_mode:
-        if user and user.role != UserRole.SYSTEM_ADMIN.value:
+        if user and not has_permission(user.role, Permission.SYSTEM_MANAGE):
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="O sistema está em modo de manutenção. Por favor, tente novamente mais tarde.",
@@ -126,7 +144,15 @@ def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db
             )
 
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    password_ok, upgraded_hash = (
+        verify_and_update_password(form_data.password, user.password_hash) if user else (False, None)
+    )
+
+    if not password_ok:
+        # Falhas são agregadas em memória e gravadas em lote
+        login_failure_buffer.record(form_data.username, ip_address)
+        login_failure_buffer.flush_if_due(db)
+
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
@@ -153,11 +179,15 @@ def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db
             movement_type=MovementType.LOGIN,
             description=f"Login bem-sucedido para o usuário {user.email}",
             created_by=user.id,
-            ip_address=get_real_ip(request)
+            ip_address=ip_address
         )
     except Exception as e:
         print(f"Failed to log login movement for user {user.id}: {e}")
 
+    # Hash em esquema/custo antigo: regrava com a configuração atual (mesmo commit do login)
+    if upgraded_hash:
+        user.password_hash = upgraded_hash
+
     user.last_active_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(user)
@@ -217,7 +247,7 @@ def register(
     request: Request,
     data: RegisterRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN]))
+    current_user: User = Depends(require_permission(Permission.USER_REGISTER))
 ):
     settigns = db.query(SystemSetting).first()
 
@@ -257,31 +287,20 @@ def register(
 
         company_id = company.id
 
-    # Autorização por role
-    match current_user.role:
-        case UserRole.SYSTEM_ADMIN:
-            # SYSTEM_ADMIN pode tudo
-            pass
-
-        case UserRole.ADMIN:
-            # ADMIN não pode criar SYSTEM_ADMIN
-            if data.role == UserRole.SYSTEM_ADMIN:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="ADMIN cannot create SYSTEM_ADMIN users"
-                )
-
-            # ADMIN só pode cadastrar usuários da própria empresa
-            if company_id != current_user.company_id:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You can only register users for your own company"
-                )
-
-        case _:
+    # Autorização por permissão (SYSTEM_ADMIN pode tudo)
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
+        # ADMIN não pode criar SYSTEM_ADMIN
+        if data.role == UserRole.SYSTEM_ADMIN:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="ADMIN cannot create SYSTEM_ADMIN users"
+            )
+
+        # ADMIN só pode cadastrar usuários da própria empresa
+        if company_id != current_user.company_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to perform this action"
+                detail="You can only register users for your own company"
             )
 
     # Regra: apenas 1 ADMIN por empresa
@@ -297,12 +316,13 @@ def register(
                 detail="An ADMIN user already exists for this company"
             )
 
-    # Criar usuário
+    # Criar usuário (hash fora do try: pool cheio deve virar 429, não 500)
+    password_hash = hash_password(data.password)
     try:
         user = User(
             name=data.name,
             email=data.email,
-            password_hash=hash_password(data.password),
+            password_hash=password_hash,
             role=data.role,
             company_id=company_id,
             is_active=True
@@ -464,14 +484,18 @@ def reset_password(
 @router.post(
         "/logout",
         summary="Logout do usuário",
-        description="Realiza o logout do usuário. (Funcionalidade a ser implementada conforme necessário)",
+        description="Realiza o logout do usuário e revoga o token utilizado na requisição.",
         status_code=status.HTTP_200_OK
 )
 def logout(
     request: Request,
+    token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    # Revoga o token atual (jti) até a sua expiração
+    TokenRevocationService(db).revoke_token(decode_access_token(token))
+
     # Movimento de logout
     try:
         MovementService(db).create_manual(
@@ -1,13 +1,16 @@
 import uuid
 import secrets
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.schemas.company import CompanyNameUpdate, CompanyWithAdminCreate, CompanyResponse, DashboardStatsResponse
 from app.models.enum import UserRole
 from app.models import Company, User
 from app.database import get_db
-from app.core.dependencies import require_roles
+from app.core.dependencies import require_permission
+from app.core.permissions import Permission, has_permission
+from app.services.token_revocation_service import TokenRevocationService
+from app.services.resource_version_service import COMPANIES, USERS, ResourceVersionService
 from app.core.security import hash_password
 from app.schemas.user import UserResponse
 
@@ -32,7 +35,7 @@ router = APIRouter(prefix="/companies", tags=["Companies"])
 def create_company(
     data: CompanyWithAdminCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_CREATE))
 ):
     # Valida empresa duplicada pelo nome
     existing_company = db.query(Company).filter(
@@ -68,6 +71,9 @@ def create_company(
             detail="Email do administrador já existe"
         )
 
+    # Hash fora do try: pool cheio deve virar 429, não 500
+    admin_password_hash = hash_password(data.admin_password)
+
     try:
         # Cria empresa
         company = Company(
@@ -82,12 +88,13 @@ def create_company(
         admin = User(
             name=data.admin_name,
             email=data.admin_email,
-            password_hash=hash_password(data.admin_password),
+            password_hash=admin_password_hash,
             role=UserRole.ADMIN,
             company_id=company.id
         )
 
         db.add(admin)
+        ResourceVersionService(db).bump(company.id, COMPANIES, USERS)
         db.commit()
         db.refresh(company)
 
@@ -110,7 +117,7 @@ def create_company(
 @router.get("/me", response_model=CompanyResponse)
 def get_my_company(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER, UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_VIEW_OWN))
 ):
     """Recupera os dados da empresa do usuário autenticado.
     
@@ -123,12 +130,6 @@ def get_my_company(
     Returns:
         Company: Instância da empresa.
     """
-    if current_user.role == UserRole.USER:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to perform this action."
-        )
-    
     company = db.query(Company).filter(Company.id == current_user.company_id).first()
 
     if not company:
@@ -142,7 +143,7 @@ def get_my_company(
 @router.get("/me/users", response_model=list[UserResponse])
 def get_my_company_users(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.MANAGER, UserRole.SYSTEM_ADMIN])
+    current_user: User = Depends(require_permission(Permission.COMPANY_VIEW_OWN)
     )
 ):
     """
@@ -158,46 +159,45 @@ def get_my_company_users(
     """
     query = db.query(User)
 
-    match current_user.role:
-        case UserRole.SYSTEM_ADMIN:
-            pass  # system admin vê todos os usuários
-        case UserRole.ADMIN:
-            query = query.filter(User.company_id == current_user.company_id)
-        case UserRole.MANAGER:
-            query = query.filter(
-                User.company_id == current_user.company_id,
-                User.role != UserRole.ADMIN
-            )
-        case _:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to perform this action."
-            )
-        
+    # SYSTEM_ADMIN vê todos os usuários; MANAGER não enxerga os ADMIN da empresa
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
+        query = query.filter(User.company_id == current_user.company_id)
+        if not has_permission(current_user.role, Permission.USER_VIEW_ADMINS):
+            query = query.filter(User.role != UserRole.ADMIN)
+
     return query.all()
 
 @router.get("/list", response_model=list[CompanyResponse])
 def list_companies(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_MANAGE))
 ) -> list[Company]:
     """Lista todas as empresas.
     
     - Requer permissão de SYSTEM_ADMIN.
+    - Responde 304 quando o If-None-Match ainda é o ETag atual.
     
     Args:
+        request (Request): Requisição HTTP (cabeçalhos condicionais).
+        response (Response): Resposta HTTP (recebe ETag/Last-Modified).
         db (Session): Sessão do banco de dados.
         current_user (User): Usuário autenticado.
     Returns:
         list[Company]: Lista de instâncias de empresas.
     """
+    validators = ResourceVersionService(db).validators((COMPANIES,))
+    if validators.matches(request):
+        return validators.not_modified()
+
     companies = db.query(Company).all()
-    return companies
+    return validators.attach(companies, response)
 
 @router.get("/stats", response_model=DashboardStatsResponse)
 def get_dashboard_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_MANAGE))
 ) -> DashboardStatsResponse:
     '''Recupera estatísticas do dashboard.
     
@@ -228,7 +228,7 @@ def get_dashboard_stats(
 def get_company_by_id(
     company_id: uuid.UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_MANAGE))
 ) -> Company:
     '''Recupera uma empresa pelo ID.
     
@@ -286,7 +286,7 @@ def get_company_by_cnpj(
 def update_my_company(
     data: CompanyNameUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.ADMIN, UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_UPDATE_OWN))
 ) -> Company:
     '''Atualiza os dados da empresa do usuário autenticado.
     
@@ -309,16 +309,11 @@ def update_my_company(
             detail="Empresa não encontrada"
         )
     
-    if current_user.role == UserRole.ADMIN and company.id != current_user.company_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to perform this action."
-        )
-    
     try:
         if data.name is not None:
             company.name = data.name
         
+        ResourceVersionService(db).bump(company.id, COMPANIES)
         db.commit()
         db.refresh(company)
         return company
@@ -335,7 +330,7 @@ def update_company(
     company_id: uuid.UUID,
     data: CompanyNameUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_MANAGE))
 ) -> Company:
     '''Atualiza os dados de uma empresa existente.
     
@@ -362,6 +357,7 @@ def update_company(
         if data.name is not None:
             company.name = data.name
 
+        ResourceVersionService(db).bump(company.id, COMPANIES)
         db.commit()
         db.refresh(company)
 
@@ -383,7 +379,7 @@ def update_company(
 def toggle_company_status(
     company_id: uuid.UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_MANAGE))
 ) -> Company:
     '''Ativa ou desativa uma empresa pelo ID.
     
@@ -406,6 +402,7 @@ def toggle_company_status(
         )
     try:
         company.is_active = not company.is_active
+        ResourceVersionService(db).bump(company.id, COMPANIES)
         db.commit()
         db.refresh(company)
         return company
@@ -424,7 +421,7 @@ def toggle_company_status(
 def delete_company(
     company_id: uuid.UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_MANAGE))
 ):
     '''Deleta uma empresa pelo ID.
     
@@ -447,7 +444,10 @@ def delete_company(
     
     try:
         db.delete(company)
+        ResourceVersionService(db).bump(company_id, COMPANIES)
         db.commit()
+        # Tokens dos usuários da empresa deixam de valer nas rotas sem consulta ao banco
+        TokenRevocationService(db).revoke_company(company_id)
     except Exception:
         db.rollback()
         raise HTTPException(
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.core.dependencies import get_current_user
+from app.core.dependencies import TokenPrincipal, get_token_principal
+from app.services.live_kpi_service import get_live_kpi_hub
 from app.models.user import User, UserRole
 from app.models.company import Company
 from app.models.product import Product
@@ -12,7 +14,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 @router.get("/admin-stats", response_model=AdminDashboardStats)
 def get_admin_dashboard_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
     # 1. Dados Reais de Usuários (Da mesma empresa)
     total_users = db.query(User).filter(User.company_id == current_user.company_id).count()
@@ -36,4 +38,53 @@ def get_admin_dashboard_stats(
         "active_users": active_users,
         "stock_alerts": low_stock_count,
         "low_stock_items": low_stock_count
-    }
\ No newline at end of file
+    }
+
+# ------------------------------------------
+# WebSocket KPIs ao vivo
+# ------------------------------------------
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    '''Consome mensagens do cliente até ele desconectar (o canal é só de saída).'''
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+@router.websocket("/live")
+async def live_dashboard(websocket: WebSocket, token: str = Query(...)):
+    '''KPIs da empresa do usuário, atualizados ao vivo.
+
+    O token vai na query string (navegadores não enviam Authorization no
+    handshake). Mensagens enviadas:
+    - `{"type": "snapshot", "version": n, "kpis": {...}}` ao conectar;
+    - `{"type": "delta", "version": n, "changes": {...}}` com os valores que mudaram.
+
+    Todos os painéis da mesma empresa compartilham um único estado no servidor.
+    '''
+    try:
+        principal = get_token_principal(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    if principal.company_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    hub = get_live_kpi_hub()
+    channel, viewer = await hub.join(principal.company_id)
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        await websocket.send_json({"type": "snapshot", "version": channel.version, "kpis": channel.values})
+        while True:
+            update = asyncio.ensure_future(viewer.next(None))
+            await asyncio.wait({update, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                update.cancel()
+                break
+            changes, version = update.result()
+            if changes:
+                await websocket.send_json({"type": "delta", "version": version, "changes": changes})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        await hub.leave(channel, viewer)
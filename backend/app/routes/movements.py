@@ -5,20 +5,23 @@ from uuid import UUID
 
 # Importações internas
 from app.schemas.movement import MovementResponseSchema, MovementCreateSchema
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.base import Base
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_token_principal
 from app.models.movement import Movement
 from app.services.movement_service import MovementService
+from app.services.resource_version_service import MOVEMENTS
+from app.core.response_cache import CachedRoute, cached_response
 from app.models.enum import MovementEntityType
 
-router = APIRouter(prefix="/operations", tags=["Movements"])
+router = APIRouter(prefix="/operations", tags=["Movements"], route_class=CachedRoute)
 
 @router.get("/{entity_id}/movements", response_model=list[MovementResponseSchema], status_code=status.HTTP_200_OK)
+@cached_response(MOVEMENTS)
 def list_movements(
     entity_id: UUID,
-    db: Session = Depends(get_db),
-    user = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    user = Depends(get_token_principal)
 ):
     '''Lista todos os movimentos associados a uma operação específica.
     
@@ -1,27 +1,43 @@
 # Importações de terceiros
 import datetime
+import json
 from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import desc, func
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from uuid import UUID
 
 # Importação local
-from app.database import get_db, Base
-from app.core.dependencies import get_current_user
+from app.database import get_db, get_read_db, Base
+from app.core.dependencies import get_current_user, get_stream_principal, get_token_principal
+from app.core.permissions import Permission, has_permission
 from app.models.operation import Operation
+from app.models.partner import Partner
 from app.schemas.operation import (
     OperationCreateSchema,
     OperationUpdateStatusSchema,
-    OperationResponseSchema
+    OperationResponseSchema,
+    OperationListItemSchema,
+    OperationBulkCreateSchema,
+    OperationBulkResponseSchema,
+    OperationBulkStatusSchema,
+    OperationBulkStatusResponseSchema
 )
 from app.services.operation_service import OperationService
 from app.domain.operation_validator import InvalidOperationTransition
+from app.services.inventory_service import InsufficientStock
+from app.services.late_operation_service import LateOperationService
+from app.services.resource_version_service import OPERATIONS, PARTNERS, ResourceVersionService
 from app.models.enum import OperationStatus
+from app.core.config import FAST_JSON_RESPONSES, EVENTS_HEARTBEAT_SECONDS
+from app.core.events import get_event_broker
+from app.core.serialization import rows_to_dicts, serialize_list
+from app.core.response_cache import CachedRoute, cached_response
 
 
-router = APIRouter(prefix="/operations", tags=["Operations"])
+router = APIRouter(prefix="/operations", tags=["Operations"], route_class=CachedRoute)
 
 # ----------------------------------------------
 # POST /operations
@@ -46,13 +62,48 @@ def create_operation(
     - A operação criada.
     '''
     service = OperationService(db)
-    return service.create(data, user)
+    try:
+        return service.create(data, user)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# ----------------------------------------------
+# POST /operations/bulk
+# ----------------------------------------------
+@router.post("/bulk", response_model=OperationBulkResponseSchema)
+def create_operations_bulk(
+    data: OperationBulkCreateSchema,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    '''Cria várias operações de uma vez (integrações EDI).
+    
+    - Valida o lote inteiro e cria apenas as linhas válidas, em uma única transação.
+    - Retorna o resultado de cada linha, na ordem de envio.
+    
+    Parâmetros:
+    - `data`: Lista de operações a criar.
+    - `db`: Sessão do banco de dados.
+    - `user`: Usuário autenticado.
+    
+    Retorna:
+    - Totais de criadas/falhas e o resultado por linha.
+    '''
+    if not user.company_id:
+        raise HTTPException(status_code=400, detail="User is not linked to a company")
+
+    results = OperationService(db).create_bulk(data.operations, user)
+    created = sum(result["success"] for result in results)
+    return {"created": created, "failed": len(results) - created, "results": results}
 
 # ----------------------------------------------
 # GET /operations
 # ----------------------------------------------
 @router.get("/")
+@cached_response(OPERATIONS, PARTNERS)
 def list_operations(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     status: Optional[str] = None,
@@ -60,10 +111,19 @@ def list_operations(
     partner_id: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_token_principal)
 ):
+    company_id = None if has_permission(current_user.role, Permission.ALL_COMPANIES) else current_user.company_id
+
+    # GET condicional: operações e parceiros (nome embutido) da empresa sem alteração
+    validators = ResourceVersionService(db).validators((OPERATIONS, PARTNERS), company_id)
+    if validators.matches(request):
+        return validators.not_modified()
+
     query = db.query(Operation).options(joinedload(Operation.partner)) # Carrega o nome do parceiro
+    if company_id is not None:
+        query = query.filter(Operation.company_id == company_id)
 
     # Aplicando Filtros Dinâmicos
     if status:
@@ -77,17 +137,29 @@ def list_operations(
     if end_date:
         query = query.filter(Operation.created_at <= end_date)
 
+    if FAST_JSON_RESPONSES:
+        # Caminho rápido: projeção com o parceiro via LEFT JOIN, sem montar entidades ORM
+        rows = query.with_entities(
+            *Operation.__table__.columns,
+            *[column.label(f"partner__{column.key}") for column in Partner.__table__.columns]
+        ).outerjoin(Partner, Partner.id == Operation.partner_id).order_by(
+            desc(Operation.expected_delivery_date)
+        ).offset(skip).limit(limit).all()
+        return validators.attach(
+            serialize_list(OperationListItemSchema, rows_to_dicts(rows, nested=("partner",))), response
+        )
+
     # Ordenação: Mais recentes primeiro e Atrasados com prioridade
     operations = query.order_by(
         desc(Operation.expected_delivery_date)
     ).offset(skip).limit(limit).all()
 
-    return operations
+    return validators.attach(operations, response)
 
 @router.get("/kpis")
 def get_operation_kpis(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_token_principal)
 ):
     '''Obtém KPIs relacionados às operações da empresa do usuário autenticado.
     
@@ -102,7 +174,7 @@ def get_operation_kpis(
     final_statuses = [OperationStatus.DELIVERED, OperationStatus.CANCELED, OperationStatus.COMPLETED]
     
     # Total Pendente (Tudo que não foi finalizado ou cancelado)
-    if current_user.role != "SYSTEM_ADMIN":
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         pending = db.query(Operation).filter(
             Operation.company_id == current_user.company_id,
             Operation.status.notin_(final_statuses)
@@ -112,21 +184,14 @@ def get_operation_kpis(
             Operation.status.notin_(final_statuses)
         ).count()
 
-    # Atrasados (Não finalizado E Data Prevista < Hoje)
-    if current_user.role != "SYSTEM_ADMIN":
-        late = db.query(Operation).filter(
-            Operation.company_id == current_user.company_id,
-            Operation.status.notin_(final_statuses),
-            Operation.expected_delivery_date < datetime.now()
-        ).count()
+    # Atrasados (contagem materializada pelo sweeper de atrasos)
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
+        late = LateOperationService(db).count(current_user.company_id)
     else:
-        late = db.query(Operation).filter(
-            Operation.status.notin_(final_statuses),
-            Operation.expected_delivery_date < datetime.now()
-        ).count()
+        late = LateOperationService(db).count()
 
     # Concluídos Hoje
-    if current_user.role != "SYSTEM_ADMIN":
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         completed_today = db.query(Operation).filter(
             Operation.company_id == current_user.company_id,
             Operation.status == OperationStatus.DELIVERED,
@@ -144,11 +209,67 @@ def get_operation_kpis(
         "completed_today": completed_today
     }
 
+# ----------------------------------------------
+# GET /operations/events (SSE)
+# ----------------------------------------------
+async def operation_event_stream(request: Request, company_id, heartbeat: float = EVENTS_HEARTBEAT_SECONDS):
+    '''Gera o corpo text/event-stream até o cliente desconectar.
+
+    A assinatura é aberta no início do corpo (e fechada no finally): se a
+    resposta nunca chegar a ser enviada, nada fica registrado no broker.
+    '''
+    broker = get_event_broker()
+    subscription = broker.subscribe(company_id)
+    try:
+        yield "retry: 5000\n\n"
+        while not await request.is_disconnected():
+            event = await subscription.get(heartbeat)
+            if subscription.lagged:
+                # Eventos descartados: o cliente recarrega tudo em vez de aplicar deltas
+                subscription.lagged = False
+                yield "event: resync\ndata: {}\n\n"
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+@router.get("/events")
+async def stream_operation_events(
+    request: Request,
+    current_user = Depends(get_stream_principal)
+):
+    '''Stream (Server-Sent Events) de criação e mudança de status das operações.
+
+    - Autenticação pelo cabeçalho Authorization ou por `?token=` (EventSource
+      não envia cabeçalhos).
+    - Usuários recebem apenas os eventos da própria empresa; SYSTEM_ADMIN recebe todos.
+    - `event: resync` indica que eventos foram descartados (cliente lento) e
+      a tela deve recarregar os dados.
+    - Um comentário `: ping` é enviado a cada EVENTS_HEARTBEAT_SECONDS sem eventos.
+
+    Parâmetros:
+    - `current_user`: Usuário autenticado.
+
+    Retorna:
+    - Resposta text/event-stream.
+    '''
+    company_id = None
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
+        company_id = current_user.company_id
+
+    return StreamingResponse(
+        operation_event_stream(request, company_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/{operation_id}", response_model=OperationResponseSchema)
 def get_operation(
     operation_id: UUID,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_token_principal)
 ):
     '''Obtém os detalhes de uma operação específica.
     
@@ -173,6 +294,36 @@ def get_operation(
 
     return operation
 
+# ----------------------------------------------
+# PATCH /operations/status:bulk
+# ----------------------------------------------
+@router.patch("/status:bulk", response_model=OperationBulkStatusResponseSchema)
+def update_operations_status_bulk(
+    data: OperationBulkStatusSchema,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    '''Atualiza o status de várias operações de uma vez (ex: uma carga inteira).
+
+    - Cada operação é validada individualmente; as válidas são aplicadas juntas.
+    - Operações travadas por outra requisição são reportadas como falha.
+
+    Parâmetros:
+    - `data`: Lista de pares (id, novo status).
+    - `db`: Sessão do banco de dados.
+    - `current_user`: Usuário autenticado.
+
+    Retorna:
+    - Totais de atualizadas/falhas e o resultado por operação.
+    '''
+    company_id = None
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
+        company_id = current_user.company_id
+
+    results = OperationService(db).update_status_bulk(data.updates, current_user, company_id=company_id)
+    updated = sum(result["success"] for result in results)
+    return {"updated": updated, "failed": len(results) - updated, "results": results}
+
 # ----------------------------------------------
 # PATCH /operations
 # ----------------------------------------------
@@ -196,7 +347,7 @@ def update_operation_status(
     '''
     operation = db.query(Operation).filter(Operation.id == operation_id)
 
-    if current_user.role != "SYSTEM_ADMIN":
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         operation = operation.filter(Operation.company_id == current_user.company_id)
 
     operation = operation.first()
@@ -208,4 +359,6 @@ def update_operation_status(
     try:
         return service.update_status(operation, data.status, current_user)
     except InvalidOperationTransition as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+    except InsufficientStock as e:
+        raise HTTPException(status_code=409, detail=str(e))
\ No newline at end of file
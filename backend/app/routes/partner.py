@@ -1,44 +1,52 @@
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, desc
 
 from pydantic import BaseModel, EmailStr
 
 # Importações do seu projeto
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.partner import Partner
 from app.models.operation import Operation
 from app.models.enum import MovementType, MovementEntityType # Certifique-se que PARTNER existe aqui
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, get_token_principal
+from app.core.permissions import Permission, has_permission
 from app.services.movement_service import MovementService # Serviço de Logs
+from app.services.resource_version_service import PARTNERS, ResourceVersionService
 from app.schemas.partner import PartnerCreate, PartnerUpdate, PartnerResponse
+from app.core.config import FAST_JSON_RESPONSES
+from app.core.serialization import rows_to_dicts, serialize_list
+from app.core.response_cache import CachedRoute, cached_response
 
-router = APIRouter(prefix="/partners", tags=["Parceiros"])
+router = APIRouter(prefix="/partners", tags=["Parceiros"], route_class=CachedRoute)
 
 # 1. LISTAR COM FILTROS E PAGINAÇÃO
 @router.get("/", response_model=List[PartnerResponse])
+@cached_response(PARTNERS)
 def list_partners(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
     search: Optional[str] = None,
     type: Optional[str] = None, 
     active: Optional[bool] = None,
     company_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_token_principal)
 ):
     # --- DEBUG START ---
     print("\n" + "="*30)
-    print(f"🕵️ DEBUG: Solicitante: {current_user.email}")
+    print(f"🕵️ DEBUG: Solicitante: {current_user.id}")
     print(f"🕵️ DEBUG: Role: {current_user.role}")
     print(f"🕵️ DEBUG: Meu Company ID: {current_user.company_id}")
     
     # Lógica de Filtro
-    user_role = str(current_user.role.value if hasattr(current_user.role, 'value') else current_user.role).upper()
+    all_companies = has_permission(current_user.role, Permission.ALL_COMPANIES)
 
-    if user_role == "SYSTEM_ADMIN":
+    if all_companies:
         print("✅ Modo: SYSTEM_ADMIN (Vê tudo)")
         query = db.query(Partner)
         if company_id:
@@ -47,6 +55,12 @@ def list_partners(
         print(f"🔒 Modo: EMPRESA (Filtra por {current_user.company_id})")
         query = db.query(Partner).filter(Partner.company_id == current_user.company_id)
 
+    # GET condicional: nada mudou nos parceiros do escopo desde o ETag do cliente
+    scope = company_id if all_companies else current_user.company_id
+    validators = ResourceVersionService(db).validators((PARTNERS,), scope)
+    if validators.matches(request):
+        return validators.not_modified()
+
     # Conta quantos existem ANTES dos filtros de busca/texto
     total_in_company = query.count()
     print(f"📊 Total bruto na minha empresa: {total_in_company}")
@@ -72,12 +86,19 @@ def list_partners(
         print(f"⚙️ Filtrando por Active: {active}")
         query = query.filter(Partner.active == active)
 
-    results = query.order_by(desc(Partner.created_at)).offset(skip).limit(limit).all()
+    query = query.order_by(desc(Partner.created_at)).offset(skip).limit(limit)
+
+    if FAST_JSON_RESPONSES:
+        # Caminho rápido: apenas as colunas, serializadas direto para JSON
+        rows = rows_to_dicts(query.with_entities(*Partner.__table__.columns).all())
+        return validators.attach(serialize_list(PartnerResponse, rows), response)
+
+    results = query.all()
     
     print(f"🚀 Resultado final enviado: {len(results)} parceiros")
     print("="*30 + "\n")
     
-    return results
+    return validators.attach(results, response)
 
 # 2. CRIAR PARCEIRO
 @router.post("/", response_model=PartnerResponse, status_code=status.HTTP_201_CREATED)
@@ -87,7 +108,10 @@ def create_partner(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    if current_user.role != "SYSTEM_ADMIN" and partner_in.company_id and partner_in.company_id != current_user.company_id:
+    if (
+        not has_permission(current_user.role, Permission.ALL_COMPANIES)
+        and partner_in.company_id and partner_in.company_id != current_user.company_id
+    ):
         raise HTTPException(status_code=403, detail="Você não tem permissão para criar parceiros para esta empresa.")
     
     if not partner_in.company_id:
@@ -116,6 +140,7 @@ def create_partner(
     )
 
     db.add(new_partner)
+    ResourceVersionService(db).bump(new_partner.company_id, PARTNERS)
     db.commit()
     db.refresh(new_partner)
 
@@ -137,15 +162,14 @@ def create_partner(
 def get_partner(
     partner_id: UUID, 
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_token_principal)
 ):
-    if current_user.role == "SYSTEM_ADMIN":
-        partner = db.query(Partner).filter(Partner.id == partner_id).first()
+    query = db.query(Partner).filter(Partner.id == partner_id)
 
-    partner = db.query(Partner).filter(
-        Partner.id == partner_id, 
-        Partner.company_id == current_user.company_id
-    ).first()
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
+        query = query.filter(Partner.company_id == current_user.company_id)
+
+    partner = query.first()
     
     if not partner:
         raise HTTPException(status_code=404, detail="Parceiro não encontrado.")
@@ -160,11 +184,9 @@ def update_partner(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    user_role = str(current_user.role.value if hasattr(current_user.role, 'value') else current_user.role).upper()
-
     query = db.query(Partner).filter(Partner.id == partner_id)
 
-    if user_role != "SYSTEM_ADMIN":
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         query = query.filter(Partner.company_id == current_user.company_id)
 
     partner = query.first()
@@ -188,6 +210,7 @@ def update_partner(
     for key, value in update_data.items():
         setattr(partner, key, value)
 
+    ResourceVersionService(db).bump(partner.company_id, PARTNERS)
     db.commit()
     db.refresh(partner)
 
@@ -221,6 +244,7 @@ def toggle_partner_active(
         raise HTTPException(status_code=404, detail="Parceiro não encontrado")
 
     partner.active = not partner.active
+    ResourceVersionService(db).bump(partner.company_id, PARTNERS)
     db.commit()
 
     # --- REGISTRO DE MOVIMENTO ---
@@ -278,6 +302,7 @@ def delete_partner(
         print(f"Aviso: Não foi possível registrar log de exclusão: {e}")
 
     db.delete(partner)
+    ResourceVersionService(db).bump(current_user.company_id, PARTNERS)
     db.commit()
     return {"message": "Parceiro excluído com sucesso."}
 
@@ -285,7 +310,7 @@ def delete_partner(
 @router.get("/stats/count")
 def get_partners_count(
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_token_principal)
 ):
     total = db.query(Partner).filter(Partner.company_id == current_user.company_id).count()
     customers = db.query(Partner).filter(Partner.company_id == current_user.company_id, Partner.is_customer == True).count()
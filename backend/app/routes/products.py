@@ -1,45 +1,69 @@
 # Importações externas
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, File, HTTPException, status, Request, Response, UploadFile
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List
 
 # Importações internas
-from app.models.enum import UserRole
-from app.database import get_db
-from app.core.dependencies import check_admin_or_manager, get_current_user, require_roles
+from app.database import get_db, get_read_db
+from app.core.dependencies import TokenPrincipal, get_current_user, get_token_principal, require_permission
+from app.core.permissions import Permission, has_permission
 from app.models.user import User
-from app.schemas.product import ProductCreate, ProductUpdate, ProductOut
+from app.schemas.product import ProductCreate, ProductImportResponse, ProductUpdate, ProductOut
 from app.services.product_service import ProductService
+from app.services.product_import_service import ProductImportService, iter_rows
+from app.services.resource_version_service import COMPANIES, PRODUCTS, USERS, ResourceVersionService
 from app.core.utils import get_real_ip
+from app.core.config import FAST_JSON_RESPONSES
+from app.core.serialization import serialize_list
+from app.core.response_cache import CachedRoute, cached_response
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(prefix="/products", tags=["Products"], route_class=CachedRoute)
 
 # --------------------------------------------------
 # GET products
 # --------------------------------------------------
 @router.get("/", response_model=List[ProductOut])
+@cached_response(PRODUCTS, USERS, COMPANIES)
 def list_products(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
     '''Lista todos os produtos associados à empresa do usuário autenticado.
 
+    - Suporta GET condicional: responde 304 quando o If-None-Match ainda é o ETag atual.
+
     Parâmetros:
+    - `request`: Requisição HTTP (cabeçalhos condicionais).
+    - `response`: Resposta HTTP (recebe ETag/Last-Modified).
     - `db`: Sessão do banco de dados.
     - `current_user`: Usuário autenticado.
     Retorna:
     - Lista de produtos da empresa do usuário autenticado.
     '''
-    if current_user.role in [UserRole.SYSTEM_ADMIN]:
-        return ProductService(db).list_products()
-    return ProductService(db).list_products(company_id=current_user.company_id)
+    company_id = None if has_permission(current_user.role, Permission.ALL_COMPANIES) else current_user.company_id
+
+    # updated_by_name e company_name também entram na resposta
+    validators = ResourceVersionService(db).validators((PRODUCTS, USERS, COMPANIES), company_id)
+    if validators.matches(request):
+        return validators.not_modified()
+
+    if FAST_JSON_RESPONSES:
+        return validators.attach(
+            serialize_list(ProductOut, ProductService(db).list_product_rows(company_id=company_id)), response
+        )
+
+    if company_id is None:
+        return validators.attach(ProductService(db).list_products(), response)
+    return validators.attach(ProductService(db).list_products(company_id=company_id), response)
 
 @router.get("/{product_id}", response_model=ProductOut)
 def get_product(
     product_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenPrincipal = Depends(get_token_principal)
 ):
     '''Obtém os detalhes de um produto específico.
 
@@ -91,6 +115,39 @@ def create_product(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/import", response_model=ProductImportResponse)
+def import_products(
+    request: Request,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    '''Importa produtos de um arquivo CSV ou XLSX (upsert por SKU na empresa do usuário).
+
+    - Colunas obrigatórias: `sku`, `name`, `price` (aceita também `codigo`, `nome`, `preco`);
+      opcionais: `description`, `quantity`.
+    - Produtos existentes têm atualizadas só as células preenchidas (vazias mantêm o valor gravado).
+    - O arquivo é lido em streaming e gravado em lotes (PRODUCT_IMPORT_BATCH_SIZE linhas).
+
+    Parâmetros:
+    - `file`: Arquivo .csv (separador "," ou ";") ou .xlsx.
+    - `db`: Sessão do banco de dados.
+    - `current_user`: Usuário autenticado.
+    Retorna:
+    - Totais de criados, atualizados e com erro, e os erros por linha.
+    '''
+    if current_user.company_id is None:
+        raise HTTPException(status_code=400, detail="User is not linked to a company")
+    try:
+        return ProductImportService(db).import_rows(
+            iter_rows(file.file, file.filename),
+            company_id=current_user.company_id,
+            user_id=current_user.id,
+            ip_address=get_real_ip(request)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # --------------------------------------------------
 # PUT products
 # --------------------------------------------------
@@ -112,7 +169,7 @@ def update_product(
     Retorna:
     - O produto atualizado.'''
     target_company_id = current_user.company_id
-    if current_user.role == UserRole.SYSTEM_ADMIN:
+    if has_permission(current_user.role, Permission.ALL_COMPANIES):
         target_company_id = None  # System Admin pode atualizar qualquer produto
     try:
         updated_product = ProductService(db).update_product(
@@ -138,7 +195,7 @@ def toggle_product(
     product_id: UUID,
     request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]) or check_admin_or_manager)
+    current_user: User = Depends(require_permission(Permission.PRODUCT_TOGGLE))
 ):
     """
     Ativa ou desativa um produto dependendo do seu estado atual.
@@ -153,7 +210,7 @@ def toggle_product(
     - O produto atualizado com o novo estado de ativação.
     """
     target_company_id = current_user.company_id
-    if current_user.role == UserRole.SYSTEM_ADMIN:
+    if has_permission(current_user.role, Permission.ALL_COMPANIES):
         target_company_id = None  # System Admin pode ativar/desativar qualquer produto
     try:
         # só chega aqui se tiver permissão
@@ -198,7 +255,7 @@ def delete_product(
     - Nenhum conteúdo (204 No Content) se a remoção for bem-sucedida.
     '''
     target_company_id = current_user.company_id
-    if current_user.role == UserRole.SYSTEM_ADMIN:
+    if has_permission(current_user.role, Permission.ALL_COMPANIES):
         target_company_id = None  # System Admin pode deletar qualquer produto
     try:
         ProductService(db).delete_product(
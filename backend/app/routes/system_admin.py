@@ -1,24 +1,29 @@
 # Importações externas
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, func, text
 
 
 # Importações internas
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas.auth import SystemAdminCreate
 from app.models.system_setting import SystemSetting
 from app.schemas.system_setting import SystemSettingOut, SystemSettingUpdate
 from app.services.system_admin_service import create_system_admin
-from app.repositories.user_repository import get_user_by_email
-from app.core.dependencies import get_current_user, require_roles
-from app.models.enum import UserRole, MovementType
+from app.services.late_operation_service import LateOperationService
+from app.services.company_metrics_service import CompanyMetricsService
+from app.repositories.user_repository import count_active_users_since, get_user_by_email
+from app.core.dependencies import get_current_user, require_permission
+from app.core.maintenance import maintenance_flag
+from app.core.permissions import Permission
+from app.core.security import get_password_pool
+from app.core.response_cache import response_cache_stats
+from app.models.enum import MovementType
 from app.models.movement import Movement
 from app.models.operation import Operation
 from app.models.user import User
-from app.routes.users import count_active_users_last_five_minutes
 
 # Prefixo e Tags
 router = APIRouter(prefix="/system-admins", tags=["System Admins"])
@@ -28,8 +33,8 @@ router = APIRouter(prefix="/system-admins", tags=["System Admins"])
 # ------------------------------------------
 @router.get("/audit-logs")
 def get_audit_logs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_permission(Permission.SYSTEM_MANAGE))
 ):
     """
     Busca os últimos 50 movimentos do sistema para a tabela de Auditoria.
@@ -74,13 +79,16 @@ def get_audit_logs(
 # ------------------------------------------
 @router.get("/stats")
 def get_system_stats(
+    days: int = Query(7, ge=1, le=90),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.SYSTEM_MANAGE))
 ):
     """
     Retorna métricas gerais do sistema baseadas nas Operações e Conexões.
 
     Apenas SYSTEM_ADMIN pode acessar.
+    Args:
+        days (int): Dias da série diária (lida do rollup daily_company_metrics).
     Returns:
         Dict[str, Any]: Dicionário com status do sistema e métricas.
     """
@@ -88,28 +96,12 @@ def get_system_stats(
     # 1. Total de Operações
     total_ops = db.query(Operation).count()
 
-    # 2. Operações Atrasadas
-    # Verifica se a tabela já tem a coluna nova, senão retorna 0
-    delayed_ops = 0
+    # 2. Operações Atrasadas (contagem materializada pelo sweeper de atrasos)
+    delayed_ops = LateOperationService(db).count()
 
     cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=5)
     
-    active_connections = (
-        db.query(User)
-        .filter(User.is_active == True)
-        .filter(User.last_active_at.is_not(None))
-        .filter(User.last_active_at >= cutoff_time)
-        .count()
-    )
-    
-    try:
-        # Busca operações com expected_delivery_date no passado e status diferente de DELIVERED
-        delayed_ops = db.query(Operation).filter(
-            Operation.expected_delivery_date < func.now(),
-            Operation.status != "DELIVERED"
-        ).count()
-    except Exception:
-        db.rollback()  # Em caso de erro (ex: coluna não existe), garante que a sessão está limpa
+    active_connections = count_active_users_since(db, cutoff_time)
 
     # 3. Status do Banco de Dados (Simples verificação se query roda)
     db_status = "online"
@@ -120,6 +112,10 @@ def get_system_stats(
         db_status = "offline"
         db.rollback()
 
+    # 4. Série diária (criadas, concluídas, canceladas, logins, novos produtos) do rollup
+    today = datetime.now(timezone.utc).date()
+    daily = CompanyMetricsService(db).history(today - timedelta(days=days - 1), today)
+
     return {
         "api_status": "online",
         "db_status": db_status,
@@ -129,7 +125,10 @@ def get_system_stats(
             "total_operations": total_ops,
             "delayed_operations": delayed_ops,
             "active_connections": active_connections
-        }
+        },
+        "daily": daily,
+        "password_hashing": get_password_pool().snapshot(),
+        "response_cache": response_cache_stats.snapshot()
     }
 
 # ------------------------------------------
@@ -142,7 +141,7 @@ def get_system_stats(
 def create_system_admin_endpoint(
     payload: SystemAdminCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.SYSTEM_MANAGE))
 ):
     '''Cria um novo administrador do sistema.
 
@@ -182,7 +181,7 @@ def create_system_admin_endpoint(
 @router.get("/settings", response_model=SystemSettingOut)
 def get_system_settings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.SYSTEM_MANAGE))
 ):
     """Retorna as configurações atuais. Cria o registro padrão se não existir."""
     settings = db.query(SystemSetting).first()
@@ -204,7 +203,7 @@ def get_system_settings(
 def update_system_settings(
     payload: SystemSettingUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN]))
+    current_user: User = Depends(require_permission(Permission.SYSTEM_MANAGE))
 ):
     """Atualiza as configurações globais."""
     settings = db.query(SystemSetting).first()
@@ -222,5 +221,7 @@ def update_system_settings(
     
     db.commit()
     db.refresh(settings)
+    # Este worker passa a valer na hora; os demais em até MAINTENANCE_CACHE_SECONDS
+    maintenance_flag.set(settings.maintenance_mode)
     
     return settings
\ No newline at end of file
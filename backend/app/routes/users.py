@@ -11,7 +11,9 @@ from datetime import datetime, timedelta, timezone
 
 # Importações internas
 from app.database import get_db
-from app.core.dependencies import get_current_user, require_roles
+from app.core.dependencies import get_current_user, require_permission
+from app.core.permissions import Permission, has_permission
+from app.services.token_revocation_service import TokenRevocationService
 from app.models.enum import UserRole
 from app.models import User
 from app.core.security import hash_password, verify_password
@@ -19,7 +21,11 @@ from app.schemas.user import UserChangePassword, UserCreate, UserRegisterWithTok
 from app.models.company import Company
 from app.schemas.company import CompanySettingsUpdate
 from app.services.movement_service import MovementService, MovementEntityType, MovementType
+from app.services.resource_version_service import COMPANIES, USERS, ResourceVersionService
 from app.models.system_setting import SystemSetting
+from app.repositories.user_repository import count_active_users_since, list_user_rows
+from app.core.config import FAST_JSON_RESPONSES
+from app.core.serialization import serialize_list
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -30,14 +36,14 @@ router = APIRouter(prefix="/users", tags=["Users"])
 def list_users(
     db: Session = Depends(get_db),
     current_user: User = Depends(
-        require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN, UserRole.MANAGER])
+        require_permission(Permission.USER_LIST)
     )
 ):
     '''Lista usuários com base na role do usuário atual.
     
     Args:
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         list[UserResponse]: Lista de usuários conforme a role do usuário atual.
     '''
@@ -48,22 +54,23 @@ def list_users(
     total_users = db.query(User).count()
     print(f"Total users in database: {total_users}")
     
-    if current_user.role == UserRole.SYSTEM_ADMIN:
+    if has_permission(current_user.role, Permission.ALL_COMPANIES):
         print("SYSTEM_ADMIN access: returning all users")
+        if FAST_JSON_RESPONSES:
+            return serialize_list(UserResponse, list_user_rows(db))
         return db.query(User).all()
     
-    if current_user.role == UserRole.ADMIN:
-        print("ADMIN access: returning users for company ID", current_user.company_id)
-        return db.query(User).filter(
-            User.company_id == current_user.company_id
-        ).all() 
-    
-    if current_user.role == UserRole.MANAGER:
-        print("MANAGER access: returning non-ADMIN users for company ID", current_user.company_id)
-        return db.query(User).filter(
-            User.company_id == current_user.company_id,
-            User.role != UserRole.ADMIN
-        ).all()
+    # MANAGER não enxerga os ADMIN da empresa
+    exclude_role = None if has_permission(current_user.role, Permission.USER_VIEW_ADMINS) else UserRole.ADMIN.value
+    if FAST_JSON_RESPONSES:
+        return serialize_list(
+            UserResponse,
+            list_user_rows(db, company_id=current_user.company_id, exclude_role=exclude_role)
+        )
+    query = db.query(User).filter(User.company_id == current_user.company_id)
+    if exclude_role is not None:
+        query = query.filter(User.role != UserRole.ADMIN)
+    return query.all()
     
 @router.get('/me', response_model=UserResponse)
 def get_my_profile(
@@ -83,7 +90,7 @@ def get_user(
     user_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(
-        require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN, UserRole.MANAGER])
+        require_permission(Permission.USER_LIST)
     )
 ):
     '''Obtém detalhes de um usuário específico com base na role do usuário atual.
@@ -91,7 +98,7 @@ def get_user(
     Args:
         user_id (UUID): ID do usuário a ser obtido.
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         User: Detalhes do usuário solicitado.
     Raises:
@@ -102,12 +109,10 @@ def get_user(
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    if current_user.role == UserRole.ADMIN:
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         if user.company_id != current_user.company_id:
             raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Not authorized to view this user")
-    
-    if current_user.role == UserRole.MANAGER:
-        if user.company_id != current_user.company_id or user.role == UserRole.ADMIN:
+        if user.role == UserRole.ADMIN and not has_permission(current_user.role, Permission.USER_VIEW_ADMINS):
             raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Not authorized to view this user")
         
     return user
@@ -163,6 +168,7 @@ def auto_create_user(
     )
 
     db.add(new_user)
+    ResourceVersionService(db).bump(new_user.company_id, USERS)
     db.commit()
     db.refresh(new_user)
 
@@ -191,7 +197,7 @@ def auto_create_user(
 def create_user(
     data: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN]))
+    current_user: User = Depends(require_permission(Permission.USER_CREATE))
 ):
     '''Cria um novo usuário com base na role do usuário atual.
 
@@ -199,7 +205,7 @@ def create_user(
     Args:
         data (UserCreate): Dados do usuário a ser criado.
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         User: Dados do usuário criado.
     Raises:
@@ -213,12 +219,11 @@ def create_user(
             detail="A criação de novos usuários está fechada no momento. Entre em contato com o administrador do sistema."
         )
 
-    # ADMIN só pode criar usuários da própria empresa
-    if current_user.role == UserRole.ADMIN:
-        if data.company_id != current_user.company_id:
-            raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Você não possui permissão para criar usuários fora da sua empresa.")
-        if data.role != UserRole.USER:
-            raise HTTPException(status.HTTP_403_FORBIDDEN, detail="ADMIN só pode criar usuários USER")
+    # ADMIN só pode criar usuários USER da própria empresa
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES) and data.company_id != current_user.company_id:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Você não possui permissão para criar usuários fora da sua empresa.")
+    if not has_permission(current_user.role, Permission.USER_ASSIGN_ROLES) and data.role != UserRole.USER:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, detail="ADMIN só pode criar usuários USER")
 
     # Checa email duplicado
     existing_user = db.query(User).filter(User.email == data.email).first()
@@ -251,6 +256,7 @@ def create_user(
             detail=f"Error creating movement for user creation: {str(e)}"
         )
     db.add(new_user)
+    ResourceVersionService(db).bump(new_user.company_id, USERS)
     db.commit()
     db.refresh(new_user)
 
@@ -265,7 +271,7 @@ def update_user(
     data: UserUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(
-        require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN, UserRole.MANAGER])
+        require_permission(Permission.USER_UPDATE)
     )
 ):
     '''Atualiza os detalhes de um usuário específico com base na role do usuário atual.
@@ -275,7 +281,7 @@ def update_user(
         user_id (UUID): ID do usuário a ser atualizado.
         data (UserUpdate): Dados para atualizar o usuário.
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         User: Dados do usuário atualizado.
     Raises: 
@@ -286,12 +292,13 @@ def update_user(
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="User not found")
     
-    if current_user.role == UserRole.ADMIN or current_user.role == UserRole.MANAGER:
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         if user.company_id != current_user.company_id:
             raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Not authorized to update this user")
         
     if data.name:
         user.name = data.name
+    role_changed = bool(data.role) and data.role != user.role
     if data.role:
         user.role = data.role
     if data.email:
@@ -316,9 +323,14 @@ def update_user(
         )
     
     # Salvar alterações
+    ResourceVersionService(db).bump(user.company_id, USERS)
     db.commit()
     db.refresh(user)
 
+    # Papel novo: tokens antigos carregam o papel anterior nas claims
+    if role_changed:
+        TokenRevocationService(db).revoke_subject(user.id)
+
     return user
 
 # ------------------------------------------
@@ -329,7 +341,7 @@ def delete_user(
     user_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(
-        require_roles([UserRole.SYSTEM_ADMIN])
+        require_permission(Permission.USER_DELETE)
     )
 ):
     '''Deleta um usuário específico. Apenas SYSTEM_ADMIN pode acessar este endpoint.
@@ -337,7 +349,7 @@ def delete_user(
     Args:
         user_id (UUID): ID do usuário a ser deletado.
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         str: Mensagem de confirmação da deleção.
     Raises:
@@ -358,6 +370,7 @@ def delete_user(
 
     try:
         db.delete(user)
+        ResourceVersionService(db).bump(user.company_id, USERS)
         # Movimentação
         MovementService(db).create_manual(
             entity_id=user.id,
@@ -368,6 +381,7 @@ def delete_user(
             created_by=current_user.id,
         )
         db.commit()
+        TokenRevocationService(db).revoke_subject(user_id)
     except IntegrityError as e:
         db.rollback()
         #Retorna erro 409 de conflito
@@ -383,7 +397,7 @@ def toggle_user_active_status(
     user_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(
-        require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN])
+        require_permission(Permission.USER_TOGGLE)
     )
 ):
     '''Ativa ou desativa um usuário específico com base na role do usuário atual.
@@ -391,7 +405,7 @@ def toggle_user_active_status(
     Args:
         user_id (UUID): ID do usuário a ser ativado/desativado.
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         str: Mensagem de confirmação da alteração do status do usuário.
     Raises:
@@ -410,7 +424,7 @@ def toggle_user_active_status(
     if not user:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
     
-    if current_user.role == UserRole.ADMIN:
+    if not has_permission(current_user.role, Permission.ALL_COMPANIES):
         if user.company_id != current_user.company_id:
             raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Não autorizado a alterar este usuário")
     
@@ -432,9 +446,13 @@ def toggle_user_active_status(
             detail=f"Erro ao criar movimentação para alteração do status do usuário: {str(e)}"
         )
 
+    ResourceVersionService(db).bump(user.company_id, USERS)
     db.commit()
     db.refresh(user)
 
+    if not user.is_active:
+        TokenRevocationService(db).revoke_subject(user.id)
+
     status_str = "ativado" if user.is_active else "desativado"
     return f"Usuário com ID {user_id} foi {status_str}."
 
@@ -493,6 +511,7 @@ def update_my_profile(
             detail=f"Erro ao criar movimentação para atualização do perfil: {str(e)}"
         )
 
+    ResourceVersionService(db).bump(current_user.company_id, USERS)
     db.commit()
     db.refresh(current_user)
 
@@ -579,14 +598,14 @@ def change_my_password(
 def update_my_company_settings(
     data: CompanySettingsUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN, UserRole.MANAGER]))
+    current_user: User = Depends(require_permission(Permission.COMPANY_SETTINGS_UPDATE))
 ):
     """Atualiza configurações da empresa do usuário logado.
     
     Args:
         data (CompanySettingsUpdate): Dados para atualizar as configurações da empresa.
         db (Session, optional): Sessão do banco de dados. Padrão é Depends(get_db).
-        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_roles(...)).
+        current_user (User, optional): Usuário autenticado. Padrão é Depends(require_permission(...)).
     Returns:
         dict: Mensagem de sucesso.
     """
@@ -598,6 +617,7 @@ def update_my_company_settings(
     if data.name: company.name = data.name
     if data.stock_alert_limit is not None: 
         company.stock_alert_limit = data.stock_alert_limit
+    ResourceVersionService(db).bump(company.id, COMPANIES)
 
     # Movimentação
     try:
@@ -624,17 +644,9 @@ def update_my_company_settings(
 def count_active_users_last_five_minutes(
     db: Session = Depends(get_db),
     current_user: User = Depends(
-        require_roles([UserRole.SYSTEM_ADMIN, UserRole.ADMIN])
+        require_permission(Permission.USER_ACTIVITY_VIEW)
     )
 ):
     cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=5)
 
-    active_users_count = (
-        db.query(User)
-        .filter(User.is_active.is_(True))
-        .filter(User.last_active_at != None)
-        .filter(User.last_active_at >= cutoff_time)
-        .count()
-    )
-
-    return active_users_count
\ No newline at end of file
+    return count_active_users_since(db, cutoff_time)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
+
+# Linha do rollup diário de tempo em etapa
+class StageRollupSchema(BaseModel):
+    day: date
+    company_id: UUID
+    partner_id: Optional[UUID] = None
+    stage: str
+    samples: int
+    total_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    max_seconds: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Resultado do recálculo do rollup
+class StageRollupRefreshSchema(BaseModel):
+    start: date
+    end: date
+    rows: int
@@ -7,12 +7,13 @@ from app.models.enum import OperationType
 
 # Importação interna
 from app.models.operation import OperationStatus
+from app.core.config import OPERATIONS_BULK_MAX_SIZE
 
 # Esquema para itens da operação
 class OperationItemSchema(BaseModel):
     product_id: UUID
     quantity: int
-    unit_price: float
+    unit_price: Optional[float] = None  # Padrão: Product.price
 
 # Esquema para criação de operações
 class OperationCreateSchema(BaseModel):
@@ -43,3 +44,82 @@ class OperationResponseSchema(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+# Esquema resumido do parceiro na listagem de operações
+class OperationPartnerSchema(BaseModel):
+    id: UUID
+    company_id: UUID
+    name: str
+    document: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    address: Optional[str] = None
+    is_customer: Optional[bool] = None
+    is_supplier: Optional[bool] = None
+    active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+# Esquema de item da listagem de operações (usado pelo caminho rápido de serialização)
+class OperationListItemSchema(BaseModel):
+    id: UUID
+    operation_number: str
+    reference_code: Optional[str] = None
+    company_id: UUID
+    partner_id: Optional[UUID] = None
+    status: OperationStatus
+    type: OperationType
+    total_value: Optional[float] = None
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    expected_delivery_date: Optional[datetime] = None
+    observation: Optional[str] = None
+    created_at: Optional[datetime] = None
+    created_by: Optional[UUID] = None
+    updated_at: Optional[datetime] = None
+    updated_by: Optional[UUID] = None
+    partner: Optional[OperationPartnerSchema] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Esquema para criação de operações em lote
+class OperationBulkCreateSchema(BaseModel):
+    operations: List[OperationCreateSchema] = Field(min_length=1, max_length=OPERATIONS_BULK_MAX_SIZE)
+
+# Resultado de cada linha do lote (na mesma ordem do envio)
+class OperationBulkResultSchema(BaseModel):
+    index: int
+    success: bool
+    id: Optional[UUID] = None
+    operation_number: Optional[str] = None
+    errors: List[str] = []
+
+# Esquema de resposta da criação em lote
+class OperationBulkResponseSchema(BaseModel):
+    created: int
+    failed: int
+    results: List[OperationBulkResultSchema]
+
+# Item da alteração de status em lote
+class OperationBulkStatusItemSchema(BaseModel):
+    id: UUID
+    status: OperationStatus
+
+# Esquema para alteração de status em lote
+class OperationBulkStatusSchema(BaseModel):
+    updates: List[OperationBulkStatusItemSchema] = Field(min_length=1, max_length=OPERATIONS_BULK_MAX_SIZE)
+
+# Resultado de cada operação na alteração em lote
+class OperationBulkStatusResultSchema(BaseModel):
+    id: UUID
+    success: bool
+    previous_status: Optional[OperationStatus] = None
+    status: Optional[OperationStatus] = None
+    error: Optional[str] = None
+
+# Esquema de resposta da alteração de status em lote
+class OperationBulkStatusResponseSchema(BaseModel):
+    updated: int
+    failed: int
+    results: List[OperationBulkStatusResultSchema]
@@ -34,6 +34,7 @@ class ProductOut(ProductBase):
     sku: str | None
     price: float
     quantity: int
+    reserved_quantity: int = 0
     is_active: bool
     company_id: uuid.UUID
     created_at: datetime
@@ -43,3 +44,25 @@ class ProductOut(ProductBase):
     company_name: str | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+# Esquema de uma linha da importação (limites das colunas da tabela products)
+class ProductImportRow(BaseModel):
+    sku: str = Field(..., min_length=1, max_length=80)
+    name: str = Field(..., min_length=1, max_length=120)
+    description: Optional[str] = Field(default=None, max_length=255)
+    price: float = Field(..., ge=0, lt=100_000_000)
+    quantity: int = Field(default=0, ge=0)
+
+# Erro de uma linha da importação
+class ProductImportError(BaseModel):
+    row: int
+    sku: Optional[str] = None
+    error: str
+
+# Resultado da importação
+class ProductImportResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    errors: list[ProductImportError]
+    errors_truncated: bool = False
@@ -0,0 +1,213 @@
+# Importações externas
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.database import SessionLocal
+from app.models.daily_company_metrics import DailyCompanyMetrics
+from app.models.enum import MovementType, OperationStatus
+from app.models.movement import Movement
+from app.models.operation import Operation
+from app.models.product import Product
+from app.models.rollup_watermark import RollupWatermark
+
+WATERMARK_NAME = "daily_company_metrics"
+
+# Margem ao reler eventos perto da marca d'água (commits fora de ordem, relógios)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+COMPLETED_STATUSES = (OperationStatus.COMPLETED, OperationStatus.DELIVERED)
+
+METRIC_FIELDS = (
+    "operations_created",
+    "operations_completed",
+    "operations_canceled",
+    "total_value",
+    "logins",
+    "new_products",
+)
+
+
+def _day(column):
+    # date() existe no Postgres e no SQLite; type_ converte o texto do SQLite
+    return func.date(column, type_=Date)
+
+
+# Classe de serviço para o rollup diário por empresa
+class CompanyMetricsService:
+    ''' Mantém daily_company_metrics a partir das tabelas de origem.
+
+    Cada dia é sempre recalculado por inteiro (idempotente); a marca d'água só
+    decide quais dias precisam ser recalculados. Na execução incremental isso
+    costuma ser apenas o dia atual (ou os dois dias ao redor da meia-noite).
+    '''
+
+    def __init__(self, db: Session):
+        ''' Inicializa o serviço com a sessão do banco de dados.
+
+        :param db: Sessão do banco de dados.
+        '''
+        self.db = db
+
+    def refresh_incremental(self, now: datetime | None = None) -> int:
+        ''' Recalcula os dias com eventos desde a última marca d'água e a avança.
+
+        :param now: Instante da execução (padrão: agora, UTC).
+        :return: Quantidade de linhas gravadas.
+        '''
+        now = now or datetime.now(timezone.utc)
+        watermark = self.db.get(RollupWatermark, WATERMARK_NAME)
+        since = watermark.watermark if watermark else now
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+
+        start_day = (since - WATERMARK_OVERLAP).date()
+        return self.refresh_days(start_day, now.date(), watermark=now)
+
+    def refresh_days(self, start_day: date, end_day: date, company_id=None, watermark: datetime | None = None) -> int:
+        ''' Recalcula os dias [start_day, end_day] em uma transação.
+
+        :param start_day: Primeiro dia.
+        :param end_day: Último dia (inclusivo).
+        :param company_id: Restringe a uma empresa (None para todas).
+        :param watermark: Se informado, grava a nova marca d'água no mesmo commit.
+        :return: Quantidade de linhas gravadas.
+        '''
+        start = datetime.combine(start_day, time.min, tzinfo=timezone.utc)
+        end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+        metrics = defaultdict(lambda: dict.fromkeys(METRIC_FIELDS, 0))
+
+        # Operações criadas e valor total (por dia de criação)
+        for row in self._grouped(
+            Operation.company_id, Operation.created_at, start, end, company_id,
+            func.count(Operation.id), func.coalesce(func.sum(Operation.total_value), 0),
+        ):
+            metrics[(row.day, row.company_id)].update(operations_created=row[2], total_value=row[3])
+
+        # Conclusões, cancelamentos e logins (por dia da movimentação)
+        for row in self._grouped(
+            Movement.company_id, Movement.created_at, start, end, company_id,
+            func.count(Movement.id).filter(Movement.new_status.in_(COMPLETED_STATUSES)),
+            func.count(Movement.id).filter(Movement.new_status == OperationStatus.CANCELED),
+            func.count(Movement.id).filter(Movement.type == MovementType.LOGIN),
+            where=Movement.type.in_((MovementType.STATUS_CHANGED, MovementType.LOGIN)),
+        ):
+            metrics[(row.day, row.company_id)].update(
+                operations_completed=row[2], operations_canceled=row[3], logins=row[4]
+            )
+
+        # Produtos cadastrados
+        for row in self._grouped(
+            Product.company_id, Product.created_at, start, end, company_id,
+            func.count(Product.id),
+        ):
+            metrics[(row.day, row.company_id)]["new_products"] = row[2]
+
+        refreshed_at = datetime.now(timezone.utc)
+        rows = [
+            {"id": uuid.uuid4(), "day": day, "company_id": row_company_id, "refreshed_at": refreshed_at, **values}
+            for (day, row_company_id), values in metrics.items()
+        ]
+
+        stale = delete(DailyCompanyMetrics).where(
+            DailyCompanyMetrics.day >= start_day,
+            DailyCompanyMetrics.day <= end_day,
+        )
+        if company_id is not None:
+            stale = stale.where(DailyCompanyMetrics.company_id == company_id)
+
+        try:
+            self.db.execute(stale)
+            if rows:
+                self.db.execute(insert(DailyCompanyMetrics), rows)
+            if watermark is not None:
+                self.db.merge(RollupWatermark(name=WATERMARK_NAME, watermark=watermark))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return len(rows)
+
+    def backfill(self, start_day: date, end_day: date, company_id=None, chunk_days: int = 31) -> int:
+        ''' Recalcula um intervalo longo em blocos de `chunk_days` (uma transação por bloco).
+
+        :param start_day: Primeiro dia.
+        :param end_day: Último dia (inclusivo).
+        :param company_id: Restringe a uma empresa (None para todas).
+        :param chunk_days: Dias por transação.
+        :return: Quantidade de linhas gravadas.
+        '''
+        written = 0
+        chunk_start = start_day
+        while chunk_start <= end_day:
+            chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_day)
+            written += self.refresh_days(chunk_start, chunk_end, company_id)
+            chunk_start = chunk_end + timedelta(days=1)
+        return written
+
+    def history(self, start_day: date, end_day: date, company_id=None) -> list[dict]:
+        ''' Série diária (um item por dia; dias sem linha no rollup vêm zerados).
+
+        :param start_day: Primeiro dia.
+        :param end_day: Último dia (inclusivo).
+        :param company_id: Restringe a uma empresa (None soma todas).
+        :return: Itens {"day", *METRIC_FIELDS} ordenados por dia.
+        '''
+        query = (
+            select(
+                DailyCompanyMetrics.day,
+                *(func.sum(getattr(DailyCompanyMetrics, field)).label(field) for field in METRIC_FIELDS),
+            )
+            .where(DailyCompanyMetrics.day >= start_day, DailyCompanyMetrics.day <= end_day)
+            .group_by(DailyCompanyMetrics.day)
+        )
+        if company_id is not None:
+            query = query.where(DailyCompanyMetrics.company_id == company_id)
+        rows = {row.day: row for row in self.db.execute(query)}
+
+        series = []
+        day = start_day
+        while day <= end_day:
+            row = rows.get(day)
+            item = {"day": day.isoformat()}
+            for field in METRIC_FIELDS:
+                value = getattr(row, field) if row is not None else 0
+                item[field] = float(value or 0) if field == "total_value" else int(value or 0)
+            series.append(item)
+            day += timedelta(days=1)
+        return series
+
+    def _grouped(self, company_column, time_column, start, end, company_id, *aggregates, where=None):
+        ''' Agrega uma tabela de origem por (dia, empresa) dentro de [start, end).
+
+        :return: Linhas (day, company_id, *aggregates).
+        '''
+        day = _day(time_column).label("day")
+        query = (
+            select(day, company_column.label("company_id"), *aggregates)
+            .where(
+                time_column >= start,
+                time_column < end,
+                company_column.isnot(None),
+            )
+            .group_by(day, company_column)
+        )
+        if where is not None:
+            query = query.where(where)
+        if company_id is not None:
+            query = query.where(company_column == company_id)
+        return self.db.execute(query).all()
+
+
+# ---------------------------------------------------
+# Job do agendador
+# ---------------------------------------------------
+def refresh_company_metrics() -> int:
+    '''Execução incremental (agendador): recalcula os dias desde a última marca d'água.'''
+    with SessionLocal() as db:
+        return CompanyMetricsService(db).refresh_incremental()
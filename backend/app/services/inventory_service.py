@@ -0,0 +1,203 @@
+# Importações externas
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.domain.operation_state_machine import (
+    INBOUND_OPERATION_TYPES,
+    STOCK_COMMIT_STATUSES,
+    STOCK_RESERVE_STATUS,
+    STOCK_RESERVED_STATUSES,
+)
+from app.models.enum import MovementEntityType, MovementType, OperationStatus
+from app.models.movement import Movement
+from app.models.operation import Operation
+from app.models.operation_item import OperationItem
+from app.models.product import Product
+from app.core.response_cache import mark_stale
+from app.services.resource_version_service import MOVEMENTS, PRODUCTS, ResourceVersionService
+
+
+# Exceção para falta de estoque
+class InsufficientStock(ValueError):
+    '''Uma ou mais reservas/baixas não cabem no estoque atual.'''
+
+    def __init__(self, product_ids: list):
+        self.product_ids = product_ids
+        super().__init__(
+            "Estoque insuficiente para os produtos: " + ", ".join(str(product_id) for product_id in product_ids)
+        )
+
+
+# Serviço de estoque ligado ao ciclo de vida das operações
+class InventoryService:
+    ''' Aplica no estoque os efeitos das transições de status das operações.
+
+    Regras (ver app.domain.operation_state_machine):
+    - Entrar em LOADED reserva as quantidades dos itens (reserved_quantity).
+    - Entrar em COMPLETED/DELIVERED converte a reserva em baixa (OUTPUT) ou, para
+      operações de entrada, soma ao estoque (INPUT).
+    - Cancelar uma operação que segura reserva devolve a reserva.
+
+    Não faz commit: as alterações entram na transação do chamador, que deve
+    fazer rollback se InsufficientStock for lançada.
+    '''
+
+    def __init__(self, db: Session):
+        ''' Inicializa o serviço com a sessão do banco de dados.
+
+        :param db: Sessão do banco de dados.
+        '''
+        self.db = db
+
+    def apply_transitions(self, transitions: list, user_id=None) -> None:
+        ''' Reserva, baixa ou devolve estoque para um conjunto de transições.
+
+        Os itens de todas as operações são lidos com um único IN e agregados
+        por produto. Cada produto recebe um único UPDATE condicional
+        (WHERE com o saldo necessário ... RETURNING), em ordem de id para que
+        transações concorrentes travem as linhas na mesma ordem (sem deadlock).
+
+        :param transitions: Lista de tuplas (operação, status anterior, novo status).
+        :param user_id: ID do usuário responsável (gravado nas movimentações).
+        :raises InsufficientStock: Se algum produto não tiver saldo.
+        '''
+        affected = {
+            operation.id: (operation, old_status, new_status)
+            for operation, old_status, new_status in transitions
+            if self._has_stock_effect(operation, old_status, new_status)
+        }
+        if not affected:
+            return
+
+        items = self.db.execute(
+            select(OperationItem.operation_id, OperationItem.product_id, OperationItem.quantity)
+            .where(OperationItem.operation_id.in_(affected))
+        ).all()
+
+        reserve = defaultdict(int)   # Reserva nova
+        release = defaultdict(int)   # Reserva devolvida (cancelamento)
+        ship = defaultdict(int)      # Baixa de reserva (saída)
+        receive = defaultdict(int)   # Entrada
+        moved = defaultdict(int)     # (operação, produto, tipo) -> quantidade
+
+        for row in items:
+            if not row.product_id or not row.quantity:
+                continue
+            operation, old_status, new_status = affected[row.operation_id]
+            inbound = operation.type in INBOUND_OPERATION_TYPES
+
+            if new_status == STOCK_RESERVE_STATUS:
+                reserve[row.product_id] += row.quantity
+            elif new_status in STOCK_COMMIT_STATUSES and inbound:
+                receive[row.product_id] += row.quantity
+                moved[(row.operation_id, row.product_id, MovementType.INPUT)] += row.quantity
+            elif new_status in STOCK_COMMIT_STATUSES:
+                ship[row.product_id] += row.quantity
+                moved[(row.operation_id, row.product_id, MovementType.OUTPUT)] += row.quantity
+            else:
+                release[row.product_id] += row.quantity
+
+        failed = []
+        for product_id in sorted(set(reserve) | set(release) | set(ship) | set(receive), key=str):
+            if not self._update_product(
+                product_id,
+                reserve=reserve[product_id],
+                release=release[product_id],
+                ship=ship[product_id],
+                receive=receive[product_id],
+            ):
+                failed.append(product_id)
+
+        if failed:
+            raise InsufficientStock(failed)
+
+        self._insert_movements(affected, moved, user_id)
+
+        # Saldos mudaram: invalida o ETag da listagem de produtos (e as movimentações em cache)
+        versions = ResourceVersionService(self.db)
+        for company_id in {operation.company_id for operation, _, _ in affected.values()}:
+            versions.bump(company_id, PRODUCTS)
+            mark_stale(self.db, company_id, MOVEMENTS)
+
+    # --- Definição de métodos ---
+
+    def _has_stock_effect(self, operation: Operation, old_status, new_status) -> bool:
+        ''' Indica se a transição mexe no estoque.
+
+        :param operation: Operação.
+        :param old_status: Status anterior.
+        :param new_status: Novo status.
+        :return: True se há reserva, baixa, entrada ou devolução.
+        '''
+        inbound = operation.type in INBOUND_OPERATION_TYPES
+        if new_status in STOCK_COMMIT_STATUSES:
+            return True
+        if new_status == STOCK_RESERVE_STATUS:
+            return not inbound
+        return (
+            new_status == OperationStatus.CANCELED
+            and old_status in STOCK_RESERVED_STATUSES
+            and not inbound
+        )
+
+    def _update_product(self, product_id, *, reserve: int, release: int, ship: int, receive: int) -> bool:
+        ''' Aplica todos os deltas de um produto com um único UPDATE condicional.
+
+        :param product_id: ID do produto.
+        :param reserve: Quantidade a reservar (exige saldo disponível).
+        :param release: Reserva a devolver.
+        :param ship: Quantidade a baixar (consome a reserva).
+        :param receive: Quantidade a somar ao estoque.
+        :return: False se o produto não tiver saldo (nenhuma linha alterada).
+        '''
+        reserved_delta = reserve - release - ship
+        statement = (
+            update(Product)
+            .where(
+                Product.id == product_id,
+                Product.quantity - Product.reserved_quantity >= reserve,
+                Product.quantity + receive >= ship,
+            )
+            .values(
+                quantity=Product.quantity + receive - ship,
+                # Operações carregadas antes da reserva existir não têm reserva a consumir
+                reserved_quantity=case(
+                    (Product.reserved_quantity + reserved_delta < 0, 0),
+                    else_=Product.reserved_quantity + reserved_delta,
+                ),
+            )
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(statement).first() is not None
+
+    def _insert_movements(self, affected: dict, moved: dict, user_id) -> None:
+        ''' Grava as movimentações de entrada/saída com um único INSERT multi-linha.
+
+        :param affected: Operações afetadas, por ID.
+        :param moved: Quantidades por (operação, produto, tipo de movimentação).
+        :param user_id: ID do usuário responsável.
+        '''
+        if not moved:
+            return
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        for (operation_id, product_id, movement_type), quantity in moved.items():
+            operation = affected[operation_id][0]
+            label = "Entrada" if movement_type == MovementType.INPUT else "Saída"
+            rows.append({
+                "id": uuid.uuid4(),
+                "company_id": operation.company_id,
+                "entity_type": MovementEntityType.PRODUCT,
+                "entity_id": product_id,
+                "type": movement_type,
+                "description": f"{label} de {quantity} un. (operação {operation.operation_number})",
+                "created_by": user_id,
+                "created_at": now,
+            })
+        self.db.execute(insert(Movement), rows)
@@ -0,0 +1,152 @@
+# Importações externas
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.core.events import publish_event
+from app.core.response_cache import mark_stale
+from app.database import SessionLocal
+from app.domain.operation_state_machine import TERMINAL_STATES
+from app.models.enum import MovementEntityType, MovementType
+from app.models.late_operation_count import LateOperationCount
+from app.models.movement import Movement
+from app.models.operation import Operation
+from app.services.resource_version_service import MOVEMENTS
+
+
+# Classe de serviço para operações atrasadas
+class LateOperationService:
+    ''' Marca operações que passaram da data prevista e mantém a contagem por empresa.
+
+    Em vez de cada KPI varrer operations com `expected_delivery_date < now()`,
+    um sweeper periódico:
+    - marca as operações em aberto que acabaram de atrasar (late_flagged_at),
+      usando o índice parcial das candidatas ainda não marcadas;
+    - grava uma movimentação DELAY_REPORTED por operação, em um único INSERT;
+    - recalcula late_operation_counts a partir do índice parcial das atrasadas.
+
+    A contagem pode ficar defasada até o próximo ciclo quando uma operação
+    atrasada é concluída ou cancelada.
+    '''
+
+    def __init__(self, db: Session):
+        ''' Inicializa o serviço com a sessão do banco de dados.
+
+        :param db: Sessão do banco de dados.
+        '''
+        self.db = db
+
+    def sweep(self, now: datetime | None = None) -> int:
+        ''' Executa um ciclo do sweeper em uma transação.
+
+        :param now: Instante de referência (padrão: agora, UTC).
+        :return: Quantidade de operações marcadas como atrasadas neste ciclo.
+        '''
+        now = now or datetime.now(timezone.utc)
+
+        try:
+            # UPDATE ... RETURNING: marca e devolve as recém-atrasadas de uma vez;
+            # updated_at é preservado (é a data de conclusão usada nos KPIs)
+            flagged = self.db.execute(
+                update(Operation)
+                .where(
+                    Operation.status.notin_(TERMINAL_STATES),
+                    Operation.late_flagged_at.is_(None),
+                    Operation.expected_delivery_date < now,
+                )
+                .values(late_flagged_at=now, updated_at=Operation.updated_at)
+                .returning(
+                    Operation.id,
+                    Operation.company_id,
+                    Operation.operation_number,
+                    Operation.expected_delivery_date,
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+
+            if flagged:
+                self.db.execute(insert(Movement), [
+                    {
+                        "id": uuid.uuid4(),
+                        "company_id": row.company_id,
+                        "entity_type": MovementEntityType.OPERATION,
+                        "entity_id": row.id,
+                        "type": MovementType.DELAY_REPORTED,
+                        "description": (
+                            f"Operação {row.operation_number} atrasada "
+                            f"(prevista para {row.expected_delivery_date:%d/%m/%Y %H:%M})"
+                        ),
+                        "created_at": now,
+                    }
+                    for row in flagged
+                ])
+                for company_id in {row.company_id for row in flagged}:
+                    mark_stale(self.db, company_id, MOVEMENTS)
+
+            changed = self._refresh_counts(now)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # Painéis ao vivo (ver app.services.live_kpi_service)
+        for company_id, late_count in changed.items():
+            publish_event({"type": "operation.late_count", "company_id": str(company_id), "late": late_count})
+
+        return len(flagged)
+
+    def count(self, company_id=None) -> int:
+        ''' Quantidade materializada de operações atrasadas.
+
+        :param company_id: ID da empresa (None para todas).
+        :return: Total de operações em aberto e atrasadas.
+        '''
+        query = select(func.coalesce(func.sum(LateOperationCount.late_count), 0))
+        if company_id is not None:
+            query = query.where(LateOperationCount.company_id == company_id)
+        return int(self.db.execute(query).scalar())
+
+    # --- Definição de métodos ---
+
+    def _refresh_counts(self, now: datetime) -> dict:
+        ''' Regrava late_operation_counts (uma linha por empresa com atrasos).
+
+        :param now: Instante gravado em refreshed_at.
+        :return: Contagens que mudaram, por empresa (0 para quem deixou de ter atrasos).
+        '''
+        previous = dict(self.db.execute(
+            select(LateOperationCount.company_id, LateOperationCount.late_count)
+        ).all())
+        counts = self.db.execute(
+            select(Operation.company_id, func.count(Operation.id))
+            .where(
+                Operation.status.notin_(TERMINAL_STATES),
+                Operation.late_flagged_at.isnot(None),
+            )
+            .group_by(Operation.company_id)
+        ).all()
+
+        self.db.execute(delete(LateOperationCount))
+        if counts:
+            self.db.execute(insert(LateOperationCount), [
+                {"company_id": company_id, "late_count": late_count, "refreshed_at": now}
+                for company_id, late_count in counts
+            ])
+
+        current = dict(counts)
+        return {
+            company_id: current.get(company_id, 0)
+            for company_id in previous.keys() | current.keys()
+            if previous.get(company_id, 0) != current.get(company_id, 0)
+        }
+
+
+# ---------------------------------------------------
+# Job do agendador
+# ---------------------------------------------------
+def sweep_late_operations() -> int:
+    '''Ciclo do sweeper (agendador): marca as novas atrasadas e atualiza as contagens.'''
+    with SessionLocal() as db:
+        return LateOperationService(db).sweep()
@@ -0,0 +1,263 @@
+# Importações externas
+import asyncio
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+# Importações internas
+from app.core.config import LIVE_KPI_DEBOUNCE_SECONDS, LIVE_KPI_ROLLOVER_CHECK_SECONDS
+from app.core.events import get_event_broker
+from app.database import SessionLocal
+from app.domain.operation_state_machine import STOCK_COMMIT_STATUSES, TERMINAL_STATES
+from app.models.company import Company
+from app.models.enum import OperationStatus
+from app.models.operation import Operation
+from app.models.product import Product
+from app.models.user import User
+from app.services.late_operation_service import LateOperationService
+
+# Grupos de KPIs recalculados juntos (uma consulta por grupo)
+KPI_GROUPS: dict[str, tuple[str, ...]] = {
+    "operations": ("pending", "completed_today"),
+    "late": ("late",),
+    "users": ("total_users", "active_users"),
+    "stock": ("low_stock_items",),
+}
+
+TERMINAL_STATUS_VALUES = {status.value for status in TERMINAL_STATES}
+STOCK_COMMIT_STATUS_VALUES = {status.value for status in STOCK_COMMIT_STATUSES}
+
+
+def compute_kpis(db: Session, company_id, groups=KPI_GROUPS) -> dict:
+    ''' Calcula os KPIs de uma empresa (mesmas regras de /operations/kpis e /dashboard/admin-stats).
+
+    :param db: Sessão do banco de dados.
+    :param company_id: ID da empresa.
+    :param groups: Grupos a calcular (chaves de KPI_GROUPS).
+    :return: Valores por nome de KPI.
+    '''
+    values = {}
+
+    if "operations" in groups:
+        row = db.execute(
+            select(
+                func.count(Operation.id).filter(Operation.status.notin_(TERMINAL_STATES)),
+                func.count(Operation.id).filter(
+                    Operation.status == OperationStatus.DELIVERED,
+                    func.date(Operation.updated_at) == date.today(),
+                ),
+            ).where(Operation.company_id == company_id)
+        ).one()
+        values.update(pending=row[0], completed_today=row[1])
+
+    if "late" in groups:
+        values["late"] = LateOperationService(db).count(company_id)
+
+    if "users" in groups:
+        row = db.execute(
+            select(func.count(User.id), func.count(User.id).filter(User.is_active == True))
+            .where(User.company_id == company_id)
+        ).one()
+        values.update(total_users=row[0], active_users=row[1])
+
+    if "stock" in groups:
+        alert_limit = db.execute(
+            select(Company.stock_alert_limit).where(Company.id == company_id)
+        ).scalar()
+        values["low_stock_items"] = db.execute(
+            select(func.count(Product.id)).where(
+                Product.company_id == company_id,
+                Product.quantity <= (alert_limit if alert_limit is not None else 10),
+            )
+        ).scalar()
+
+    return values
+
+
+def load_kpis(company_id, groups=KPI_GROUPS) -> dict:
+    '''compute_kpis com sessão própria (executado no threadpool).'''
+    with SessionLocal() as db:
+        return compute_kpis(db, company_id, groups)
+
+
+# ---------------------------------------------------
+# Espectadores e canais por empresa
+# ---------------------------------------------------
+class KpiViewer:
+    '''
+    Conexão de um painel. As alterações pendentes são mescladas (valores
+    absolutos), então um cliente lento recebe só o estado mais recente.
+    '''
+
+    def __init__(self):
+        self.pending: dict = {}
+        self.version = 0
+        self._ready = asyncio.Event()
+
+    def offer(self, changes: dict, version: int) -> None:
+        self.pending.update(changes)
+        self.version = version
+        self._ready.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[tuple[dict, int]]:
+        '''Alterações acumuladas desde a última chamada, ou None após `timeout` (None espera indefinidamente).'''
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        changes, self.pending = self.pending, {}
+        return changes, self.version
+
+
+class CompanyKpiChannel:
+    '''
+    Estado compartilhado dos KPIs de uma empresa.
+
+    Uma assinatura no broker por empresa (não por conexão): cada evento é
+    aplicado uma vez e o delta vai para todos os espectadores. Operações são
+    contadas incrementalmente; eventos de usuário/produto e baixas de estoque
+    marcam o grupo para um único recálculo ao fim da rajada.
+
+    :param company_id: ID da empresa.
+    :param compute: Função (company_id, grupos) -> valores, síncrona.
+    :param debounce: Espera por mais eventos antes de publicar o delta.
+    '''
+
+    def __init__(self, company_id, compute: Callable = load_kpis, debounce: float = LIVE_KPI_DEBOUNCE_SECONDS):
+        self.company_id = company_id
+        self.compute = compute
+        self.debounce = debounce
+        self.values: dict = {}
+        self.version = 0
+        self.viewers: set[KpiViewer] = set()
+        self._day = None
+        self._subscription = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        ''' Assina antes do snapshot; eventos que chegarem durante o cálculo
+        disparam um recálculo dos grupos afetados em vez de um incremento
+        (que poderia ser contado em dobro).
+        '''
+        self._subscription = get_event_broker().subscribe(self.company_id)
+        self._day = date.today()
+        self.values = await run_in_threadpool(self.compute, self.company_id, set(KPI_GROUPS))
+        self._task = asyncio.create_task(self._pump(exact=False))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        if self._subscription:
+            get_event_broker().unsubscribe(self._subscription)
+
+    def apply(self, event: dict, changes: dict, exact: bool = True) -> set[str]:
+        ''' Aplica um evento sobre o estado atual.
+
+        :param event: Evento publicado no broker.
+        :param changes: Valores novos acumulados na rajada (alterado in-place).
+        :param exact: False enquanto o snapshot pode já conter o evento.
+        :return: Grupos que precisam ser recalculados.
+        '''
+        event_type = event.get("type")
+        if event_type == "product.changed":
+            return {"stock"}
+        if event_type == "user.changed":
+            return {"users"}
+        if event_type == "operation.late_count":
+            changes["late"] = event["late"]
+            return set()
+        if event_type not in ("operation.created", "operation.status_changed"):
+            return set()
+        if not exact:
+            return {"operations", "stock"} if event_type == "operation.status_changed" else {"operations"}
+
+        def bump(key, delta):
+            changes[key] = changes.get(key, self.values.get(key, 0)) + delta
+
+        dirty = set()
+        if event_type == "operation.created":
+            bump("pending", 1)
+            return dirty
+
+        previous, status = event.get("previous_status"), event.get("status")
+        if previous not in TERMINAL_STATUS_VALUES and status in TERMINAL_STATUS_VALUES:
+            bump("pending", -1)
+        if status == OperationStatus.DELIVERED.value:
+            bump("completed_today", 1)
+        if status in STOCK_COMMIT_STATUS_VALUES:
+            dirty.add("stock")
+        return dirty
+
+    def publish(self, changes: dict) -> None:
+        '''Envia aos espectadores apenas os valores que mudaram.'''
+        delta = {key: value for key, value in changes.items() if self.values.get(key) != value}
+        if not delta:
+            return
+        self.values.update(delta)
+        self.version += 1
+        for viewer in list(self.viewers):
+            viewer.offer(delta, self.version)
+
+    async def _pump(self, exact: bool = True) -> None:
+        while True:
+            event = await self._subscription.get(LIVE_KPI_ROLLOVER_CHECK_SECONDS)
+            changes, dirty = {}, set()
+            while event is not None:
+                dirty |= self.apply(event, changes, exact)
+                # Rajadas (ex: criação em lote) viram um único delta/recálculo
+                event = await self._subscription.get(self.debounce)
+            exact = True
+
+            if self._subscription.lagged:
+                self._subscription.lagged = False
+                dirty = set(KPI_GROUPS)
+            today = date.today()
+            if today != self._day:
+                self._day = today
+                dirty.add("operations")  # completed_today volta a zero
+
+            if dirty:
+                try:
+                    changes.update(await run_in_threadpool(self.compute, self.company_id, dirty))
+                except Exception as e:
+                    print(f"Failed to refresh live KPIs for {self.company_id}: {e}")
+            self.publish(changes)
+
+
+class LiveKpiHub:
+    '''Canais por empresa, criados no primeiro espectador e encerrados no último.'''
+
+    def __init__(self, compute: Callable = load_kpis, debounce: float = LIVE_KPI_DEBOUNCE_SECONDS):
+        self.compute = compute
+        self.debounce = debounce
+        self.channels: dict[str, CompanyKpiChannel] = {}
+        self._lock = asyncio.Lock()
+
+    async def join(self, company_id) -> tuple[CompanyKpiChannel, KpiViewer]:
+        key = str(company_id)
+        async with self._lock:
+            channel = self.channels.get(key)
+            if channel is None:
+                channel = CompanyKpiChannel(key, self.compute, self.debounce)
+                await channel.start()
+                self.channels[key] = channel
+            viewer = KpiViewer()
+            channel.viewers.add(viewer)
+        return channel, viewer
+
+    async def leave(self, channel: CompanyKpiChannel, viewer: KpiViewer) -> None:
+        async with self._lock:
+            channel.viewers.discard(viewer)
+            if not channel.viewers and self.channels.get(channel.company_id) is channel:
+                del self.channels[channel.company_id]
+                await channel.stop()
+
+
+@lru_cache(maxsize=1)
+def get_live_kpi_hub() -> LiveKpiHub:
+    '''Retorna o hub de KPIs ao vivo do processo (criado no primeiro uso).'''
+    return LiveKpiHub()
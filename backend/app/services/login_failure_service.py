@@ -0,0 +1,112 @@
+# Importações externas
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+# Importações internas
+from app.database import SessionLocal
+from app.models.login_failure import LoginFailure
+from app.core.config import LOGIN_FAILURE_FLUSH_SIZE, LOGIN_FAILURE_FLUSH_SECONDS
+
+# Classe que acumula falhas de login em memória e as grava em lote
+class LoginFailureBuffer:
+    '''Agrega falhas de login por (usuário, IP) e grava tudo com um único INSERT.
+
+    Um Movement por tentativa transformaria um ataque de credential stuffing
+    em milhares de escritas; aqui cada par (usuário, IP) vira uma linha por flush.
+    '''
+
+    def __init__(
+        self,
+        flush_size: int = LOGIN_FAILURE_FLUSH_SIZE,
+        flush_seconds: int = LOGIN_FAILURE_FLUSH_SECONDS,
+        max_keys: int = 10_000
+    ):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_keys = max_keys
+        self.dropped = 0
+        self._entries: dict[tuple[str, str | None], dict] = {}
+        self._pending = 0
+        self._started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Registra uma tentativa malsucedida (não acessa o banco)
+    def record(self, username: str, ip_address: str | None, rate_limited: bool = False) -> None:
+        now = datetime.now(timezone.utc)
+        key = (username.strip().lower()[:255], ip_address)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_keys:
+                    self.dropped += 1
+                    return
+                if not self._entries:
+                    self._started_at = time.monotonic()
+                entry = self._entries[key] = {
+                    "username": key[0],
+                    "ip_address": ip_address,
+                    "attempts": 0,
+                    "rate_limited": 0,
+                    "first_attempt_at": now,
+                }
+            entry["attempts"] += 1
+            entry["rate_limited"] += int(rate_limited)
+            entry["last_attempt_at"] = now
+            self._pending += 1
+
+    # Indica se já é hora de gravar (por volume ou por idade do lote)
+    def should_flush(self) -> bool:
+        with self._lock:
+            return bool(self._entries) and (
+                self._pending >= self.flush_size
+                or time.monotonic() - self._started_at >= self.flush_seconds
+            )
+
+    # Grava o lote atual com um único INSERT e esvazia o buffer
+    def flush(self, db: Session) -> int:
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries = {}
+            self._pending = 0
+
+        if not entries:
+            return 0
+
+        db.execute(insert(LoginFailure), entries)
+        db.commit()
+        return len(entries)
+
+    # Grava o lote só se já venceu; erro de gravação é logado e não derruba a requisição
+    def flush_if_due(self, db: Session) -> int:
+        if not self.should_flush():
+            return 0
+        try:
+            return self.flush(db)
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to flush login failures: {e}")
+            return 0
+
+
+# Instância única do processo
+login_failure_buffer = LoginFailureBuffer()
+
+
+def _flush_due_login_failures() -> int:
+    with SessionLocal() as db:
+        return login_failure_buffer.flush_if_due(db)
+
+
+async def run_login_failure_flush(interval_seconds: float) -> None:
+    '''Loop do lifespan (um por worker, fora do agendador): grava o lote vencido
+    mesmo que não chegue nenhuma nova tentativa de login.'''
+    while True:
+        await asyncio.sleep(interval_seconds)
+        if login_failure_buffer.should_flush():
+            await run_in_threadpool(_flush_due_login_failures)
@@ -10,9 +10,18 @@ from app.models.enum import (
     OperationStatus,
 )
 from app.repositories.movement_repository import MovementRepository
+from app.core.events import publish_event
+from app.core.response_cache import mark_stale
+from app.services.resource_version_service import MOVEMENTS
 from app.models.movement import Movement
 from app.models.operation import Operation
 
+# Evento publicado quando create_manual registra alteração destas entidades
+CHANGE_EVENTS = {
+    MovementEntityType.PRODUCT: "product.changed",
+    MovementEntityType.USER: "user.changed",
+}
+
 # Serviço de Movimentações
 class MovementService:
     ''' Serviço responsável por gerenciar as movimentações no sistema.
@@ -47,6 +56,7 @@ class MovementService:
         :return: Instância da movimentação criada.
         '''
         # Cria a movimentação de operação criada
+        mark_stale(self.db, company_id, MOVEMENTS)
         return MovementRepository.create(
             db=self.db,
             company_id=company_id,
@@ -79,6 +89,7 @@ class MovementService:
         :return: Instância da movimentação criada.
         '''
         # Cria a movimentação de alteração de status
+        mark_stale(self.db, company_id, MOVEMENTS)
         return MovementRepository.create(
             db=self.db,
             company_id=company_id,
@@ -115,6 +126,7 @@ class MovementService:
         :return: Instância da movimentação criada.
         '''
         # Cria a movimentação genérica
+        mark_stale(self.db, company_id, MOVEMENTS)
         return MovementRepository.create(
             db=self.db,
             company_id=company_id,
@@ -200,7 +212,17 @@ class MovementService:
 
         # Persiste a movimentação no banco de dados
         self.db.add(movement)
+        mark_stale(self.db, company_id, MOVEMENTS)
         self.db.commit()
         self.db.refresh(movement)
 
+        # O commit também grava a alteração registrada; avisa os painéis ao vivo
+        if entity_type in CHANGE_EVENTS and company_id is not None:
+            publish_event({
+                "type": CHANGE_EVENTS[entity_type],
+                "company_id": str(company_id),
+                "entity_id": str(entity_id),
+                "movement_type": movement_type.value,
+            })
+
         return movement
\ No newline at end of file
@@ -1,13 +1,49 @@
 # Importações externas
-from sqlalchemy import func
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from sqlalchemy import Integer, cast, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 # Importações internas
 from app.models.operation import Operation, OperationStatus
-from app.models.movement import MovementType
+from app.models.operation_counter import OperationCounter
+from app.models.movement import Movement, MovementType
+from app.models.enum import MovementEntityType
+from app.models.partner import Partner
+from app.models.product import Product
 from app.services.movement_service import MovementService
+from app.services.inventory_service import InventoryService, InsufficientStock
+from app.services.resource_version_service import MOVEMENTS, OPERATIONS, ResourceVersionService
 from app.domain.operation_validator import validate_status_transition, InvalidOperationTransition
+from app.domain.operation_state_machine import INBOUND_OPERATION_TYPES
+from app.domain.operation_projection import project_operations
+from app.repositories.movement_repository import MovementRepository
 from app.models.operation_item import OperationItem
+from app.core.events import publish_event
+from app.core.response_cache import mark_stale
+
+OPERATION_CREATED_EVENT = "operation.created"
+OPERATION_STATUS_EVENT = "operation.status_changed"
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def operation_event(event_type: str, *, operation_id, company_id, operation_number, status, previous_status=None) -> dict:
+    ''' Monta o evento publicado em /operations/events.
+
+    :return: Dict serializável (IDs e status como texto).
+    '''
+    return {
+        "type": event_type,
+        "company_id": str(company_id),
+        "operation_id": str(operation_id),
+        "operation_number": operation_number,
+        "status": getattr(status, "value", status),
+        "previous_status": getattr(previous_status, "value", previous_status),
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
 
 
 class OperationService:
@@ -32,7 +68,13 @@ class OperationService:
         :param data: Dados da operação a ser criada.
         :param user: Usuário que está criando a operação.
         :return: Instância da operação criada.
+        :raises ValueError: Se os itens forem inválidos para a empresa.
         '''
+        # Valida os itens (produtos, estoque e preços padrão)
+        errors = self.validate_items([data], user.company_id)[0] + self._validate_item_values(data)
+        if errors:
+            raise ValueError("; ".join(errors))
+
         # Cria a instância da operação
         operation = Operation(
             operation_number=self._generate_operation_number(user.company_id),
@@ -65,19 +107,140 @@ class OperationService:
             )
             self.db.add(new_item)
 
+        ResourceVersionService(self.db).bump(operation.company_id, OPERATIONS)
         self.db.commit()
         self.db.refresh(operation)
 
         # Registra a movimentação de criação da operação
         MovementService(self.db).register_operation_created(
-            operation_id=operation.id,
+            operation=operation,
             company_id=operation.company_id,
             created_by=user.id,
             ip_address=None
         )
 
+        publish_event(operation_event(
+            OPERATION_CREATED_EVENT,
+            operation_id=operation.id,
+            company_id=operation.company_id,
+            operation_number=operation.operation_number,
+            status=operation.status,
+        ))
+
         return operation
 
+    def create_bulk(self, operations: list, user) -> list[dict]:
+        ''' Cria várias operações em uma única transação.
+
+        Valida o lote inteiro antes de escrever (parceiros e produtos resolvidos
+        com um IN cada), reserva os números em bloco e grava operações, itens e
+        movimentações de criação com um INSERT multi-linha por tabela.
+        Linhas inválidas são reportadas e não impedem a criação das demais.
+
+        :param operations: Lista de OperationCreateSchema.
+        :param user: Usuário que está criando as operações.
+        :return: Resultado por linha, na ordem de envio.
+        '''
+        results = [
+            {"index": index, "success": False, "id": None, "operation_number": None, "errors": []}
+            for index in range(len(operations))
+        ]
+
+        # Validação: uma consulta para todos os parceiros do lote
+        partner_ids = {data.partner_id for data in operations}
+        known_partners = set(self.db.scalars(
+            select(Partner.id).where(
+                Partner.company_id == user.company_id,
+                Partner.id.in_(partner_ids)
+            )
+        ))
+
+        item_errors = self.validate_items(operations, user.company_id)
+
+        valid = []
+        for index, data in enumerate(operations):
+            errors = []
+            if data.partner_id not in known_partners:
+                errors.append("Parceiro não encontrado")
+            errors += item_errors[index] + self._validate_item_values(data)
+            if errors:
+                results[index]["errors"] = errors
+            else:
+                valid.append((index, data))
+
+        if not valid:
+            return results
+
+        numbers = self._next_operation_numbers(user.company_id, len(valid))
+        now = datetime.now(timezone.utc)
+        operation_rows, item_rows, movement_rows = [], [], []
+
+        for (index, data), number in zip(valid, numbers):
+            operation_id = uuid.uuid4()
+            subtotals = [item.quantity * item.unit_price for item in data.items]
+            operation_rows.append({
+                "id": operation_id,
+                "operation_number": number,
+                "company_id": user.company_id,
+                "partner_id": data.partner_id,
+                "reference_code": data.reference_code,
+                "origin": data.origin,
+                "destination": data.destination,
+                "type": data.type,
+                "expected_delivery_date": data.expected_delivery_date,
+                "observation": data.observation,
+                "status": OperationStatus.CREATED,
+                "created_at": now,
+                "updated_at": now,
+                "created_by": user.id,
+                "total_value": sum(subtotals),
+            })
+            item_rows.extend(
+                {
+                    "id": uuid.uuid4(),
+                    "operation_id": operation_id,
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "subtotal": subtotal,
+                }
+                for item, subtotal in zip(data.items, subtotals)
+            )
+            movement_rows.append({
+                "id": uuid.uuid4(),
+                "company_id": user.company_id,
+                "entity_type": MovementEntityType.OPERATION,
+                "entity_id": operation_id,
+                "type": MovementType.OPERATION_CREATED,
+                "description": "Operação criada",
+                "created_by": user.id,
+                "created_at": now,
+            })
+            results[index].update(success=True, id=operation_id, operation_number=number)
+
+        # Escrita: três INSERTs multi-linha e um único commit
+        try:
+            self.db.execute(insert(Operation), operation_rows)
+            self.db.execute(insert(OperationItem), item_rows)
+            self.db.execute(insert(Movement), movement_rows)
+            ResourceVersionService(self.db).bump(user.company_id, OPERATIONS)
+            mark_stale(self.db, user.company_id, MOVEMENTS)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        for row in operation_rows:
+            publish_event(operation_event(
+                OPERATION_CREATED_EVENT,
+                operation_id=row["id"],
+                company_id=row["company_id"],
+                operation_number=row["operation_number"],
+                status=row["status"],
+            ))
+
+        return results
+
     def update_status(
         self,
         operation: Operation,
@@ -101,12 +264,22 @@ class OperationService:
         # Valida a transição de status
         validate_status_transition(old_status, new_status)
 
+        # Reserva/baixa/devolve o estoque dos itens (mesma transação)
+        try:
+            InventoryService(self.db).apply_transitions(
+                [(operation, old_status, new_status)],
+                user_id=user.id
+            )
+        except InsufficientStock:
+            self.db.rollback()
+            raise
+
         # Atualiza o status da operação
         operation.status = new_status
         
         # Registra a movimentação de alteração de status
         MovementService(self.db).register_status_change(
-            operation_id=operation.id,
+            operation=operation,
             company_id=operation.company_id,
             previous_status=old_status,
             new_status=new_status,
@@ -114,11 +287,107 @@ class OperationService:
             ip_address=None
         )
 
+        ResourceVersionService(self.db).bump(operation.company_id, OPERATIONS)
         self.db.commit()
         self.db.refresh(operation)
 
+        publish_event(operation_event(
+            OPERATION_STATUS_EVENT,
+            operation_id=operation.id,
+            company_id=operation.company_id,
+            operation_number=operation.operation_number,
+            status=new_status,
+            previous_status=old_status,
+        ))
+
         return operation
     
+    def update_status_bulk(self, updates: list, user, company_id=None) -> list[dict]:
+        ''' Altera o status de várias operações em uma única transação.
+
+        As operações são carregadas com uma única consulta (SELECT ... FOR UPDATE
+        SKIP LOCKED: operações travadas por outra transação são reportadas em vez
+        de esperar). Cada transição passa por validate_status_transition; as
+        válidas são aplicadas com um UPDATE por status de destino e as
+        movimentações STATUS_CHANGED são gravadas com um único INSERT.
+
+        :param updates: Lista de itens com `id` e `status`.
+        :param user: Usuário que está realizando a alteração.
+        :param company_id: Restringe às operações da empresa (None para todas).
+        :return: Resultado por operação, na ordem de envio.
+        '''
+        results, targets = [], {}
+        for update_item in updates:
+            result = {"id": update_item.id, "success": False, "previous_status": None,
+                      "status": update_item.status, "error": None}
+            if update_item.id in targets:
+                result["error"] = "Operação duplicada no lote"
+            else:
+                targets[update_item.id] = result
+            results.append(result)
+
+        query = self.db.query(Operation).filter(Operation.id.in_(targets))
+        if company_id is not None:
+            query = query.filter(Operation.company_id == company_id)
+        operations = {
+            operation.id: operation
+            for operation in query.with_for_update(skip_locked=True).all()
+        }
+
+        transitions = []
+        for operation_id, result in targets.items():
+            operation = operations.get(operation_id)
+            if operation is None:
+                result["error"] = "Operação não encontrada ou em uso"
+                continue
+
+            result["previous_status"] = operation.status
+            if operation.status == result["status"]:
+                result["success"] = True  # Nada a alterar
+                continue
+            try:
+                validate_status_transition(operation.status, result["status"])
+            except InvalidOperationTransition as e:
+                result["error"] = str(e)
+                continue
+            transitions.append((operation, operation.status, result["status"]))
+
+        try:
+            transitions = self._apply_stock_transitions(transitions, targets, user)
+            if transitions:
+                self._write_status_transitions(transitions, user)
+                versions = ResourceVersionService(self.db)
+                for operation_company_id in {operation.company_id for operation, _, _ in transitions}:
+                    versions.bump(operation_company_id, OPERATIONS)
+                    mark_stale(self.db, operation_company_id, MOVEMENTS)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        for operation, old_status, new_status in transitions:
+            targets[operation.id]["success"] = True
+            publish_event(operation_event(
+                OPERATION_STATUS_EVENT,
+                operation_id=operation.id,
+                company_id=operation.company_id,
+                operation_number=operation.operation_number,
+                status=new_status,
+                previous_status=old_status,
+            ))
+
+        return results
+
+    def project(self, operation_ids: list) -> dict:
+        ''' Reconstrói status e etapas das operações a partir das movimentações.
+
+        :param operation_ids: IDs das operações.
+        :return: OperationProjection por ID de operação.
+        '''
+        return project_operations(
+            MovementRepository.list_lifecycle(self.db, operation_ids=operation_ids)
+        )
+
     # --- Definição de métodos ---
     
     def _generate_operation_number(self, company_id: str) -> str:
@@ -127,15 +396,169 @@ class OperationService:
         :param company_id: ID da empresa.
         :return: Número único da operação.
         '''
-        last_operation = (
-            self.db.query(Operation)
-            .filter(Operation.company_id == company_id)
-            .order_by(Operation.operation_number.desc())
-            .first()
+        return self._next_operation_numbers(company_id, 1)[0]
+
+    def _next_operation_numbers(self, company_id: str, count: int) -> list[str]:
+        ''' Reserva um bloco de números sequenciais para a empresa.
+
+        Um único upsert em operation_counters soma `count` ao contador e devolve
+        o novo valor; a linha fica travada até o fim da transação, então
+        reservas concorrentes na mesma empresa esperam e recebem blocos
+        disjuntos (e um rollback devolve o bloco). Sem contador, a empresa parte
+        do MAX(operation_number) atual.
+
+        :param company_id: ID da empresa.
+        :param count: Quantidade de números.
+        :return: Números formatados (6 dígitos), em ordem crescente.
+        '''
+        upsert = _UPSERTS.get(self.db.get_bind().dialect.name)
+        if upsert is None:
+            raise ValueError("Numeração de operações requer PostgreSQL ou SQLite.")
+
+        current_max = (
+            select(func.coalesce(func.max(cast(Operation.operation_number, Integer)), 0))
+            .where(Operation.company_id == company_id)
+            .scalar_subquery()
         )
-        if last_operation:
-            last_number = int(last_operation.operation_number)
-            new_number = last_number + 1
-        else:
-            new_number = 1
-        return str(new_number).zfill(6)
\ No newline at end of file
+        statement = upsert(OperationCounter).values(company_id=company_id, last_number=current_max + count)
+        last_number = self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[OperationCounter.company_id],
+                set_={"last_number": OperationCounter.last_number + count},
+            ).returning(OperationCounter.last_number)
+        ).scalar_one()
+        return [str(number).zfill(6) for number in range(last_number - count + 1, last_number + 1)]
+
+    def validate_items(self, operations: list, company_id) -> list[list[str]]:
+        ''' Valida os itens de uma ou mais operações com uma única consulta de produtos.
+
+        Todos os product_ids são resolvidos em um IN restrito à empresa. Verifica
+        se o produto existe, está ativo e tem estoque disponível (quantidade menos
+        reservas) para a quantidade pedida
+        (somada por produto dentro da operação). Itens sem unit_price recebem o
+        Product.price.
+
+        :param operations: Lista de OperationCreateSchema (os itens são atualizados no lugar).
+        :param company_id: ID da empresa.
+        :return: Lista de erros por operação, na mesma ordem.
+        '''
+        product_ids = {item.product_id for data in operations for item in data.items}
+        products = {}
+        if product_ids:
+            products = {
+                row.id: row
+                for row in self.db.execute(
+                    select(Product.id, Product.price, Product.quantity, Product.reserved_quantity, Product.is_active).where(
+                        Product.company_id == company_id,
+                        Product.id.in_(product_ids)
+                    )
+                )
+            }
+
+        all_errors = []
+        for data in operations:
+            errors = []
+            requested = defaultdict(int)
+            for position, item in enumerate(data.items):
+                product = products.get(item.product_id)
+                if product is None:
+                    errors.append(f"Item {position}: produto não encontrado")
+                    continue
+                if not product.is_active:
+                    errors.append(f"Item {position}: produto inativo")
+                    continue
+                if item.unit_price is None:
+                    item.unit_price = float(product.price)
+                requested[item.product_id] += item.quantity
+
+            # Operações de entrada não consomem estoque
+            if data.type in INBOUND_OPERATION_TYPES:
+                requested.clear()
+
+            for product_id, quantity in requested.items():
+                product = products[product_id]
+                if quantity > product.quantity - product.reserved_quantity:
+                    errors.append(f"Estoque insuficiente para o produto {product_id}")
+            all_errors.append(errors)
+
+        return all_errors
+
+    def _apply_stock_transitions(self, transitions: list, targets: dict, user) -> list:
+        ''' Aplica o estoque do lote, descartando as operações sem saldo.
+
+        Cada tentativa roda em um SAVEPOINT; se faltar estoque, as operações que
+        usam os produtos sem saldo são marcadas como falha e o restante é
+        reaplicado.
+
+        :param transitions: Lista de tuplas (operação, status anterior, novo status).
+        :param targets: Resultados por ID de operação (atualizados no lugar).
+        :param user: Usuário responsável.
+        :return: Transições que puderam ser aplicadas.
+        '''
+        while transitions:
+            try:
+                with self.db.begin_nested():
+                    InventoryService(self.db).apply_transitions(transitions, user_id=user.id)
+                return transitions
+            except InsufficientStock as e:
+                blocked = set(self.db.scalars(
+                    select(OperationItem.operation_id).where(
+                        OperationItem.operation_id.in_([operation.id for operation, _, _ in transitions]),
+                        OperationItem.product_id.in_(e.product_ids)
+                    )
+                ))
+                for operation_id in blocked:
+                    targets[operation_id]["error"] = str(e)
+                transitions = [t for t in transitions if t[0].id not in blocked]
+        return transitions
+
+    def _write_status_transitions(self, transitions: list, user) -> None:
+        ''' Grava as transições: um UPDATE por status de destino e um INSERT de movimentações.
+
+        :param transitions: Lista de tuplas (operação, status anterior, novo status).
+        :param user: Usuário responsável.
+        '''
+        now = datetime.now(timezone.utc)
+        by_status = defaultdict(list)
+        for operation, _, new_status in transitions:
+            by_status[new_status].append(operation.id)
+
+        for new_status, operation_ids in by_status.items():
+            self.db.execute(
+                update(Operation)
+                .where(Operation.id.in_(operation_ids))
+                .values(status=new_status, updated_at=now, updated_by=user.id)
+                .execution_options(synchronize_session="fetch")
+            )
+
+        self.db.execute(insert(Movement), [
+            {
+                "id": uuid.uuid4(),
+                "company_id": operation.company_id,
+                "entity_type": MovementEntityType.OPERATION,
+                "entity_id": operation.id,
+                "type": MovementType.STATUS_CHANGED,
+                "previous_status": old_status,
+                "new_status": new_status,
+                "description": f"Status alterado de {old_status} para {new_status}",
+                "created_by": user.id,
+                "created_at": now,
+            }
+            for operation, old_status, new_status in transitions
+        ])
+
+    def _validate_item_values(self, data) -> list[str]:
+        ''' Valida quantidades e preços dos itens (sem acessar o banco).
+
+        :param data: Dados da operação.
+        :return: Lista de erros (vazia se os itens são válidos).
+        '''
+        errors = []
+        if not data.items:
+            errors.append("A operação deve ter ao menos um item")
+        for position, item in enumerate(data.items):
+            if item.quantity <= 0:
+                errors.append(f"Item {position}: quantidade deve ser maior que zero")
+            if item.unit_price is not None and item.unit_price < 0:
+                errors.append(f"Item {position}: preço unitário não pode ser negativo")
+        return errors
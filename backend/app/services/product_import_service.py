@@ -0,0 +1,331 @@
+# Importações externas
+import codecs
+import csv
+import io
+import unicodedata
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import BinaryIO, Iterator
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.core.config import PRODUCT_IMPORT_BATCH_SIZE, PRODUCT_IMPORT_MAX_ERRORS
+from app.core.events import publish_event
+from app.core.response_cache import mark_stale
+from app.models.enum import MovementEntityType, MovementType
+from app.models.movement import Movement
+from app.models.product import Product
+from app.schemas.product import ProductImportRow
+from app.services.resource_version_service import MOVEMENTS, PRODUCTS, ResourceVersionService
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# Cabeçalhos aceitos (normalizados: minúsculas, sem acento, "_" no lugar de espaço)
+HEADER_ALIASES = {
+    "sku": "sku", "codigo": "sku", "cod": "sku",
+    "name": "name", "nome": "name", "produto": "name",
+    "description": "description", "descricao": "description",
+    "price": "price", "preco": "price", "valor": "price",
+    "quantity": "quantity", "quantidade": "quantity", "qtd": "quantity", "estoque": "quantity",
+}
+REQUIRED_COLUMNS = ("sku", "name", "price")
+
+# Colunas opcionais: só sobrescrevem produtos existentes quando a célula vem preenchida
+OPTIONAL_COLUMNS = ("description", "quantity")
+
+# Bytes inspecionados para escolher a codificação do CSV
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+
+# ---------------------------------------------------
+# Leitura em streaming (CSV / XLSX)
+# ---------------------------------------------------
+def _normalize_header(value) -> str:
+    text = unicodedata.normalize("NFKD", str(value or "")).encode("ascii", "ignore").decode()
+    return "_".join(text.strip().lower().split())
+
+
+def _map_header(header: list) -> list:
+    ''' Traduz o cabeçalho para os campos do produto.
+
+    :param header: Primeira linha do arquivo.
+    :return: Campo de cada coluna (None para colunas ignoradas).
+    :raises ValueError: Se faltar coluna obrigatória.
+    '''
+    fields = [HEADER_ALIASES.get(_normalize_header(value)) for value in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in fields]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}")
+    return fields
+
+
+def _detect_encoding(file: BinaryIO) -> str:
+    '''UTF-8 (com ou sem BOM) se o início do arquivo decodificar; senão cp1252 (Excel em português).'''
+    sample = file.read(ENCODING_SAMPLE_SIZE)
+    file.seek(0)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8-sig"
+    except UnicodeDecodeError:
+        return "cp1252"
+
+
+def iter_csv_rows(file: BinaryIO) -> Iterator[tuple[int, dict]]:
+    ''' Lê um CSV linha a linha (separador "," ou ";").
+
+    :param file: Arquivo binário (ex: UploadFile.file).
+    :return: Iterador de (número da linha no arquivo, {campo: valor}).
+    '''
+    text = io.TextIOWrapper(file, encoding=_detect_encoding(file), newline="")
+    try:
+        header_line = text.readline()
+        delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+        fields = _map_header(next(csv.reader([header_line], delimiter=delimiter), []))
+
+        reader = csv.reader(text, delimiter=delimiter)
+        for values in reader:
+            if not any(value.strip() for value in values):
+                continue
+            # line_num conta as linhas lidas pelo reader (o cabeçalho é a linha 1)
+            yield reader.line_num + 1, {
+                field: value for field, value in zip(fields, values) if field is not None
+            }
+    finally:
+        text.detach()  # Não fecha o arquivo do upload
+
+
+def iter_xlsx_rows(file: BinaryIO) -> Iterator[tuple[int, dict]]:
+    ''' Lê a primeira planilha de um XLSX em modo streaming (openpyxl em modo read-only).
+
+    :param file: Arquivo binário (ex: UploadFile.file).
+    :return: Iterador de (número da linha na planilha, {campo: valor}).
+    '''
+    try:
+        from openpyxl import load_workbook  # Importado só quando há upload de XLSX
+    except ImportError:
+        raise ValueError("Importação de XLSX indisponível: instale as dependências (requirements.txt) ou envie um CSV.")
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        fields = _map_header(list(next(rows, ())))
+        for line, values in enumerate(rows, start=2):
+            if all(value is None or str(value).strip() == "" for value in values):
+                continue
+            yield line, {field: value for field, value in zip(fields, values) if field is not None}
+    finally:
+        workbook.close()
+
+
+def iter_rows(file: BinaryIO, filename: str | None) -> Iterator[tuple[int, dict]]:
+    '''Escolhe o leitor pela extensão do arquivo.'''
+    extension = (filename or "").lower().rsplit(".", 1)[-1]
+    if extension == "csv":
+        return iter_csv_rows(file)
+    if extension == "xlsx":
+        return iter_xlsx_rows(file)
+    raise ValueError("Formato não suportado: envie um arquivo .csv ou .xlsx.")
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _parse_decimal(value):
+    '''Aceita "1234.5", "1234,5" e "1.234,50".'''
+    if isinstance(value, str) and "," in value:
+        value = value.replace(".", "").replace(",", ".")
+    return value
+
+
+def parse_row(raw: dict) -> ProductImportRow:
+    ''' Valida uma linha do arquivo.
+
+    :param raw: Valores por campo, como lidos do arquivo.
+    :raises ValidationError: Se a linha for inválida.
+    '''
+    data = {field: _clean(value) for field, value in raw.items()}
+    if data.get("sku") is not None:
+        data["sku"] = str(data["sku"])  # SKU numérico no XLSX
+    if data.get("price") is not None:
+        data["price"] = _parse_decimal(data["price"])
+    if data.get("quantity") is None:
+        data.pop("quantity", None)
+    return ProductImportRow(**{field: value for field, value in data.items() if value is not None})
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'linha'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+# Classe de serviço para importação de produtos
+class ProductImportService:
+    ''' Importa produtos de CSV/XLSX com upsert por (empresa, SKU).
+
+    O arquivo é lido em streaming e gravado em lotes: cada lote é um único
+    INSERT ... ON CONFLICT DO UPDATE, uma movimentação de resumo e um commit,
+    então a memória fica limitada ao lote (mais os erros detalhados, até
+    PRODUCT_IMPORT_MAX_ERRORS). Lotes já gravados permanecem se um lote
+    posterior falhar.
+
+    Em produtos existentes só são atualizadas as células preenchidas: coluna
+    ausente ou célula vazia mantém o valor gravado.
+    '''
+
+    def __init__(self, db: Session):
+        ''' Inicializa o serviço com a sessão do banco de dados.
+
+        :param db: Sessão do banco de dados.
+        '''
+        self.db = db
+
+    def import_rows(
+        self,
+        rows: Iterator[tuple[int, dict]],
+        company_id,
+        user_id,
+        ip_address: str | None = None,
+        batch_size: int = PRODUCT_IMPORT_BATCH_SIZE
+    ) -> dict:
+        ''' Valida e grava as linhas em lotes.
+
+        :param rows: Iterador de (número da linha, {campo: valor}) (ver iter_rows).
+        :param company_id: Empresa dona dos produtos.
+        :param user_id: Usuário responsável pela importação.
+        :param ip_address: IP registrado nas movimentações.
+        :param batch_size: Linhas válidas por lote.
+        :return: Totais (created, updated, failed) e erros por linha.
+        :raises ValueError: Se o formato/cabeçalho for inválido ou o banco não suportar upsert.
+        '''
+        upsert = _UPSERTS.get(self.db.get_bind().dialect.name)
+        if upsert is None:
+            raise ValueError("Importação de produtos requer PostgreSQL ou SQLite.")
+
+        report = {"created": 0, "updated": 0, "failed": 0, "errors": [], "errors_truncated": False}
+        batch: list[tuple[int, ProductImportRow]] = []
+        batch_number = 0
+
+        for line, raw in rows:
+            try:
+                batch.append((line, parse_row(raw)))
+            except ValidationError as e:
+                self._add_error(report, line, _clean(raw.get("sku")), _validation_message(e))
+                continue
+
+            if len(batch) >= batch_size:
+                batch_number += 1
+                self._write_batch(upsert, batch, company_id, user_id, ip_address, batch_number, report)
+                batch = []
+
+        if batch:
+            batch_number += 1
+            self._write_batch(upsert, batch, company_id, user_id, ip_address, batch_number, report)
+
+        if batch_number:
+            # Painéis ao vivo recalculam o estoque baixo uma vez
+            publish_event({"type": "product.changed", "company_id": str(company_id)})
+
+        return report
+
+    # --- Definição de métodos ---
+
+    def _add_error(self, report: dict, line: int, sku, message: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < PRODUCT_IMPORT_MAX_ERRORS:
+            report["errors"].append({"row": line, "sku": None if sku is None else str(sku), "error": message})
+        else:
+            report["errors_truncated"] = True
+
+    def _write_batch(self, upsert, batch, company_id, user_id, ip_address, batch_number, report) -> None:
+        ''' Grava um lote: upserts multi-linha + movimentação de resumo + commit.
+
+        As linhas são agrupadas pelas colunas opcionais preenchidas (no máximo
+        um upsert por combinação), e cada upsert só atualiza essas colunas.
+
+        :param upsert: insert() do dialeto (com on_conflict_do_update).
+        :param batch: Linhas válidas (número da linha, dados).
+        '''
+        # Mesmo SKU duas vezes no lote: vale a última linha (o ON CONFLICT não
+        # pode alterar a mesma linha duas vezes no mesmo comando)
+        latest: dict[str, tuple[int, ProductImportRow]] = {}
+        for line, row in batch:
+            previous = latest.get(row.sku)
+            if previous is not None:
+                self._add_error(report, previous[0], row.sku, f"SKU repetido; vale a linha {line}")
+            latest[row.sku] = (line, row)
+
+        now = datetime.now(timezone.utc)
+        groups: dict[tuple[str, ...], list[dict]] = defaultdict(list)
+        for _, row in latest.values():
+            # model_fields_set: campos com valor na linha (células vazias não são repassadas em parse_row)
+            filled = tuple(field for field in OPTIONAL_COLUMNS if field in row.model_fields_set)
+            groups[filled].append({
+                "id": uuid.uuid4(),
+                "company_id": company_id,
+                "sku": row.sku,
+                "name": row.name,
+                "description": row.description,
+                "price": row.price,
+                "quantity": row.quantity,
+                "is_active": True,
+                "created_by": user_id,
+                "updated_by": user_id,
+                "updated_at": now,
+            })
+
+        statements = []
+        for filled, values in groups.items():
+            statement = upsert(Product).values(values)
+            statements.append(statement.on_conflict_do_update(
+                index_elements=[Product.company_id, Product.sku],
+                set_={
+                    **{field: statement.excluded[field] for field in ("name", "price", *filled)},
+                    "updated_by": user_id,
+                    "updated_at": now,
+                },
+            ))
+
+        try:
+            existing = set(self.db.scalars(
+                select(Product.sku).where(Product.company_id == company_id, Product.sku.in_(latest))
+            ))
+            for statement in statements:
+                self.db.execute(statement)
+
+            created, updated = len(latest) - len(existing), len(existing)
+            first_line, last_line = batch[0][0], batch[-1][0]
+            self.db.add(Movement(
+                company_id=company_id,
+                entity_type=MovementEntityType.COMPANY,
+                entity_id=company_id,
+                type=MovementType.UPDATED,
+                description=(
+                    f"Importação de produtos (lote {batch_number}, linhas {first_line}-{last_line}): "
+                    f"{created} criados, {updated} atualizados"
+                ),
+                created_by=user_id,
+                ip_address=ip_address,
+            ))
+            ResourceVersionService(self.db).bump(company_id, PRODUCTS)
+            mark_stale(self.db, company_id, MOVEMENTS)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            print(f"Failed to import product batch {batch_number}: {e}")
+            for line, row in latest.values():
+                self._add_error(report, line, row.sku, "Falha ao gravar o lote; nenhuma linha dele foi importada")
+            return
+
+        report["created"] += created
+        report["updated"] += updated
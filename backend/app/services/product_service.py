@@ -1,13 +1,17 @@
 # Importações externas
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, aliased, joinedload
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func
 
 # Importações internas
 from app.models.product import Product
+from app.models.company import Company
+from app.models.user import User
+from app.core.serialization import rows_to_dicts
 from app.schemas.product import ProductCreate, ProductUpdate
 from app.services.movement_service import MovementService
+from app.services.resource_version_service import PRODUCTS, ResourceVersionService
 from app.models.enum import MovementType, MovementEntityType
 
 class ProductService:
@@ -34,6 +38,33 @@ class ProductService:
         else:
             return query.all() # Retorna todos para o System Admin ver os inativos também
 
+    # Projeção (somente colunas) da listagem, usada pelo caminho rápido de serialização (ProductOut)
+    def list_product_rows(self, company_id: UUID | None = None) -> list[dict]:
+        updater = aliased(User)
+        query = (
+            self.db.query(
+                Product.id,
+                Product.name,
+                Product.description,
+                Product.sku,
+                Product.price,
+                Product.quantity,
+                Product.reserved_quantity,
+                Product.is_active,
+                Product.company_id,
+                Product.created_at,
+                Product.updated_at,
+                Product.updated_by,
+                updater.name.label("updated_by_name"),
+                Company.name.label("company_name"),
+            )
+            .join(Company, Company.id == Product.company_id)
+            .outerjoin(updater, updater.id == Product.updated_by)
+        )
+        if company_id:
+            query = query.filter(Product.company_id == company_id, Product.is_active == True) # Apenas ativos
+        return rows_to_dicts(query.all())
+
     # Método público para obter produto por ID, usado nas rotas para garantir que usuários só acessem produtos da sua empresa (exceto System Admin)
     def get_by_id(self, product_id: UUID, company_id: UUID):
         product = self._get_product_by_id_and_company(product_id=product_id, company_id=company_id)
@@ -85,6 +116,7 @@ class ProductService:
         )
         self.db.add(new_product)
         try:
+            ResourceVersionService(self.db).bump(company_id, PRODUCTS)
             self.db.commit()
             self.db.refresh(new_product)
             
@@ -124,8 +156,7 @@ class ProductService:
             sku_exists = self.db.query(Product).filter(
                 Product.sku == data.sku,
                 Product.company_id == target_company_id,
-                Product.id != product_id,
-                Product.is_active == True
+                Product.id != product_id
             ).first()
             if sku_exists:
                 raise ValueError("SKU já existe para esta empresa.")
@@ -139,6 +170,7 @@ class ProductService:
         product.updated_by = updated_by
         product.updated_at = func.now()
 
+        ResourceVersionService(self.db).bump(product.company_id, PRODUCTS)
         self.db.commit()
         self.db.refresh(product)
 
@@ -173,6 +205,7 @@ class ProductService:
         product.updated_by = updated_by
         product.updated_at = func.now()
 
+        ResourceVersionService(self.db).bump(product.company_id, PRODUCTS)
         self.db.commit()
         self.db.refresh(product)
 
@@ -207,6 +240,7 @@ class ProductService:
         product.updated_by = updated_by
         product.updated_at = func.now()
 
+        ResourceVersionService(self.db).bump(product.company_id, PRODUCTS)
         self.db.commit()
         self.db.refresh(product)
 
@@ -238,6 +272,7 @@ class ProductService:
             raise ValueError("Produto não encontrado.")
         
         self.db.delete(product)
+        ResourceVersionService(self.db).bump(product.company_id, PRODUCTS)
         self.db.commit()
 
         # REGISTRA MOVIMENTO
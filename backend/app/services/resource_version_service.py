@@ -0,0 +1,143 @@
+# Importações externas
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Optional
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.core.response_cache import etag_matches, mark_stale
+from app.models.resource_version import ResourceVersion
+
+# Recursos com versão (um contador por empresa e recurso); também são as tags do cache de respostas
+PRODUCTS = "products"
+PARTNERS = "partners"
+OPERATIONS = "operations"
+USERS = "users"
+COMPANIES = "companies"
+
+# Tag apenas do cache de respostas (movimentações não têm ETag)
+MOVEMENTS = "movements"
+
+NO_COMPANY_SCOPE = "-"
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _scope(company_id) -> str:
+    return NO_COMPANY_SCOPE if company_id is None else str(company_id)
+
+
+# ---------------------------------------------------
+# Validadores HTTP (ETag fraco / Last-Modified)
+# ---------------------------------------------------
+@dataclass
+class ListValidators:
+    '''ETag e Last-Modified de uma listagem, derivados só dos contadores de versão.'''
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified is not None:
+            last_modified = self.last_modified
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        ''' If-None-Match contém o ETag atual (comparação fraca).
+
+        If-Modified-Since é ignorado: tem resolução de segundos e duas escritas
+        no mesmo segundo dariam um 304 indevido.
+        '''
+        return etag_matches(request, self.etag)
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers)
+
+    def attach(self, result: Any, response: Response) -> Any:
+        ''' Adiciona os cabeçalhos à resposta da rota.
+
+        :param result: Retorno da rota (Response pronta ou dados para o response_model).
+        :param response: Response injetada pelo FastAPI (usada quando `result` não é Response).
+        :return: O próprio `result`.
+        '''
+        target = result if isinstance(result, Response) else response
+        target.headers.update(self.headers)
+        return result
+
+
+# Classe de serviço para os contadores de versão
+class ResourceVersionService:
+    ''' Contadores de versão por (empresa, recurso) que sustentam os ETags das listagens.
+
+    Toda escrita chama `bump` antes do commit (mesma transação), então uma
+    listagem nunca vê a versão nova com dados antigos. A checagem condicional
+    é uma leitura por chave primária em resource_versions, sem tocar nas
+    tabelas listadas nem serializar nada.
+    '''
+
+    def __init__(self, db: Session):
+        ''' Inicializa o serviço com a sessão do banco de dados.
+
+        :param db: Sessão do banco de dados.
+        '''
+        self.db = db
+
+    def bump(self, company_id, *resources: str) -> None:
+        ''' Incrementa as versões (upsert de uma linha por recurso). Não faz commit.
+
+        Também marca os recursos como tags alteradas do cache de respostas
+        (invalidadas depois do commit).
+
+        :param company_id: Empresa dona dos registros alterados (None para registros sem empresa).
+        :param resources: Recursos alterados.
+        '''
+        if not resources:
+            return
+        mark_stale(self.db, company_id, *resources)
+        upsert = _UPSERTS.get(self.db.get_bind().dialect.name)
+        if upsert is None:
+            return  # Banco sem upsert suportado: as listagens apenas não terão 304
+
+        now = datetime.now(timezone.utc)
+        statement = upsert(ResourceVersion).values([
+            {"scope": _scope(company_id), "resource": resource, "version": 1, "updated_at": now}
+            for resource in sorted(set(resources))
+        ])
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=[ResourceVersion.scope, ResourceVersion.resource],
+            set_={"version": ResourceVersion.version + 1, "updated_at": statement.excluded.updated_at},
+        ))
+
+    def validators(self, resources: tuple[str, ...], company_id=None, variant: str = "") -> ListValidators:
+        ''' Calcula o ETag de uma listagem.
+
+        :param resources: Recursos que aparecem na resposta (ex: produtos + nome da empresa).
+        :param company_id: Empresa listada; None para listagens globais (soma de todas as empresas).
+        :param variant: Diferencia representações do mesmo recurso (ex: papel do usuário).
+        :return: ETag fraco e Last-Modified.
+        '''
+        query = (
+            select(ResourceVersion.resource, func.sum(ResourceVersion.version), func.max(ResourceVersion.updated_at))
+            .where(ResourceVersion.resource.in_(resources))
+            .group_by(ResourceVersion.resource)
+        )
+        if company_id is not None:
+            query = query.where(ResourceVersion.scope == _scope(company_id))
+        versions = {resource: (version, updated_at) for resource, version, updated_at in self.db.execute(query)}
+
+        fingerprint = "|".join(
+            [variant, "*" if company_id is None else str(company_id)]
+            + [f"{resource}:{versions.get(resource, (0, None))[0]}" for resource in sorted(resources)]
+        )
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:20]
+        timestamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+        return ListValidators(etag=f'W/"{digest}"', last_modified=max(timestamps) if timestamps else None)
@@ -0,0 +1,275 @@
+# Importações externas
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.database import SessionLocal
+from app.models.enum import MovementEntityType, MovementType, OperationStatus
+from app.models.movement import Movement
+from app.models.operation import Operation
+from app.models.operation_stage_daily import OperationStageDaily
+
+# Etapa sintética: da criação até a conclusão (COMPLETED ou DELIVERED)
+LEAD_TIME_STAGE = "LEAD_TIME"
+LEAD_TIME_END_STATUSES = (OperationStatus.COMPLETED, OperationStatus.DELIVERED)
+
+LIFECYCLE_TYPES = (MovementType.OPERATION_CREATED, MovementType.STATUS_CHANGED)
+
+
+def percentile(values: list[float], q: float) -> float:
+    '''
+    Percentil com interpolação linear (mesmo critério do percentile_cont).
+
+    :param values: Valores já ordenados.
+    :param q: Fração entre 0 e 1.
+    :return: Percentil (0.0 para lista vazia).
+    '''
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def _day_of(value: datetime) -> date:
+    # SQLite devolve datetimes sem timezone; tudo é gravado em UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+# Classe de serviço para análise de tempo em etapa / SLA
+class StageAnalyticsService:
+    ''' Calcula quanto tempo as operações passam em cada etapa e materializa o
+    resultado em operation_stage_daily.
+
+    As durações saem de uma consulta com LAG sobre as movimentações de cada
+    operação (ordenadas por created_at): cada evento fecha a etapa aberta pelo
+    evento anterior. Os relatórios leem apenas o rollup diário.
+    '''
+
+    def __init__(self, db: Session):
+        ''' Inicializa o serviço com a sessão do banco de dados.
+
+        :param db: Sessão do banco de dados.
+        '''
+        self.db = db
+
+    def stage_durations(self, start: datetime, end: datetime, company_id=None) -> list:
+        ''' Etapas encerradas em [start, end), com duração calculada via LAG.
+
+        :param start: Início da janela (fim da etapa).
+        :param end: Fim da janela (exclusivo).
+        :param company_id: Restringe a uma empresa (None para todas).
+        :return: Linhas (operation_id, company_id, partner_id, stage, started_at, ended_at).
+        '''
+        window = {"partition_by": Movement.entity_id, "order_by": (Movement.created_at, Movement.id)}
+        # OPERATION_CREATED não tem new_status: o evento abre a etapa CREATED
+        entered = func.coalesce(Movement.new_status, OperationStatus.CREATED)
+
+        # Só operações com algum evento na janela; o LAG precisa do evento anterior
+        # mesmo que ele seja de antes do início
+        touched = select(Movement.entity_id).where(
+            Movement.entity_type == MovementEntityType.OPERATION,
+            Movement.type == MovementType.STATUS_CHANGED,
+            Movement.created_at >= start,
+            Movement.created_at < end,
+        )
+        if company_id is not None:
+            touched = touched.where(Movement.company_id == company_id)
+
+        events = (
+            select(
+                Movement.entity_id.label("operation_id"),
+                Movement.created_at.label("ended_at"),
+                func.lag(entered, type_=Movement.new_status.type).over(**window).label("stage"),
+                func.lag(Movement.created_at, type_=Movement.created_at.type).over(**window).label("started_at"),
+            )
+            .where(
+                Movement.entity_type == MovementEntityType.OPERATION,
+                Movement.type.in_(LIFECYCLE_TYPES),
+                Movement.entity_id.in_(touched),
+            )
+            .subquery()
+        )
+
+        return self.db.execute(
+            select(
+                events.c.operation_id,
+                Operation.company_id,
+                Operation.partner_id,
+                events.c.stage,
+                events.c.started_at,
+                events.c.ended_at,
+            )
+            .join(Operation, Operation.id == events.c.operation_id)
+            .where(
+                events.c.stage.isnot(None),
+                events.c.ended_at >= start,
+                events.c.ended_at < end,
+            )
+        ).all()
+
+    def lead_times(self, start: datetime, end: datetime, company_id=None) -> list:
+        ''' Tempo total (criação -> COMPLETED/DELIVERED) das operações concluídas em [start, end).
+
+        :param start: Início da janela (conclusão).
+        :param end: Fim da janela (exclusivo).
+        :param company_id: Restringe a uma empresa (None para todas).
+        :return: Linhas (operation_id, company_id, partner_id, started_at, ended_at).
+        '''
+        created_at = func.min(Movement.created_at).filter(Movement.type == MovementType.OPERATION_CREATED)
+        finished_at = func.min(Movement.created_at).filter(Movement.new_status.in_(LEAD_TIME_END_STATUSES))
+
+        # Só operações concluídas na janela
+        finished = select(Movement.entity_id).where(
+            Movement.entity_type == MovementEntityType.OPERATION,
+            Movement.new_status.in_(LEAD_TIME_END_STATUSES),
+            Movement.created_at >= start,
+            Movement.created_at < end,
+        )
+
+        per_operation = (
+            select(
+                Movement.entity_id.label("operation_id"),
+                created_at.label("started_at"),
+                finished_at.label("ended_at"),
+            )
+            .where(
+                Movement.entity_type == MovementEntityType.OPERATION,
+                Movement.type.in_(LIFECYCLE_TYPES),
+                Movement.entity_id.in_(finished),
+            )
+            .group_by(Movement.entity_id)
+            .subquery()
+        )
+
+        query = (
+            select(
+                per_operation.c.operation_id,
+                Operation.company_id,
+                Operation.partner_id,
+                per_operation.c.started_at,
+                per_operation.c.ended_at,
+            )
+            .join(Operation, Operation.id == per_operation.c.operation_id)
+            .where(
+                per_operation.c.started_at.isnot(None),
+                per_operation.c.ended_at >= start,
+                per_operation.c.ended_at < end,
+            )
+        )
+        if company_id is not None:
+            query = query.where(Operation.company_id == company_id)
+        return self.db.execute(query).all()
+
+    def refresh(self, start_day: date, end_day: date, company_id=None) -> int:
+        ''' Recalcula o rollup dos dias [start_day, end_day] (idempotente).
+
+        :param start_day: Primeiro dia.
+        :param end_day: Último dia (inclusivo).
+        :param company_id: Restringe a uma empresa (None para todas).
+        :return: Quantidade de linhas gravadas.
+        '''
+        start = datetime.combine(start_day, time.min, tzinfo=timezone.utc)
+        end = datetime.combine(end_day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+        # (dia, empresa, parceiro, etapa) -> durações; parceiro None = empresa inteira
+        samples = defaultdict(list)
+
+        def collect(row, stage):
+            seconds = (row.ended_at - row.started_at).total_seconds()
+            day = _day_of(row.ended_at)
+            samples[(day, row.company_id, None, stage)].append(seconds)
+            if row.partner_id is not None:
+                samples[(day, row.company_id, row.partner_id, stage)].append(seconds)
+
+        for row in self.stage_durations(start, end, company_id):
+            collect(row, getattr(row.stage, "value", row.stage))
+        for row in self.lead_times(start, end, company_id):
+            collect(row, LEAD_TIME_STAGE)
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        for (day, row_company_id, partner_id, stage), values in samples.items():
+            values.sort()
+            rows.append({
+                "id": uuid.uuid4(),
+                "day": day,
+                "company_id": row_company_id,
+                "partner_id": partner_id,
+                "stage": stage,
+                "samples": len(values),
+                "total_seconds": sum(values),
+                "p50_seconds": percentile(values, 0.5),
+                "p95_seconds": percentile(values, 0.95),
+                "max_seconds": values[-1],
+                "refreshed_at": now,
+            })
+
+        stale = delete(OperationStageDaily).where(
+            OperationStageDaily.day >= start_day,
+            OperationStageDaily.day <= end_day,
+        )
+        if company_id is not None:
+            stale = stale.where(OperationStageDaily.company_id == company_id)
+
+        try:
+            self.db.execute(stale)
+            if rows:
+                self.db.execute(insert(OperationStageDaily), rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return len(rows)
+
+    def report(
+        self,
+        company_id,
+        start_day: date,
+        end_day: date,
+        stage: str | None = None,
+        partner_id=None,
+        by_partner: bool = False
+    ) -> list[OperationStageDaily]:
+        ''' Lê o rollup (percentis já calculados) de uma empresa.
+
+        :param company_id: ID da empresa.
+        :param start_day: Primeiro dia.
+        :param end_day: Último dia (inclusivo).
+        :param stage: Filtra uma etapa (OperationStatus ou "LEAD_TIME").
+        :param partner_id: Filtra um parceiro.
+        :param by_partner: Retorna uma linha por parceiro em vez da linha da empresa.
+        :return: Linhas do rollup ordenadas por dia e etapa.
+        '''
+        query = self.db.query(OperationStageDaily).filter(
+            OperationStageDaily.company_id == company_id,
+            OperationStageDaily.day >= start_day,
+            OperationStageDaily.day <= end_day,
+        )
+        if stage:
+            query = query.filter(OperationStageDaily.stage == stage)
+        if partner_id is not None:
+            query = query.filter(OperationStageDaily.partner_id == partner_id)
+        elif by_partner:
+            query = query.filter(OperationStageDaily.partner_id.isnot(None))
+        else:
+            query = query.filter(OperationStageDaily.partner_id.is_(None))
+
+        return query.order_by(OperationStageDaily.day, OperationStageDaily.stage).all()
+
+
+# ---------------------------------------------------
+# Job do agendador
+# ---------------------------------------------------
+def refresh_stage_rollup() -> int:
+    '''Recalcula o rollup de ontem e de hoje (etapas que terminaram perto da meia-noite).'''
+    today = datetime.now(timezone.utc).date()
+    with SessionLocal() as db:
+        return StageAnalyticsService(db).refresh(today - timedelta(days=1), today)
@@ -0,0 +1,122 @@
+# Importações externas
+import asyncio
+from datetime import datetime, timedelta, timezone
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+# Importações internas
+from app.core.token_denylist import TokenDenylist, token_denylist
+from app.database import SessionLocal
+from app.models.token_revocation import TokenRevocation
+
+# Margem ao reler revogações de outras instâncias (relógios e commits fora de ordem)
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _to_timestamp(value: datetime) -> float:
+    # SQLite devolve datetimes sem timezone; tudo é gravado em UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+# Classe de serviço para revogação de tokens
+class TokenRevocationService:
+    '''Grava revogações na tabela token_revocations e as aplica na denylist em memória.'''
+
+    def __init__(self, db: Session, denylist: TokenDenylist = token_denylist):
+        self.db = db
+        self.denylist = denylist
+
+    # Revoga um token específico (ex: logout) até a sua expiração
+    def revoke_token(self, payload: dict) -> bool:
+        jti = payload.get("jti")
+        if not jti:
+            return False  # Tokens emitidos antes do jti não podem ser revogados individualmente
+
+        expires_at = datetime.fromtimestamp(float(payload["exp"]), timezone.utc)
+        self._persist("jti", jti, expires_at)
+        self.denylist.revoke_token(jti, expires_at.timestamp())
+        return True
+
+    # Revoga todos os tokens já emitidos para o usuário
+    def revoke_subject(self, user_id) -> None:
+        revoked_at = self._persist("user", str(user_id))
+        self.denylist.revoke_subject(user_id, at=revoked_at.timestamp())
+
+    # Revoga todos os tokens já emitidos para usuários da empresa
+    def revoke_company(self, company_id) -> None:
+        revoked_at = self._persist("company", str(company_id))
+        self.denylist.revoke_company(company_id, at=revoked_at.timestamp())
+
+    # Carrega revogações gravadas depois de `since` (todas, se None) e devolve a nova marca d'água
+    def sync(self, since: datetime | None = None) -> datetime | None:
+        now = datetime.now(timezone.utc)
+        query = self.db.query(TokenRevocation).filter(TokenRevocation.expires_at > now)
+        if since is not None:
+            query = query.filter(TokenRevocation.revoked_at > since - SYNC_OVERLAP)
+
+        watermark = since
+        for row in query.order_by(TokenRevocation.revoked_at).all():
+            self._apply(row)
+            revoked_at = datetime.fromtimestamp(_to_timestamp(row.revoked_at), timezone.utc)
+            watermark = max(watermark, revoked_at) if watermark else revoked_at
+
+        return watermark
+
+    # Remove do banco e da memória as revogações que já não têm efeito
+    def purge_expired(self) -> int:
+        removed = (
+            self.db.query(TokenRevocation)
+            .filter(TokenRevocation.expires_at < datetime.now(timezone.utc))
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        self.denylist.purge()
+        return removed
+
+    def _persist(self, kind: str, key: str, expires_at: datetime | None = None) -> datetime:
+        revoked_at = datetime.now(timezone.utc)
+        self.db.add(TokenRevocation(
+            kind=kind,
+            key=key,
+            revoked_at=revoked_at,
+            # Revogações por usuário/empresa só importam enquanto houver token emitido antes delas
+            expires_at=expires_at or revoked_at + timedelta(seconds=self.denylist.ttl_seconds),
+        ))
+        self.db.commit()
+        return revoked_at
+
+    def _apply(self, row: TokenRevocation) -> None:
+        if row.kind == "jti":
+            self.denylist.revoke_token(row.key, _to_timestamp(row.expires_at))
+        elif row.kind == "user":
+            self.denylist.revoke_subject(row.key, at=_to_timestamp(row.revoked_at))
+        elif row.kind == "company":
+            self.denylist.revoke_company(row.key, at=_to_timestamp(row.revoked_at))
+
+
+# ---------------------------------------------------
+# Sincronização periódica (startup + loop no lifespan)
+# ---------------------------------------------------
+_watermark: datetime | None = None
+
+
+def sync_token_revocations() -> None:
+    '''Aplica revogações feitas por outras instâncias e remove as expiradas.'''
+    global _watermark
+    with SessionLocal() as db:
+        service = TokenRevocationService(db)
+        try:
+            _watermark = service.sync(_watermark)
+            service.purge_expired()
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to sync token revocations: {e}")
+
+
+async def run_token_revocation_sync(interval_seconds: int) -> None:
+    '''Loop do lifespan: sincroniza no startup e depois a cada `interval_seconds`.'''
+    while True:
+        await run_in_threadpool(sync_token_revocations)
+        await asyncio.sleep(interval_seconds)
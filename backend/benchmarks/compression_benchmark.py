@@ -0,0 +1,88 @@
+'''Benchmark de compressão: bytes economizados e custo de CPU por endpoint.
+
+Gera respostas sintéticas com o formato real dos schemas de listagem
+(`list_products`, `list_users`, `list_companies`, `list_operations`) e mede
+cada codificação habilitada no ambiente (gzip sempre; br/zstd se instalados).
+
+Uso (a partir de backend/):
+    DATABASE_URL=... JWT_SECRET_KEY=... python -m benchmarks.compression_benchmark [linhas]
+'''
+import json
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.core.compression import available_encodings
+from app.core.config import COMPRESSION_LEVEL
+from app.schemas.company import CompanyResponse
+from app.schemas.operation import OperationResponseSchema
+from app.schemas.product import ProductOut
+from app.schemas.user import UserResponse
+
+NOW = datetime.now(timezone.utc)
+
+
+def product(i: int) -> dict:
+    return ProductOut(
+        id=uuid.uuid4(), name=f"Produto {i}", description=f"Descrição do produto {i}",
+        sku=f"SKU-{i:06d}", price=10.5 + i, quantity=i % 300, is_active=True,
+        company_id=uuid.uuid4(), created_at=NOW, updated_at=NOW, updated_by=None,
+        updated_by_name=None, company_name="Empresa Exemplo",
+    ).model_dump(mode="json")
+
+
+def user(i: int) -> dict:
+    return UserResponse(
+        id=uuid.uuid4(), name=f"Usuário {i}", email=f"user{i}@example.com", role="USER",
+        company_id=uuid.uuid4(), updated_at=NOW, created_at=NOW, is_active=True,
+    ).model_dump(mode="json")
+
+
+def company(i: int) -> dict:
+    return CompanyResponse(
+        id=uuid.uuid4(), name=f"Empresa {i}", cnpj=f"{i:014d}", token=uuid.uuid4().hex,
+        is_active=True, created_at=NOW, updated_at=NOW,
+    ).model_dump(mode="json")
+
+
+def operation(i: int) -> dict:
+    return OperationResponseSchema(
+        id=uuid.uuid4(), reference_code=f"REF-{i:06d}", status="IN_TRANSIT",
+        origin="São Paulo - SP", destination="Campinas - SP", created_at=NOW,
+        updated_at=NOW, expected_delivery_date=NOW,
+    ).model_dump(mode="json")
+
+
+ENDPOINTS = {
+    "list_products": product,
+    "list_users": user,
+    "list_companies": company,
+    "list_operations": operation,
+}
+
+
+def measure(body: bytes, compressor_cls, rounds: int = 20) -> tuple[int, float]:
+    '''Retorna (tamanho comprimido, tempo médio de CPU em ms).'''
+    size = 0
+    start = time.process_time()
+    for _ in range(rounds):
+        size = len(compressor_cls(COMPRESSION_LEVEL).compress(body, final=True))
+    return size, (time.process_time() - start) / rounds * 1000
+
+
+def main(rows: int = 500):
+    encodings = available_encodings()
+    print(f"{rows} linhas por resposta, nível {COMPRESSION_LEVEL}\n")
+    print(f"{'endpoint':<18} {'enc':<6} {'original':>10} {'comprimido':>11} {'economia':>9} {'CPU/resp':>10}")
+
+    for endpoint, factory in ENDPOINTS.items():
+        body = json.dumps([factory(i) for i in range(rows)]).encode()
+        for name, compressor_cls in encodings.items():
+            size, cpu_ms = measure(body, compressor_cls)
+            saved = 100 * (1 - size / len(body))
+            print(f"{endpoint:<18} {name:<6} {len(body):>10} {size:>11} {saved:>8.1f}% {cpu_ms:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,63 @@
+'''Benchmark de cold start: tempo de import de `app.main:app` em processos novos.
+
+Mostra a mediana do import e os módulos de terceiros mais caros
+(`python -X importtime`), para comparar antes/depois de mudanças.
+
+Uso (a partir de backend/):
+    DATABASE_URL=... JWT_SECRET_KEY=... python benchmarks/import_time_benchmark.py [rodadas] [top]
+'''
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def run_once() -> dict[str, int]:
+    '''Importa app.main em um processo novo e retorna {módulo: cumulativo (us)}.'''
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    modules = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def main(rounds: int = 5, top: int = 15):
+    runs = [run_once() for _ in range(rounds)]
+
+    totals = [run["app.main"] / 1000 for run in runs]
+    print(f"import app.main  mediana={statistics.median(totals):8.1f} ms  min={min(totals):8.1f} ms  max={max(totals):8.1f} ms")
+
+    # Pacotes de topo mais caros (mediana do cumulativo)
+    packages = defaultdict(list)
+    for run in runs:
+        for name, cumulative in run.items():
+            if "." not in name and name != "app.main":
+                packages[name].append(cumulative / 1000)
+
+    ranking = sorted(
+        ((statistics.median(values), name) for name, values in packages.items()),
+        reverse=True
+    )
+    print(f"\nTop {top} pacotes (cumulativo, mediana):")
+    for value, name in ranking[:top]:
+        print(f"  {name:<28} {value:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 15,
+    )
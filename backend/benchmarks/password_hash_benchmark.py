@@ -0,0 +1,56 @@
+'''Benchmark de custo de senha: latência de verificação (login) por configuração.
+
+Para cada esquema/custo mede N verificações e reporta p50/p95/p99, para
+escolher o custo que cabe no orçamento de p99 do login. Configurações argon2
+só rodam se o argon2-cffi estiver instalado.
+
+Uso (a partir de backend/):
+    JWT_SECRET_KEY=... python -m benchmarks.password_hash_benchmark [amostras]
+'''
+import statistics
+import sys
+import time
+
+from app.core.security import build_pwd_context
+
+CONFIGS = [
+    ("bcrypt r=10", ["bcrypt"], {"bcrypt_rounds": 10}),
+    ("bcrypt r=11", ["bcrypt"], {"bcrypt_rounds": 11}),
+    ("bcrypt r=12", ["bcrypt"], {"bcrypt_rounds": 12}),
+    ("argon2id t=2 m=19MiB", ["argon2"], {"argon2_time_cost": 2, "argon2_memory_cost": 19456}),
+    ("argon2id t=3 m=12MiB", ["argon2"], {"argon2_time_cost": 3, "argon2_memory_cost": 12288}),
+    ("argon2id t=1 m=46MiB", ["argon2"], {"argon2_time_cost": 1, "argon2_memory_cost": 47104}),
+]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main(samples: int = 20):
+    print(f"{samples} verificações por configuração\n")
+    print(f"{'configuração':<24} {'p50':>9} {'p95':>9} {'p99':>9}")
+
+    for label, schemes, costs in CONFIGS:
+        context = build_pwd_context(schemes, **costs)
+        try:
+            hashed = context.hash("senha-de-teste")
+        except Exception as e:  # Backend ausente (ex: argon2-cffi não instalado)
+            print(f"{label:<24} indisponível ({type(e).__name__})")
+            continue
+
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            context.verify("senha-de-teste", hashed)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        print(
+            f"{label:<24} {statistics.median(timings):>7.1f}ms "
+            f"{percentile(timings, 95):>7.1f}ms {percentile(timings, 99):>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,42 @@
+'''Benchmark do pool de senhas: rajada de logins concorrentes.
+
+Dispara N verificações bcrypt simultâneas (como um pico de logins) e mostra
+quantas foram aceitas/recusadas (429) e o tempo de fila vs. tempo de hash.
+
+Uso (a partir de backend/):
+    JWT_SECRET_KEY=... PASSWORD_HASH_WORKERS=4 PASSWORD_HASH_MAX_QUEUE=16 \\
+        python -m benchmarks.password_pool_benchmark [requisições]
+'''
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.password_pool import PasswordPoolSaturated
+from app.core.security import get_password_pool, hash_password, verify_password
+
+
+def main(requests: int = 64):
+    hashed = hash_password("senha-de-teste")
+    pool = get_password_pool()
+
+    def login():
+        try:
+            return verify_password("senha-de-teste", hashed)
+        except PasswordPoolSaturated:
+            return None
+
+    start = time.perf_counter()
+    # Threads simulando o threadpool compartilhado das rotas síncronas
+    with ThreadPoolExecutor(max_workers=requests) as clients:
+        results = list(clients.map(lambda _: login(), range(requests)))
+    elapsed = time.perf_counter() - start
+
+    accepted = sum(1 for r in results if r is not None)
+    print(f"{requests} logins simultâneos em {elapsed * 1000:.0f}ms")
+    print(f"aceitos: {accepted}  recusados (429): {requests - accepted}\n")
+    for key, value in pool.snapshot().items():
+        print(f"{key:<14} {value}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
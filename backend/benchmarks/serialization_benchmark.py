@@ -0,0 +1,100 @@
+'''Benchmark de serialização: caminho ORM padrão vs. caminho rápido (FAST_JSON_RESPONSES).
+
+Popula um SQLite em memória e, para cada listagem, compara:
+- padrão: entidades ORM -> response_model (from_attributes) -> jsonable -> json.dumps;
+- rápido: projeção SQL (apenas colunas) -> TypeAdapter -> bytes JSON.
+
+Uso (a partir de backend/):
+    DATABASE_URL=... JWT_SECRET_KEY=... python -m benchmarks.serialization_benchmark [linhas]
+'''
+import json
+import sys
+import time
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.serialization import serialize_list
+from app.models import Base, Company, Product, User
+from app.models.enum import UserRole
+from app.repositories.user_repository import list_user_rows
+from app.schemas.product import ProductOut
+from app.schemas.user import UserResponse
+from app.services.product_service import ProductService
+
+
+def seed(rows: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    company = Company(name="Empresa Benchmark", cnpj="00000000000100", token="bench")
+    db.add(company)
+    db.flush()
+
+    users = [
+        User(name=f"Usuário {i}", email=f"user{i}@example.com", password_hash="x",
+             role=UserRole.USER, company_id=company.id)
+        for i in range(rows)
+    ]
+    db.add_all(users)
+    db.flush()
+
+    db.add_all([
+        Product(name=f"Produto {i}", description=f"Descrição {i}", sku=f"SKU-{i:06d}",
+                price=10.5 + i, quantity=i % 300, company_id=company.id,
+                created_by=users[0].id, updated_by=users[i % rows].id,
+                updated_at=datetime.now(timezone.utc))
+        for i in range(rows)
+    ])
+    db.commit()
+    return db, company.id
+
+
+def orm_path(schema, objects) -> bytes:
+    '''Reproduz o que o FastAPI faz com um response_model e entidades ORM.'''
+    adapter = TypeAdapter(list[schema])
+    validated = adapter.validate_python(objects, from_attributes=True)
+    return json.dumps(jsonable_encoder(adapter.dump_python(validated, mode="json"))).encode()
+
+
+def timed(fn, db, rounds: int) -> float:
+    '''Tempo médio em ms; a sessão é limpa para não reaproveitar o identity map.'''
+    total = 0.0
+    for _ in range(rounds):
+        db.expire_all()
+        start = time.perf_counter()
+        fn()
+        total += time.perf_counter() - start
+    return total / rounds * 1000
+
+
+def main(rows: int = 1000, rounds: int = 20):
+    db, company_id = seed(rows)
+    service = ProductService(db)
+
+    cases = {
+        "list_users": (
+            lambda: orm_path(UserResponse, db.query(User).all()),
+            lambda: serialize_list(UserResponse, list_user_rows(db)).body,
+        ),
+        "list_products": (
+            lambda: orm_path(ProductOut, service.list_products(company_id=company_id)),
+            lambda: serialize_list(ProductOut, service.list_product_rows(company_id=company_id)).body,
+        ),
+    }
+
+    print(f"{rows} linhas por resposta, média de {rounds} rodadas\n")
+    print(f"{'endpoint':<16} {'ORM':>10} {'rápido':>10} {'ganho':>7}")
+    for endpoint, (slow, fast) in cases.items():
+        slow_ms = timed(slow, db, rounds)
+        fast_ms = timed(fast, db, rounds)
+        print(f"{endpoint:<16} {slow_ms:>8.2f}ms {fast_ms:>8.2f}ms {slow_ms / fast_ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,51 @@
+'''Benchmark de startup: mede o tempo até a primeira requisição (time-to-first-request).
+
+Cada rodada sobe um processo Python novo, importa `app.main:app`, executa o
+lifespan (verificação das migrations) e atende uma requisição.
+
+Uso (a partir de backend/):
+    DATABASE_URL=... JWT_SECRET_KEY=... python benchmarks/startup_benchmark.py [rodadas]
+'''
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Código executado em cada processo filho
+CHILD = r'''
+import time
+from fastapi.testclient import TestClient
+t0 = time.perf_counter()
+from app.main import app
+t_import = time.perf_counter()
+with TestClient(app) as client:
+    t_startup = time.perf_counter()
+    client.get("/openapi.json")
+    t_first = time.perf_counter()
+print(f"{t_import - t0:.6f} {t_startup - t_import:.6f} {t_first - t0:.6f}")
+'''
+
+
+def run_once() -> tuple[float, float, float]:
+    '''Executa uma rodada em um processo novo e retorna (import, lifespan, total).'''
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip().splitlines()[-1]
+    return tuple(float(value) for value in output.split())
+
+
+def main(rounds: int = 5):
+    results = [run_once() for _ in range(rounds)]
+    for index, label in enumerate(["import app.main", "lifespan startup", "time-to-first-request"]):
+        values = [result[index] * 1000 for result in results]
+        print(f"{label:<24} mediana={statistics.median(values):8.1f} ms  min={min(values):8.1f} ms  max={max(values):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -1,13 +1,20 @@
 from datetime import datetime, timezone
+import os
 import uuid
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+
+# O agendador não deve disputar o banco de teste com as fixtures
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+
 from app.main import app
 from app.database import get_db
 from app.models import Company, User, Movement, Operation, Product, Base
 from app.core.security import hash_password as get_password_hash
+from app.core.rate_limit import get_login_rate_limiter
+from app.core.maintenance import maintenance_flag
 from app.models.enum import MovementType, MovementEntityType, OperationStatus
 
 # -------------------- Banco de teste --------------------
@@ -34,6 +41,11 @@ def create_tables():
     yield
     Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(autouse=True)
+def reset_maintenance_flag():
+    """A flag de manutenção fica em cache no processo: cada teste relê o banco"""
+    maintenance_flag.clear()
+
 # -------------------- Fixture de session --------------------
 @pytest.fixture()
 def session(create_tables):
@@ -246,6 +258,8 @@ def client(session):
     def override_get_db():
         yield session
     app.dependency_overrides[get_db] = override_get_db
+    # Baldes de rate limit do login zerados a cada teste
+    get_login_rate_limiter.cache_clear()
 
     with TestClient(app) as c:
         yield c
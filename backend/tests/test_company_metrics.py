@@ -0,0 +1,200 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.scheduler import AdvisoryLockLeader, Scheduler
+from app.models import Base, Company, Operation, Movement, Product, DailyCompanyMetrics, RollupWatermark
+from app.models.enum import MovementEntityType, MovementType, OperationStatus as S, OperationType
+from app.services.company_metrics_service import WATERMARK_NAME, CompanyMetricsService
+
+DAY = date(2026, 3, 10)
+T0 = datetime(2026, 3, 10, 8, 0, tzinfo=timezone.utc)
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def company(db):
+    company = Company(name="Empresa", cnpj="12345678000199", token="tok-metrics")
+    db.add(company)
+    db.commit()
+    return company
+
+def add_operation(db, company, at, value=100, final=None):
+    operation = Operation(
+        operation_number=uuid.uuid4().hex[:8], company_id=company.id, status=final or S.CREATED,
+        type=OperationType.DELIVERY, total_value=value, created_at=at, updated_at=at,
+    )
+    db.add(operation)
+    db.flush()
+    if final:
+        db.add(Movement(
+            company_id=company.id, entity_type=MovementEntityType.OPERATION, entity_id=operation.id,
+            type=MovementType.STATUS_CHANGED, previous_status=S.CREATED, new_status=final,
+            created_at=at + timedelta(hours=1),
+        ))
+    db.commit()
+    return operation
+
+def add_login(db, company, at):
+    db.add(Movement(
+        company_id=company.id, entity_type=MovementEntityType.USER, entity_id=uuid.uuid4(),
+        type=MovementType.LOGIN, created_at=at,
+    ))
+    db.commit()
+
+def metrics(db, company, day=DAY):
+    return db.query(DailyCompanyMetrics).filter_by(company_id=company.id, day=day).one()
+
+# -------------------- Rollup --------------------
+def test_refresh_days_counts_events_by_day(db, company):
+    add_operation(db, company, T0, value=100)
+    add_operation(db, company, T0, value=50, final=S.COMPLETED)
+    add_operation(db, company, T0, value=25, final=S.CANCELED)
+    add_operation(db, company, T0 + timedelta(days=1), value=999)
+    add_login(db, company, T0)
+    add_login(db, company, T0 + timedelta(minutes=5))
+    db.add(Product(name="Caixa", sku="CX-1", price=10, company_id=company.id, created_at=T0))
+    db.commit()
+
+    assert CompanyMetricsService(db).refresh_days(DAY, DAY) == 1
+
+    row = metrics(db, company)
+    assert row.operations_created == 3
+    assert row.operations_completed == 1
+    assert row.operations_canceled == 1
+    assert float(row.total_value) == 175
+    assert row.logins == 2
+    assert row.new_products == 1
+
+def test_refresh_days_is_idempotent(db, company):
+    add_operation(db, company, T0)
+    service = CompanyMetricsService(db)
+    service.refresh_days(DAY, DAY)
+    add_operation(db, company, T0)
+    service.refresh_days(DAY, DAY)
+
+    assert db.query(DailyCompanyMetrics).count() == 1
+    assert metrics(db, company).operations_created == 2
+
+def test_incremental_refresh_advances_watermark(db, company):
+    service = CompanyMetricsService(db)
+    add_operation(db, company, T0)
+    service.refresh_days(DAY, DAY, watermark=T0 + timedelta(hours=1))
+
+    # Evento no dia seguinte: só esse dia (e o da marca d'água) são recalculados
+    next_day = T0 + timedelta(days=1)
+    add_operation(db, company, next_day)
+    service.refresh_incremental(now=next_day + timedelta(hours=1))
+
+    assert metrics(db, company, DAY + timedelta(days=1)).operations_created == 1
+    watermark = db.get(RollupWatermark, WATERMARK_NAME).watermark
+    assert watermark.replace(tzinfo=timezone.utc) == next_day + timedelta(hours=1)
+
+def test_backfill_runs_in_chunks(db, company):
+    for offset in range(5):
+        add_operation(db, company, T0 + timedelta(days=offset))
+
+    assert CompanyMetricsService(db).backfill(DAY, DAY + timedelta(days=4), chunk_days=2) == 5
+    assert db.query(DailyCompanyMetrics).count() == 5
+    # Backfill não mexe na marca d'água do job incremental
+    assert db.get(RollupWatermark, WATERMARK_NAME) is None
+
+def test_history_sums_companies_and_fills_empty_days(db, company):
+    other = Company(name="Outra", cnpj="98765432000199", token="tok-outra")
+    db.add(other)
+    db.commit()
+    add_operation(db, company, T0, final=S.COMPLETED)
+    add_operation(db, other, T0)
+    add_login(db, other, T0)
+    service = CompanyMetricsService(db)
+    service.refresh_days(DAY, DAY)
+
+    series = service.history(DAY, DAY + timedelta(days=1))
+
+    assert [item["day"] for item in series] == ["2026-03-10", "2026-03-11"]
+    assert (series[0]["operations_created"], series[0]["operations_completed"], series[0]["logins"]) == (2, 1, 1)
+    assert series[1]["operations_created"] == 0
+    assert service.history(DAY, DAY, company_id=other.id)[0]["operations_created"] == 1
+
+# -------------------- Agendador --------------------
+def test_scheduler_runs_due_jobs_once_per_interval(engine):
+    calls = []
+    scheduler = Scheduler(AdvisoryLockLeader(engine, 1))
+    scheduler.add_job("rapido", 3600, lambda: calls.append("rapido"))
+
+    assert asyncio.run(scheduler.run_pending()) == ["rapido"]
+    assert asyncio.run(scheduler.run_pending()) == []
+    assert calls == ["rapido"]
+
+def test_scheduler_isolates_failing_jobs(engine):
+    calls = []
+
+    def broken():
+        raise RuntimeError("falhou")
+
+    scheduler = Scheduler(AdvisoryLockLeader(engine, 1))
+    scheduler.add_job("quebrado", 60, broken)
+    scheduler.add_job("ok", 60, lambda: calls.append("ok"))
+
+    assert asyncio.run(scheduler.run_pending()) == ["quebrado", "ok"]
+    assert calls == ["ok"]
+    assert scheduler.jobs[0].last_error == "falhou"
+
+def test_scheduler_skips_jobs_without_leadership(engine):
+    class Follower(AdvisoryLockLeader):
+        def acquire(self):
+            return False
+
+    calls = []
+    scheduler = Scheduler(Follower(engine, 1))
+    scheduler.add_job("job", 60, lambda: calls.append("job"))
+
+    assert asyncio.run(scheduler.run_pending()) == []
+    assert calls == []
+
+def test_shutdown_waits_for_the_scheduler_to_release_the_lock(engine, monkeypatch):
+    from app import main
+
+    released = []
+
+    class Leader(AdvisoryLockLeader):
+        def release(self):
+            released.append(True)
+
+    class IdleScheduler(Scheduler):
+        async def run_pending(self):
+            return []
+
+    async def idle_sync(interval):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(main, "SCHEDULER_ENABLED", True)
+    monkeypatch.setattr(main, "AdvisoryLockLeader", Leader)
+    monkeypatch.setattr(main, "Scheduler", IdleScheduler)
+    monkeypatch.setattr(main, "check_migration_state", lambda *args, **kwargs: None)
+    monkeypatch.setattr(main, "run_token_revocation_sync", idle_sync)
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=engine))
+
+    async def scenario():
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0)
+        # Sem aguardar a task cancelada, o release ainda não teria rodado aqui
+        assert released == [True]
+
+    asyncio.run(scenario())
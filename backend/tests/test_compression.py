@@ -0,0 +1,97 @@
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+PAYLOAD = [{"id": i, "name": f"Produto {i}", "sku": f"SKU{i}"} for i in range(200)]
+
+# -------------------- App de teste --------------------
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/big")
+    def big():
+        return PAYLOAD
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\x00" * 5000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for i in range(5):
+                yield f"data: {i}\n\n" * 50
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/encoded")
+    def encoded():
+        return PlainTextResponse(gzip.compress(b"x" * 5000), headers={"Content-Encoding": "gzip"})
+
+    return TestClient(app)
+
+# -------------------- Testes --------------------
+def test_large_json_is_gzipped(client):
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.json() == PAYLOAD
+
+def test_small_body_is_not_compressed(client):
+    resp = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+def test_content_type_outside_allowlist_is_not_compressed(client):
+    resp = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+
+def test_allowlist_is_configurable():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, compressible_types=["application/json"])
+
+    @app.get("/csv")
+    def csv():
+        return PlainTextResponse("a,b\n" * 500, media_type="text/csv")
+
+    @app.get("/big")
+    def big():
+        return PAYLOAD
+
+    client = TestClient(app)
+    assert "content-encoding" not in client.get("/csv", headers={"Accept-Encoding": "gzip"}).headers
+    assert client.get("/big", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+
+def test_identity_when_client_does_not_accept(client):
+    resp = client.get("/big", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in resp.headers
+    assert resp.json() == PAYLOAD
+
+def test_streaming_response_is_compressed_without_length(client):
+    resp = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert resp.text == "".join(f"data: {i}\n\n" * 50 for i in range(5))
+
+def test_already_encoded_response_passes_through(client):
+    resp = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.text == "x" * 5000
+
+def test_brotli_is_preferred_when_available(client):
+    pytest.importorskip("brotli")
+    resp = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.headers["content-encoding"] == "br"
+
+def test_negotiate_respects_quality_values():
+    assert negotiate_encoding("gzip;q=0, br", ["gzip"]) is None
+    assert negotiate_encoding("gzip;q=0.5, zstd", ["zstd", "gzip"]) == "zstd"
+    assert negotiate_encoding("*", ["gzip"]) == "gzip"
+    assert negotiate_encoding("", ["gzip"]) is None
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Orçamento de import do app.main (ms); ajustável no CI via variável de ambiente
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 4000))
+
+# Módulos pesados que só devem ser carregados sob demanda
+LAZY_MODULES = ("passlib", "jose", "alembic")
+
+# -------------------- Helper: python -X importtime --------------------
+def parse_importtime(stderr: str) -> dict[str, int]:
+    '''Converte a saída de `python -X importtime` em {módulo: tempo cumulativo (us)}.'''
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+def import_app_main() -> dict[str, int]:
+    env = {**os.environ, "DATABASE_URL": os.getenv("DATABASE_URL", "sqlite://"), "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY", "test")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+# -------------------- Testes --------------------
+def test_app_main_import_within_budget():
+    modules = import_app_main()
+    assert modules["app.main"] / 1000 <= IMPORT_TIME_BUDGET_MS
+
+def test_heavy_modules_are_not_imported_at_startup():
+    modules = import_app_main()
+    eager = [name for name in modules if name.split(".")[0] in LAZY_MODULES]
+    assert eager == []
+
+def test_routers_do_not_import_each_other():
+    routes_dir = os.path.join(BACKEND_DIR, "app", "routes")
+    for filename in os.listdir(routes_dir):
+        if filename.endswith(".py"):
+            with open(os.path.join(routes_dir, filename), encoding="utf-8") as f:
+                assert "from app.routes" not in f.read(), filename
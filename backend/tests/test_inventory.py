@@ -0,0 +1,181 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Company, User, Partner, Product
+from app.models.movement import Movement
+from app.models.enum import UserRole, OperationStatus, OperationType, MovementType
+from app.schemas.operation import OperationCreateSchema
+from app.services.inventory_service import InsufficientStock
+from app.services.operation_service import OperationService
+
+PATH = [OperationStatus.AT_ORIGIN, OperationStatus.LOADED, OperationStatus.IN_TRANSIT,
+        OperationStatus.UNLOADED, OperationStatus.COMPLETED]
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def setup():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    company = Company(name="Empresa", cnpj="12345678000199", token="tok-inventory")
+    session.add(company)
+    session.flush()
+    user = User(name="Admin", email="admin@inventory.com", password_hash="x", role=UserRole.ADMIN, company_id=company.id)
+    session.add(user)
+    session.flush()
+    partner = Partner(company_id=company.id, name="Parceiro", document="123")
+    products = [
+        Product(name=f"P{i}", sku=f"SKU-{i}", price=10, quantity=10, company_id=company.id,
+                created_by=user.id, updated_by=user.id)
+        for i in range(2)
+    ]
+    session.add_all([partner, *products])
+    session.commit()
+
+    service = OperationService(session)
+
+    def create(quantities, type=OperationType.DELIVERY):
+        data = OperationCreateSchema(
+            reference_code="REF", origin="A", destination="B", type=type, partner_id=partner.id,
+            items=[{"product_id": product.id, "quantity": quantity} for product, quantity in zip(products, quantities) if quantity],
+        )
+        return service.create(data, user)
+
+    def move(operation, *statuses):
+        for status in statuses:
+            service.update_status(operation, status, user)
+
+    def stock(product):
+        session.refresh(product)
+        return product.quantity, product.reserved_quantity
+
+    yield SimpleNamespace(db=session, engine=engine, products=products, create=create, move=move, stock=stock)
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+# -------------------- Ciclo de vida --------------------
+def test_loaded_reserves_and_completed_decrements(setup):
+    first, second = setup.products
+    operation = setup.create([3, 4])
+
+    setup.move(operation, *PATH[:2])
+    assert setup.stock(first) == (10, 3)
+    assert setup.stock(second) == (10, 4)
+
+    setup.move(operation, *PATH[2:])
+    assert setup.stock(first) == (7, 0)
+    assert setup.stock(second) == (6, 0)
+
+    outputs = setup.db.query(Movement).filter(Movement.type == MovementType.OUTPUT).all()
+    assert sorted(movement.entity_id for movement in outputs) == sorted(product.id for product in setup.products)
+
+def test_cancel_releases_the_reservation(setup):
+    first, _ = setup.products
+    operation = setup.create([5, 1])
+    setup.move(operation, *PATH[:2], OperationStatus.CANCELED)
+
+    assert setup.stock(first) == (10, 0)
+    assert setup.db.query(Movement).filter(Movement.type == MovementType.OUTPUT).count() == 0
+
+def test_inbound_operation_adds_stock_on_completion(setup):
+    first, _ = setup.products
+    operation = setup.create([2, 0], type=OperationType.RETURN)
+
+    setup.move(operation, *PATH[:2])
+    assert setup.stock(first) == (10, 0)  # Entrada não reserva
+
+    setup.move(operation, *PATH[2:])
+    assert setup.stock(first) == (12, 0)
+    assert setup.db.query(Movement).filter(Movement.type == MovementType.INPUT).count() == 1
+
+def test_reservation_beyond_available_stock_is_rejected_atomically(setup):
+    first, second = setup.products
+    held = setup.create([8, 1])
+    setup.move(held, *PATH[:2])
+
+    operation = setup.create([2, 5])
+    # Outra reserva consumiu o disponível do primeiro produto depois da criação
+    setup.db.query(Product).filter(Product.id == first.id).update({"reserved_quantity": 9})
+    setup.db.commit()
+
+    setup.move(operation, PATH[0])
+    with pytest.raises(InsufficientStock) as exc:
+        setup.move(operation, PATH[1])
+
+    assert exc.value.product_ids == [first.id]
+    assert setup.stock(second) == (10, 1)  # Nenhuma reserva parcial
+    setup.db.refresh(operation)
+    assert operation.status == OperationStatus.AT_ORIGIN
+
+def test_products_are_updated_in_id_order(setup):
+    operation = setup.create([1, 1])
+    setup.move(operation, PATH[0])
+
+    ids = {product.id.hex: product.id for product in setup.products}
+    updated = []
+
+    def capture(conn, cursor, statement, params, *args):
+        if statement.startswith("UPDATE products"):
+            updated.extend(ids[param] for param in params if param in ids)
+
+    event.listen(setup.engine, "before_cursor_execute", capture)
+    setup.move(operation, PATH[1])
+
+    assert sorted(updated) == sorted(ids.values())
+    assert updated == sorted(updated, key=str)
+
+# -------------------- Alteração de status em lote --------------------
+def bulk(setup, operations, status, company_id=None):
+    user = setup.db.query(User).first()
+    updates = [SimpleNamespace(id=operation.id, status=status) for operation in operations]
+    return OperationService(setup.db).update_status_bulk(updates, user, company_id=company_id)
+
+def test_bulk_status_applies_valid_transitions_and_reports_the_rest(setup):
+    ready = [setup.create([1, 1]) for _ in range(3)]
+    setup.move(ready[0], PATH[0])
+    setup.move(ready[1], PATH[0])
+    fresh = ready[2]  # Ainda CREATED: CREATED -> LOADED é inválido
+
+    results = bulk(setup, ready, OperationStatus.LOADED)
+
+    assert [result["success"] for result in results] == [True, True, False]
+    assert "Transição inválida" in results[2]["error"]
+    assert results[0]["previous_status"] == OperationStatus.AT_ORIGIN
+    assert setup.stock(setup.products[0]) == (10, 2)
+
+    changes = setup.db.query(Movement).filter(
+        Movement.type == MovementType.STATUS_CHANGED,
+        Movement.new_status == OperationStatus.LOADED,
+    ).count()
+    assert changes == 2
+    setup.db.refresh(fresh)
+    assert fresh.status == OperationStatus.CREATED
+
+def test_bulk_status_skips_operations_without_stock(setup):
+    first, _ = setup.products
+    greedy = setup.create([6, 0])
+    modest = setup.create([4, 0])
+    other = setup.create([0, 2])
+    setup.db.query(Product).filter(Product.id == first.id).update({"quantity": 7})
+    setup.db.commit()
+    operations = [greedy, modest, other]
+    bulk(setup, operations, OperationStatus.AT_ORIGIN)
+
+    results = bulk(setup, operations, OperationStatus.LOADED)
+
+    # As duas reservas do primeiro produto juntas não cabem: ambas falham, o resto segue
+    assert [result["success"] for result in results] == [False, False, True]
+    assert results[0]["error"].startswith("Estoque insuficiente")
+    assert setup.stock(first) == (7, 0)
+    assert setup.stock(setup.products[1]) == (10, 2)
+
+def test_bulk_status_is_tenant_scoped(setup):
+    operation = setup.create([1, 1])
+    results = bulk(setup, [operation], OperationStatus.AT_ORIGIN, company_id=setup.products[0].id)
+
+    assert results[0]["error"] == "Operação não encontrada ou em uso"
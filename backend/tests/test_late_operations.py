@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Company, Operation, Movement, LateOperationCount
+from app.models.enum import MovementType, OperationStatus as S, OperationType
+from app.services.late_operation_service import LateOperationService
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def add_company(db, name):
+    company = Company(name=name, cnpj=uuid.uuid4().hex[:14], token=f"tok-{name}")
+    db.add(company)
+    db.commit()
+    return company
+
+def add_operation(db, company, due, status=S.CREATED):
+    operation = Operation(
+        operation_number=uuid.uuid4().hex[:8], company_id=company.id, status=status,
+        type=OperationType.DELIVERY, expected_delivery_date=due, updated_at=NOW - timedelta(days=5),
+    )
+    db.add(operation)
+    db.commit()
+    return operation
+
+# -------------------- Sweeper --------------------
+def test_sweep_flags_only_open_overdue_operations(db):
+    company = add_company(db, "a")
+    late = add_operation(db, company, NOW - timedelta(hours=1))
+    add_operation(db, company, NOW + timedelta(hours=1))
+    add_operation(db, company, NOW - timedelta(hours=1), status=S.DELIVERED)
+    add_operation(db, company, NOW - timedelta(hours=1), status=S.CANCELED)
+    add_operation(db, company, None)
+
+    assert LateOperationService(db).sweep(NOW) == 1
+
+    db.refresh(late)
+    assert late.late_flagged_at is not None
+    # updated_at é a data de conclusão dos KPIs; o sweeper não a altera
+    assert late.updated_at.replace(tzinfo=timezone.utc) == NOW - timedelta(days=5)
+
+    delays = db.query(Movement).filter_by(type=MovementType.DELAY_REPORTED).all()
+    assert [movement.entity_id for movement in delays] == [late.id]
+
+def test_sweep_reports_each_operation_once(db):
+    company = add_company(db, "a")
+    add_operation(db, company, NOW - timedelta(hours=1))
+    service = LateOperationService(db)
+
+    assert service.sweep(NOW) == 1
+    assert service.sweep(NOW + timedelta(minutes=1)) == 0
+    assert db.query(Movement).filter_by(type=MovementType.DELAY_REPORTED).count() == 1
+
+def test_sweep_materializes_late_count_per_company(db):
+    first, second = add_company(db, "a"), add_company(db, "b")
+    add_operation(db, first, NOW - timedelta(hours=1))
+    add_operation(db, first, NOW - timedelta(hours=2))
+    finished = add_operation(db, second, NOW - timedelta(hours=1))
+    service = LateOperationService(db)
+    service.sweep(NOW)
+
+    assert service.count(first.id) == 2
+    assert service.count(second.id) == 1
+    assert service.count() == 3
+
+    # Concluída depois de atrasar: sai da contagem no ciclo seguinte
+    finished.status = S.COMPLETED
+    db.commit()
+    service.sweep(NOW + timedelta(minutes=1))
+    assert service.count(second.id) == 0
+    assert db.query(LateOperationCount).count() == 1
+
+def test_partial_indexes_exist(engine):
+    indexes = {index["name"] for index in inspect(engine).get_indexes("operations")}
+    assert {"ix_operations_open_expected_delivery", "ix_operations_open_late_company"} <= indexes
@@ -0,0 +1,149 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.websockets import WebSocketDisconnect
+
+from app.core import events
+from app.core.events import InMemoryEventBroker, get_event_broker
+from app.core.security import create_access_token
+from app.main import app
+from app.models import Base, Company, User, Product, Operation
+from app.models.enum import UserRole, OperationStatus as S, OperationType
+from app.services.live_kpi_service import CompanyKpiChannel, LiveKpiHub, compute_kpis
+
+COMPANY = str(uuid.uuid4())
+BASE = {"pending": 5, "completed_today": 1, "late": 0, "total_users": 3, "active_users": 2, "low_stock_items": 4}
+
+def status_event(previous, status):
+    return {"type": "operation.status_changed", "company_id": COMPANY,
+            "previous_status": previous.value, "status": status.value}
+
+# -------------------- Aplicação de eventos --------------------
+def test_operation_events_update_counters_incrementally():
+    channel = CompanyKpiChannel(COMPANY)
+    channel.values = dict(BASE)
+    changes = {}
+
+    assert channel.apply({"type": "operation.created", "company_id": COMPANY}, changes) == set()
+    assert channel.apply(status_event(S.UNLOADED, S.DELIVERED), changes) == {"stock"}
+    assert channel.apply(status_event(S.CREATED, S.LOADED), changes) == set()
+    assert channel.apply({"type": "operation.late_count", "company_id": COMPANY, "late": 2}, changes) == set()
+
+    assert changes == {"pending": 5, "completed_today": 2, "late": 2}
+
+def test_user_and_product_events_mark_groups_for_recompute():
+    channel = CompanyKpiChannel(COMPANY)
+    channel.values = dict(BASE)
+
+    assert channel.apply({"type": "user.changed", "company_id": COMPANY}, {}) == {"users"}
+    assert channel.apply({"type": "product.changed", "company_id": COMPANY}, {}) == {"stock"}
+    # Antes do snapshot ser confiável, operações também são recalculadas (sem incremento)
+    changes = {}
+    assert channel.apply({"type": "operation.created", "company_id": COMPANY}, changes, exact=False) == {"operations"}
+    assert changes == {}
+
+def test_publish_sends_only_changed_values():
+    channel = CompanyKpiChannel(COMPANY)
+    channel.values = dict(BASE)
+
+    channel.publish({"pending": 5, "late": 1})
+    channel.publish({"pending": 5})
+
+    assert channel.version == 1
+    assert channel.values["late"] == 1
+
+# -------------------- Hub: um estado por empresa --------------------
+@pytest.fixture
+def broker(monkeypatch):
+    broker = InMemoryEventBroker()
+    monkeypatch.setattr(events, "get_event_broker", lambda: broker)
+    monkeypatch.setattr("app.services.live_kpi_service.get_event_broker", lambda: broker)
+    return broker
+
+def test_viewers_of_a_company_share_one_computation(broker):
+    calls = []
+
+    def compute(company_id, groups):
+        calls.append(set(groups))
+        return {key: value for key, value in BASE.items()} if len(calls) == 1 else {"total_users": 4}
+
+    async def scenario():
+        hub = LiveKpiHub(compute=compute, debounce=0.01)
+        channel, first = await hub.join(COMPANY)
+        same, second = await hub.join(COMPANY)
+        assert same is channel
+        assert len(broker._subscriptions) == 1
+
+        # Primeira rajada após o snapshot: recálculo (o snapshot pode já ter o evento)
+        broker.publish({"type": "user.changed", "company_id": COMPANY})
+        assert await first.next(1) == ({"total_users": 4}, 1)
+        assert await second.next(1) == ({"total_users": 4}, 1)
+
+        broker.publish({"type": "operation.created", "company_id": COMPANY})
+        broker.publish({"type": "operation.created", "company_id": COMPANY})
+        assert await first.next(1) == ({"pending": 7}, 2)
+
+        await hub.leave(channel, first)
+        await hub.leave(channel, second)
+        assert hub.channels == {}
+        assert broker._subscriptions == set()
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+# -------------------- Cálculo --------------------
+def test_compute_kpis_matches_dashboard_rules():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    company = Company(name="Empresa", cnpj="12345678000199", token="tok-live", stock_alert_limit=5)
+    db.add(company)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        User(name="A", email="a@live.com", password_hash="x", role=UserRole.ADMIN, company_id=company.id),
+        User(name="B", email="b@live.com", password_hash="x", role=UserRole.USER, company_id=company.id, is_active=False),
+        Product(name="P1", sku="P1", price=1, quantity=2, company_id=company.id),
+        Product(name="P2", sku="P2", price=1, quantity=50, company_id=company.id),
+        Operation(operation_number="1", company_id=company.id, status=S.CREATED, type=OperationType.DELIVERY, updated_at=now),
+        Operation(operation_number="2", company_id=company.id, status=S.DELIVERED, type=OperationType.DELIVERY, updated_at=now),
+    ])
+    db.commit()
+
+    assert compute_kpis(db, company.id) == {
+        "pending": 1, "completed_today": 1, "late": 0,
+        "total_users": 2, "active_users": 1, "low_stock_items": 1,
+    }
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+# -------------------- WebSocket --------------------
+def test_websocket_sends_snapshot_then_deltas(monkeypatch):
+    snapshots = iter([dict(BASE), {**BASE, "pending": 6}])
+    hub = LiveKpiHub(compute=lambda company_id, groups: next(snapshots), debounce=0.01)
+    monkeypatch.setattr("app.routes.dashboard.get_live_kpi_hub", lambda: hub)
+    token = create_access_token(subject=uuid.uuid4(), role=UserRole.MANAGER.value, company_id=uuid.UUID(COMPANY))
+    broker = get_event_broker()
+
+    with TestClient(app).websocket_connect(f"/dashboard/live?token={token}") as websocket:
+        assert websocket.receive_json() == {"type": "snapshot", "version": 0, "kpis": BASE}
+
+        # Primeira rajada: recálculo; eventos de outra empresa não chegam ao canal
+        broker.publish({"type": "operation.late_count", "company_id": str(uuid.uuid4()), "late": 9})
+        broker.publish({"type": "operation.created", "company_id": COMPANY})
+        assert websocket.receive_json() == {"type": "delta", "version": 1, "changes": {"pending": 6}}
+
+        # Depois: incremental, sem consultar o banco
+        broker.publish(status_event(S.IN_TRANSIT, S.CANCELED))
+        assert websocket.receive_json() == {"type": "delta", "version": 2, "changes": {"pending": 5}}
+
+def test_websocket_rejects_invalid_token():
+    with pytest.raises(WebSocketDisconnect):
+        with TestClient(app).websocket_connect("/dashboard/live?token=invalido") as websocket:
+            websocket.receive_json()
@@ -0,0 +1,83 @@
+import importlib.util
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from app.core import migrations
+from app.core.migrations import (
+    DatabaseUnavailableError, MigrationStateError, check_migration_state, get_script_heads,
+)
+
+# -------------------- Banco temporário --------------------
+@pytest.fixture
+def engine(tmp_path):
+    migrations._verified.clear()
+    return create_engine(f"sqlite:///{tmp_path / 'migrations.db'}", future=True)
+
+def stamp(engine, revision):
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        conn.execute(text("DELETE FROM alembic_version"))
+        conn.execute(text("INSERT INTO alembic_version (version_num) VALUES (:rev)"), {"rev": revision})
+
+# -------------------- Testes --------------------
+def test_script_has_single_head():
+    assert len(get_script_heads()) == 1
+
+def test_unmigrated_database_warns(engine):
+    assert check_migration_state(engine, mode="warn") is False
+
+def test_unmigrated_database_fails_in_strict_mode(engine):
+    with pytest.raises(MigrationStateError):
+        check_migration_state(engine, mode="strict")
+
+def test_outdated_database_fails_in_strict_mode(engine):
+    stamp(engine, "7395dace311a")
+    with pytest.raises(MigrationStateError):
+        check_migration_state(engine, mode="strict")
+
+def test_database_at_head_is_cached(engine, monkeypatch):
+    stamp(engine, get_script_heads()[0])
+    assert check_migration_state(engine, mode="strict") is True
+
+    # Segunda chamada não consulta o banco
+    def fail(_):
+        raise AssertionError("consultou o banco novamente")
+    monkeypatch.setattr(migrations, "get_database_heads", fail)
+    assert check_migration_state(engine, mode="strict") is True
+
+def test_unreachable_database_is_not_reported_as_drift(tmp_path, capsys):
+    engine = create_engine(f"sqlite:///{tmp_path / 'inexistente' / 'x.db'}")
+
+    with pytest.raises(DatabaseUnavailableError):
+        check_migration_state(engine, mode="strict")
+
+    assert check_migration_state(engine, mode="warn") is False
+    assert "fora da head" not in capsys.readouterr().out
+
+def test_check_never_creates_tables(engine):
+    check_migration_state(engine, mode="warn")
+    with engine.connect() as conn:
+        tables = conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'")).all()
+    assert tables == []
+
+def test_script_heads_match_alembic():
+    from alembic.script import ScriptDirectory
+    assert get_script_heads() == tuple(sorted(ScriptDirectory(migrations.ALEMBIC_DIR).get_heads()))
+
+def test_initial_migration_creates_the_base_schema(engine):
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory(migrations.ALEMBIC_DIR)
+    (base,) = script.get_bases()
+    spec = importlib.util.spec_from_file_location("initial", script.get_revision(base).path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            module.upgrade()
+        tables = set(inspect(conn).get_table_names())
+
+    assert {"companies", "users", "partners", "products", "operations", "operation_items", "movements"} <= tables
+    assert script.get_revision("7395dace311a").down_revision == base
@@ -0,0 +1,179 @@
+import uuid
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Company, User, Partner, Operation, Product
+from app.models.movement import Movement
+from app.models.operation_item import OperationItem
+from app.models.enum import UserRole, OperationStatus, OperationType, MovementType
+from app.schemas.operation import OperationCreateSchema
+from app.services.operation_service import OperationService
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def setup():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    company = Company(name="Empresa", cnpj="12345678000199", token="tok-bulk")
+    other = Company(name="Outra", cnpj="98765432000199", token="tok-bulk-2")
+    session.add_all([company, other])
+    session.flush()
+
+    user = User(name="Admin", email="admin@bulk.com", password_hash="x", role=UserRole.ADMIN, company_id=company.id)
+    session.add(user)
+    session.flush()
+
+    partner = Partner(company_id=company.id, name="Parceiro", document="123")
+    foreign_partner = Partner(company_id=other.id, name="Alheio", document="456")
+    product = Product(name="Produto", sku="SKU-1", price=10, quantity=5, company_id=company.id,
+                      created_by=user.id, updated_by=user.id)
+    session.add_all([partner, foreign_partner, product])
+    session.commit()
+
+    yield SimpleNamespace(
+        db=session, engine=engine, user=user, partner=partner,
+        foreign_partner=foreign_partner, product=product,
+    )
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def payload(partner_id, product_id, quantity=2, unit_price=5.0):
+    return OperationCreateSchema(
+        reference_code="REF",
+        origin="A",
+        destination="B",
+        type=OperationType.DELIVERY,
+        partner_id=partner_id,
+        items=[{"product_id": product_id, "quantity": quantity, "unit_price": unit_price}],
+    )
+
+# -------------------- Criação em lote --------------------
+def test_bulk_creates_operations_items_and_movements(setup):
+    batch = [payload(setup.partner.id, setup.product.id) for _ in range(3)]
+
+    results = OperationService(setup.db).create_bulk(batch, setup.user)
+
+    assert all(result["success"] for result in results)
+    assert [result["operation_number"] for result in results] == ["000001", "000002", "000003"]
+
+    operations = setup.db.query(Operation).all()
+    assert len(operations) == 3
+    assert {operation.status for operation in operations} == {OperationStatus.CREATED}
+    assert float(operations[0].total_value) == 10.0
+    assert setup.db.query(OperationItem).count() == 3
+    movements = setup.db.query(Movement).all()
+    assert {movement.entity_id for movement in movements} == {operation.id for operation in operations}
+    assert {movement.type for movement in movements} == {MovementType.OPERATION_CREATED}
+
+def test_bulk_reports_invalid_rows_and_creates_the_rest(setup):
+    batch = [
+        payload(setup.partner.id, setup.product.id),
+        payload(setup.foreign_partner.id, setup.product.id),  # Parceiro de outra empresa
+        payload(setup.partner.id, setup.product.id, quantity=0),
+        payload(uuid.uuid4(), setup.product.id),
+    ]
+
+    results = OperationService(setup.db).create_bulk(batch, setup.user)
+
+    assert [result["success"] for result in results] == [True, False, False, False]
+    assert results[1]["errors"] == ["Parceiro não encontrado"]
+    assert "quantidade" in results[2]["errors"][0]
+    assert setup.db.query(Operation).count() == 1
+
+def test_bulk_continues_existing_numbering(setup):
+    service = OperationService(setup.db)
+    service.create_bulk([payload(setup.partner.id, setup.product.id)], setup.user)
+    results = service.create_bulk([payload(setup.partner.id, setup.product.id)] * 2, setup.user)
+
+    assert [result["operation_number"] for result in results] == ["000002", "000003"]
+
+def test_bulk_uses_one_insert_per_table(setup):
+    statements = []
+    event.listen(setup.engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    batch = [payload(setup.partner.id, setup.product.id) for _ in range(20)]
+    OperationService(setup.db).create_bulk(batch, setup.user)
+
+    # Três INSERTs de dados + os upserts do contador de números e do contador de versão (ETag da listagem)
+    inserts = [statement for statement in statements if statement.startswith("INSERT")]
+    assert len(inserts) == 5
+    assert sum("operation_counters" in statement for statement in inserts) == 1
+    assert sum("resource_versions" in statement for statement in inserts) == 1
+
+def test_sessions_reserve_disjoint_number_blocks(tmp_path):
+    # Banco em arquivo: cada sessão tem a própria conexão/transação
+    engine = create_engine(f"sqlite:///{tmp_path / 'numbers.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        company = Company(name="Empresa", cnpj="12345678000199", token="tok-numbers")
+        db.add(company)
+        db.commit()
+        company_id = company.id
+
+    first, second = Session(), Session()
+    try:
+        # Nenhuma operação é gravada: só a reserva impede a sobreposição
+        first_block = OperationService(first)._next_operation_numbers(company_id, 3)
+        first.commit()
+        second_block = OperationService(second)._next_operation_numbers(company_id, 2)
+        second.commit()
+    finally:
+        first.close()
+        second.close()
+        engine.dispose()
+
+    assert first_block == ["000001", "000002", "000003"]
+    assert second_block == ["000004", "000005"]
+
+# -------------------- Validação dos itens (produtos) --------------------
+def test_items_are_validated_with_a_single_product_query(setup):
+    inactive = Product(name="Inativo", sku="SKU-2", price=1, quantity=5, is_active=False,
+                       company_id=setup.product.company_id, created_by=setup.user.id, updated_by=setup.user.id)
+    setup.db.add(inactive)
+    setup.db.commit()
+
+    partner_id, product_id, company_id = setup.partner.id, setup.product.id, setup.user.company_id
+    batch = [
+        payload(partner_id, product_id, unit_price=None),
+        payload(partner_id, inactive.id),
+        payload(partner_id, uuid.uuid4()),
+        payload(partner_id, product_id, quantity=6),
+    ]
+
+    statements = []
+    event.listen(setup.engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    errors = OperationService(setup.db).validate_items(batch, company_id)
+
+    assert errors[0] == [] and batch[0].items[0].unit_price == 10.0  # Preço padrão do produto
+    assert errors[1] == ["Item 0: produto inativo"]
+    assert errors[2] == ["Item 0: produto não encontrado"]
+    assert errors[3][0].startswith("Estoque insuficiente")
+    assert len([statement for statement in statements if statement.startswith("SELECT")]) == 1
+
+def test_products_of_other_companies_are_rejected(setup):
+    foreign = Product(name="Alheio", sku="SKU-3", price=1, quantity=5,
+                      company_id=setup.foreign_partner.company_id)
+    setup.db.add(foreign)
+    setup.db.commit()
+
+    results = OperationService(setup.db).create_bulk([payload(setup.partner.id, foreign.id)], setup.user)
+
+    assert results[0]["errors"] == ["Item 0: produto não encontrado"]
+
+def test_single_create_uses_the_same_validation(setup):
+    service = OperationService(setup.db)
+    with pytest.raises(ValueError):
+        service.create(payload(setup.partner.id, uuid.uuid4()), setup.user)
+
+    operation = service.create(payload(setup.partner.id, setup.product.id, unit_price=None), setup.user)
+    assert float(operation.total_value) == 20.0
+    assert setup.db.query(Movement).filter(Movement.entity_id == operation.id).count() == 1
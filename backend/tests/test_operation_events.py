@@ -0,0 +1,168 @@
+import asyncio
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import events
+from app.core.events import InMemoryEventBroker, Subscription, create_broker
+from app.domain.operation_validator import InvalidOperationTransition
+from app.models import Base, Company, User, Partner, Operation
+from app.models.enum import UserRole, OperationStatus, OperationType
+from app.routes.operations import operation_event_stream
+from app.services import operation_service
+from app.services.operation_service import OperationService
+
+COMPANY = str(uuid.uuid4())
+OTHER = str(uuid.uuid4())
+
+def event(company_id, status="LOADED"):
+    return {"type": "operation.status_changed", "company_id": company_id, "status": status}
+
+# -------------------- Broker em memória --------------------
+def test_broker_filters_by_company_and_accepts_other_threads():
+    async def scenario():
+        broker = InMemoryEventBroker()
+        own = broker.subscribe(COMPANY)
+        everything = broker.subscribe()
+
+        publisher = threading.Thread(target=lambda: [broker.publish(event(OTHER)), broker.publish(event(COMPANY))])
+        publisher.start()
+        publisher.join()
+
+        assert (await own.get(1))["company_id"] == COMPANY
+        assert await own.get(0.05) is None
+        assert [(await everything.get(1))["company_id"] for _ in range(2)] == [OTHER, COMPANY]
+
+        broker.unsubscribe(own)
+        broker.publish(event(COMPANY))
+        assert await own.get(0.05) is None
+
+    asyncio.run(scenario())
+
+def test_full_queue_marks_subscription_as_lagged():
+    async def scenario():
+        broker = InMemoryEventBroker()
+        subscription = Subscription(COMPANY, max_queue=2)
+        broker._subscriptions.add(subscription)
+
+        for _ in range(3):
+            broker.publish(event(COMPANY))
+        await asyncio.sleep(0)
+
+        assert subscription.lagged is True
+        assert await subscription.get(1) is not None
+
+    asyncio.run(scenario())
+
+def test_lost_events_mark_every_subscription_as_lagged():
+    # Usado pelo listener do redis ao reconectar (eventos da queda foram perdidos)
+    async def scenario():
+        broker = InMemoryEventBroker()
+        subscriptions = [broker.subscribe(COMPANY), broker.subscribe()]
+
+        threading.Thread(target=broker._mark_all_lagged).start()
+        await asyncio.sleep(0.05)
+
+        assert all(subscription.lagged for subscription in subscriptions)
+
+    asyncio.run(scenario())
+
+def test_create_broker_rejects_unknown_backend():
+    assert isinstance(create_broker("memory"), InMemoryEventBroker)
+    with pytest.raises(ValueError):
+        create_broker("kafka")
+
+# -------------------- Stream SSE --------------------
+class FakeRequest:
+    '''Desconecta depois de `polls` verificações.'''
+
+    def __init__(self, polls):
+        self.polls = polls
+
+    async def is_disconnected(self):
+        self.polls -= 1
+        return self.polls < 0
+
+def test_stream_formats_events_heartbeats_and_unsubscribes(monkeypatch):
+    async def scenario():
+        broker = InMemoryEventBroker()
+        monkeypatch.setattr(events, "get_event_broker", lambda: broker)
+        monkeypatch.setattr("app.routes.operations.get_event_broker", lambda: broker)
+        stream = operation_event_stream(FakeRequest(2), COMPANY, heartbeat=0.01)
+        # Nada é assinado antes de o corpo começar a ser enviado
+        assert not broker._subscriptions
+
+        chunks = [await anext(stream)]
+        (subscription,) = broker._subscriptions
+        broker.publish(event(COMPANY))
+        chunks += [chunk async for chunk in stream]
+
+        assert chunks[0] == "retry: 5000\n\n"
+        name, data = chunks[1].strip().split("\n")
+        assert name == "event: operation.status_changed"
+        assert json.loads(data.removeprefix("data: "))["company_id"] == COMPANY
+        assert chunks[2] == ": ping\n\n"
+        assert subscription not in broker._subscriptions
+
+    asyncio.run(scenario())
+
+# -------------------- Publicação pelo serviço --------------------
+@pytest.fixture
+def setup(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    company = Company(name="Empresa", cnpj="12345678000199", token="tok-events")
+    session.add(company)
+    session.flush()
+    user = User(name="Admin", email="admin@events.com", password_hash="x", role=UserRole.ADMIN, company_id=company.id)
+    partner = Partner(company_id=company.id, name="Parceiro", document="123")
+    session.add_all([user, partner])
+    session.commit()
+
+    published = []
+    monkeypatch.setattr(operation_service, "publish_event", published.append)
+
+    yield SimpleNamespace(db=session, company=company, user=user, partner=partner, published=published)
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def test_status_changes_are_published_after_commit(setup):
+    operation = Operation(
+        operation_number="000001", company_id=setup.company.id, partner_id=setup.partner.id,
+        status=OperationStatus.CREATED, type=OperationType.DELIVERY, updated_at=datetime.now(timezone.utc),
+    )
+    setup.db.add(operation)
+    setup.db.commit()
+
+    OperationService(setup.db).update_status(operation, OperationStatus.CANCELED, setup.user)
+
+    assert setup.published == [{
+        "type": "operation.status_changed",
+        "company_id": str(setup.company.id),
+        "operation_id": str(operation.id),
+        "operation_number": "000001",
+        "status": "CANCELED",
+        "previous_status": "CREATED",
+        "at": setup.published[0]["at"],
+    }]
+
+def test_invalid_transition_publishes_nothing(setup):
+    operation = Operation(
+        operation_number="000001", company_id=setup.company.id,
+        status=OperationStatus.CANCELED, type=OperationType.DELIVERY, updated_at=datetime.now(timezone.utc),
+    )
+    setup.db.add(operation)
+    setup.db.commit()
+
+    with pytest.raises(InvalidOperationTransition):
+        OperationService(setup.db).update_status(operation, OperationStatus.LOADED, setup.user)
+    assert setup.published == []
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import uuid
+import pytest
+
+from app.domain.operation_projection import OperationProjection, project_operations
+from app.domain.operation_state_machine import (
+    ALLOWED_TRANSITIONS, STATES, TERMINAL_STATES, can_transition, is_reachable, shortest_path
+)
+from app.domain.operation_validator import InvalidOperationTransition, validate_status_transition
+from app.models.enum import MovementType, OperationStatus as S
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# -------------------- Tabelas compiladas --------------------
+def test_every_status_is_part_of_the_machine():
+    assert set(ALLOWED_TRANSITIONS) == set(S)
+    assert TERMINAL_STATES == {S.COMPLETED, S.DELIVERED, S.CANCELED}
+
+@pytest.mark.parametrize("source", STATES)
+@pytest.mark.parametrize("target", STATES)
+def test_matrix_matches_transition_dict(source, target):
+    assert can_transition(source, target) == (target in ALLOWED_TRANSITIONS[source])
+
+def test_reachability_and_shortest_path():
+    assert is_reachable(S.CREATED, S.DELIVERED)
+    assert not is_reachable(S.COMPLETED, S.CREATED)
+    assert is_reachable(S.IN_TRANSIT, S.IN_TRANSIT)  # Via AT_HUB
+    assert shortest_path(S.CREATED, S.DELIVERED) == [S.AT_ORIGIN, S.LOADED, S.IN_TRANSIT, S.UNLOADED, S.DELIVERED]
+    assert shortest_path(S.AT_HUB, S.AT_HUB) == []
+    assert shortest_path(S.CANCELED, S.CREATED) is None
+
+def test_validator_uses_the_matrix():
+    validate_status_transition(S.UNLOADED, S.DELIVERED)
+    with pytest.raises(InvalidOperationTransition):
+        validate_status_transition(S.DELIVERED, S.COMPLETED)
+
+# -------------------- Projeção --------------------
+def event(entity_id, minutes, new_status=None, previous_status=None):
+    return SimpleNamespace(
+        entity_id=entity_id,
+        type=MovementType.STATUS_CHANGED if new_status else MovementType.OPERATION_CREATED,
+        previous_status=previous_status,
+        new_status=new_status,
+        created_at=T0 + timedelta(minutes=minutes),
+    )
+
+def test_projection_rebuilds_status_and_stage_times():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    movements = [
+        event(first, 0),
+        event(second, 1),
+        event(first, 10, S.AT_ORIGIN, S.CREATED),
+        event(first, 30, S.LOADED, S.AT_ORIGIN),
+        event(first, 40, S.IN_TRANSIT, S.LOADED),
+        event(first, 50, S.AT_HUB, S.IN_TRANSIT),
+        event(first, 70, S.IN_TRANSIT, S.AT_HUB),
+        event(first, 75, S.AT_HUB, S.IN_TRANSIT),
+        event(first, 80, S.UNLOADED, S.AT_HUB),
+        event(second, 5, S.CANCELED, S.CREATED),
+    ]
+
+    projections = project_operations(movements)
+    projection = projections[first]
+
+    assert projection.status == S.UNLOADED
+    assert projections[second].status == S.CANCELED
+    assert projection.entered_at[S.AT_HUB] == T0 + timedelta(minutes=50)
+    durations = projection.stage_durations()
+    assert durations[S.CREATED] == 600
+    assert durations[S.AT_HUB] == (20 + 5) * 60  # Duas passagens pelo hub
+    assert S.UNLOADED not in durations  # Etapa atual sem fim informado
+    assert projection.stage_durations(until=T0 + timedelta(minutes=90))[S.UNLOADED] == 600
+    assert projection.anomalies == []
+
+def test_projection_flags_inconsistent_events():
+    operation_id = uuid.uuid4()
+    projection = OperationProjection(operation_id)
+    for movement in (
+        event(operation_id, 0),
+        event(operation_id, 5, S.LOADED, S.CREATED),      # Pulou AT_ORIGIN
+        event(operation_id, 9, S.IN_TRANSIT, S.AT_HUB),  # Anterior não bate
+    ):
+        projection.apply(movement)
+
+    assert projection.status == S.IN_TRANSIT
+    assert len(projection.anomalies) == 2
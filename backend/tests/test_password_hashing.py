@@ -0,0 +1,48 @@
+import pytest
+
+from app.core import security
+from app.core.security import build_pwd_context, verify_and_update_password
+
+# Custos baixos para os testes rodarem rápido
+FAST_BCRYPT = 4
+
+# -------------------- Custo configurável --------------------
+def test_bcrypt_rounds_are_configurable():
+    hashed = build_pwd_context(["bcrypt"], bcrypt_rounds=FAST_BCRYPT).hash("segredo")
+    assert hashed.startswith("$2b$04$")
+
+def test_hash_with_other_rounds_needs_update():
+    old_hash = build_pwd_context(["bcrypt"], bcrypt_rounds=FAST_BCRYPT).hash("segredo")
+    context = build_pwd_context(["bcrypt"], bcrypt_rounds=FAST_BCRYPT + 1)
+
+    assert context.needs_update(old_hash)
+    assert not context.needs_update(context.hash("segredo"))
+
+# -------------------- Migração de esquema --------------------
+def test_bcrypt_hash_migrates_to_argon2id():
+    pytest.importorskip("argon2")
+
+    old_hash = build_pwd_context(["bcrypt"], bcrypt_rounds=FAST_BCRYPT).hash("segredo")
+    context = build_pwd_context(
+        ["argon2", "bcrypt"],
+        bcrypt_rounds=FAST_BCRYPT,
+        argon2_time_cost=1,
+        argon2_memory_cost=1024,
+    )
+
+    valid, new_hash = context.verify_and_update("segredo", old_hash)
+    assert valid
+    assert new_hash.startswith("$argon2id$")
+    assert context.verify_and_update("segredo", new_hash) == (True, None)
+
+# -------------------- Rehash no login --------------------
+def test_verify_and_update_password_returns_new_hash(monkeypatch):
+    old_hash = build_pwd_context(["bcrypt"], bcrypt_rounds=FAST_BCRYPT).hash("segredo")
+    context = build_pwd_context(["bcrypt"], bcrypt_rounds=FAST_BCRYPT + 1)
+    monkeypatch.setattr(security, "get_pwd_context", lambda: context)
+
+    valid, new_hash = verify_and_update_password("segredo", old_hash)
+    assert valid and new_hash.startswith("$2b$05$")
+
+    assert verify_and_update_password("errada", old_hash) == (False, None)
+    assert verify_and_update_password("segredo", new_hash) == (True, None)
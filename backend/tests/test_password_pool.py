@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import pytest
+
+from app.core.password_pool import PasswordHashPool, PasswordPoolSaturated
+
+# -------------------- Helper: função que bloqueia até ser liberada --------------------
+def blocking_job(gate: threading.Event):
+    gate.wait(timeout=5)
+    return "ok"
+
+# -------------------- Testes do pool --------------------
+def test_run_returns_result_and_records_metrics():
+    pool = PasswordHashPool(workers=1, max_queue=0)
+
+    assert pool.run(lambda a, b: a + b, 2, 3) == 5
+
+    snapshot = pool.snapshot()
+    assert snapshot["submitted"] == 1
+    assert snapshot["completed"] == 1
+    assert snapshot["in_flight"] == 0
+    pool.shutdown()
+
+def test_run_async_is_awaitable():
+    pool = PasswordHashPool(workers=1, max_queue=0)
+
+    assert asyncio.run(pool.run_async(str.upper, "bcrypt")) == "BCRYPT"
+    pool.shutdown()
+
+def test_saturated_pool_rejects_new_work():
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    gate = threading.Event()
+
+    running = pool.submit(blocking_job, gate)
+    queued = pool.submit(blocking_job, gate)
+
+    with pytest.raises(PasswordPoolSaturated):
+        pool.submit(blocking_job, gate)
+
+    gate.set()
+    assert running.result() == "ok" and queued.result() == "ok"
+
+    snapshot = pool.snapshot()
+    assert snapshot["rejected"] == 1
+    assert snapshot["completed"] == 2
+    # O pedido enfileirado esperou o primeiro terminar
+    assert snapshot["wait_ms_max"] > 0
+
+    # Com a fila livre, o pool volta a aceitar
+    assert pool.run(len, "abc") == 3
+    pool.shutdown()
+
+def test_exceptions_release_the_slot():
+    pool = PasswordHashPool(workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        pool.run(fail)
+
+    assert pool.in_flight == 0
+    assert pool.run(len, "ok") == 2
+    pool.shutdown()
+
+# -------------------- Integração com security e com o app --------------------
+def test_security_helpers_use_the_pool():
+    from app.core.security import get_password_pool, hash_password, verify_password, verify_password_async
+
+    hashed = hash_password("segredo")
+    assert verify_password("segredo", hashed)
+    assert asyncio.run(verify_password_async("outra", hashed)) is False
+    assert get_password_pool().snapshot()["completed"] >= 3
+
+def test_saturation_maps_to_429():
+    from app.main import password_pool_saturated_handler
+
+    response = asyncio.run(password_pool_saturated_handler(None, PasswordPoolSaturated()))
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
@@ -0,0 +1,167 @@
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+
+from app.core.permissions import (
+    PERMISSION_BITS, ROLE_MASKS, Permission, has_permission, permission_mask, role_mask
+)
+from app.main import app
+from app.models.enum import UserRole
+
+SA, AD, MG, US = UserRole.SYSTEM_ADMIN, UserRole.ADMIN, UserRole.MANAGER, UserRole.USER
+ANY = {SA, AD, MG, US}  # Rota sem guard de permissão (pública ou só autenticada)
+
+# -------------------- Matriz esperada: rota -> papéis autorizados --------------------
+EXPECTED = {
+    "GET /auth/me": ANY,
+    "POST /auth/login": ANY,
+    "POST /auth/register": {SA, AD},
+    "POST /auth/forgot-password": ANY,
+    "POST /auth/reset-password": ANY,
+    "POST /auth/logout": ANY,
+
+    "GET /products/": ANY,
+    "GET /products/{product_id}": ANY,
+    "POST /products/": ANY,
+    "POST /products/import": ANY,
+    "PUT /products/{product_id}": ANY,
+    "PATCH /products/{product_id}/toggle": {SA, AD, MG},
+    "DELETE /products/{product_id}": ANY,
+
+    "GET /users": {SA, AD, MG},
+    "GET /users/me": ANY,
+    "GET /users/{user_id}": {SA, AD, MG},
+    "POST /users/auto-create": ANY,
+    "POST /users/create-user": {SA, AD},
+    "PUT /users/update-user/{user_id}": {SA, AD, MG},
+    "DELETE /users/delete-user/{user_id}": {SA},
+    "PATCH /users/toggle-user/{user_id}": {SA, AD},
+    "PUT /users/me/profile": ANY,
+    "GET /users/{user_id}/avatar": ANY,
+    "PUT /users/me/change-password": ANY,
+    "PUT /users/me/company": {SA, AD, MG},
+    "GET /users/active/last-5-min": {SA, AD},
+
+    "POST /companies/": {SA},
+    "GET /companies/me": {SA, AD, MG},
+    "GET /companies/me/users": {SA, AD, MG},
+    "GET /companies/list": {SA},
+    "GET /companies/stats": {SA},
+    "GET /companies/{company_id}": {SA},
+    "GET /companies/cnpj/{company_cnpj}": ANY,
+    "PUT /companies/me": {SA, AD},
+    "PUT /companies/{company_id}": {SA},
+    "PATCH /companies/toggle-company/{company_id}": {SA},
+    "DELETE /companies/{company_id}": {SA},
+
+    "GET /system-admins/audit-logs": {SA},
+    "GET /system-admins/stats": {SA},
+    "POST /system-admins": {SA},
+    "GET /system-admins/settings": {SA},
+    "PUT /system-admins/settings": {SA},
+
+    "GET /operations/{entity_id}/movements": ANY,
+    "POST /operations/{entity_id}/movements": ANY,
+    "POST /operations/": ANY,
+    "POST /operations/bulk": ANY,
+    "GET /operations/": ANY,
+    "GET /operations/kpis": ANY,
+    "GET /operations/events": ANY,
+    "GET /operations/{operation_id}": ANY,
+    "PATCH /operations/{operation_id}/status": ANY,
+    "PATCH /operations/status:bulk": ANY,
+
+    "GET /dashboard/admin-stats": ANY,
+
+    "GET /partners/": ANY,
+    "POST /partners/": ANY,
+    "GET /partners/{partner_id}": ANY,
+    "PUT /partners/{partner_id}": ANY,
+    "PATCH /partners/{partner_id}/toggle-active": ANY,
+    "DELETE /partners/{partner_id}": ANY,
+    "GET /partners/stats/count": ANY,
+
+    "GET /analytics/stages": {SA, AD, MG},
+    "POST /analytics/stages/refresh": {SA},
+
+    "GET /{full_path:path}": ANY,
+}
+
+
+def _routes():
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            for method in sorted(route.methods):
+                yield f"{method} {route.path}", route
+
+
+def _permission_checker(dependant):
+    '''Procura, na árvore de dependências, o guard criado por require_permission.'''
+    for dependency in dependant.dependencies:
+        if hasattr(dependency.call, "permissions"):
+            return dependency.call
+        checker = _permission_checker(dependency)
+        if checker is not None:
+            return checker
+    return None
+
+
+class _DbStub:
+    def add(self, obj): pass
+    def commit(self): pass
+    def refresh(self, obj): pass
+
+
+ROUTES = dict(_routes())
+
+# -------------------- Cobertura da matriz --------------------
+def test_every_route_is_in_the_expected_matrix():
+    assert set(ROUTES) == set(EXPECTED)
+
+# -------------------- Rota x papel --------------------
+@pytest.mark.parametrize("role", list(UserRole), ids=lambda role: role.value)
+@pytest.mark.parametrize("key", sorted(EXPECTED))
+def test_route_role_matrix(key, role):
+    checker = _permission_checker(ROUTES[key].dependant)
+    if checker is None:
+        assert EXPECTED[key] == ANY
+        return
+
+    user = SimpleNamespace(role=role.value, last_active_at=None)
+    if role in EXPECTED[key]:
+        assert checker(current_user=user, db=_DbStub()) is user
+        assert user.last_active_at is not None
+    else:
+        with pytest.raises(HTTPException) as exc:
+            checker(current_user=user, db=_DbStub())
+        assert exc.value.status_code == 403
+
+# -------------------- Compilação das máscaras --------------------
+def test_each_permission_has_its_own_bit():
+    bits = list(PERMISSION_BITS.values())
+    assert len(set(bits)) == len(Permission)
+    assert all(bit & (bit - 1) == 0 for bit in bits)
+
+def test_role_masks_follow_hierarchy():
+    assert ROLE_MASKS[SA.value] == permission_mask(*Permission)
+    assert ROLE_MASKS[US.value] == 0
+    # MANAGER ⊂ ADMIN ⊂ SYSTEM_ADMIN
+    assert ROLE_MASKS[MG.value] & ROLE_MASKS[AD.value] == ROLE_MASKS[MG.value]
+    assert ROLE_MASKS[AD.value] & ROLE_MASKS[SA.value] == ROLE_MASKS[AD.value]
+
+def test_has_permission_accepts_enum_or_string():
+    assert has_permission(SA, Permission.ALL_COMPANIES)
+    assert has_permission("MANAGER", Permission.PRODUCT_TOGGLE)
+    assert not has_permission(AD, Permission.PRODUCT_TOGGLE, Permission.USER_DELETE)
+    assert role_mask("ROOT") == 0
+
+# -------------------- Regras dentro das rotas --------------------
+@pytest.mark.parametrize("permission, roles", [
+    (Permission.ALL_COMPANIES, {SA}),                  # Escopo sem filtro de empresa
+    (Permission.USER_VIEW_ADMINS, {SA, AD}),           # MANAGER não enxerga os ADMIN
+    (Permission.USER_ASSIGN_ROLES, {SA}),              # ADMIN só cria usuários USER
+    (Permission.SYSTEM_MANAGE, {SA}),                  # Acesso em modo de manutenção
+])
+def test_in_route_permissions(permission, roles):
+    assert {role for role in UserRole if has_permission(role, permission)} == roles
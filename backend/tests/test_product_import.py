@@ -0,0 +1,140 @@
+import io
+import uuid
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Company, Movement, Product, User
+from app.models.enum import UserRole
+from app.services import product_import_service
+from app.services.product_import_service import ProductImportService, iter_csv_rows, iter_rows
+from app.services.resource_version_service import PRODUCTS, ResourceVersionService
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def company(db):
+    company = Company(name="Loja", cnpj=uuid.uuid4().hex[:14], token="tok-loja")
+    db.add(company)
+    db.commit()
+    return company
+
+@pytest.fixture
+def user(db, company):
+    user = User(name="Ana", email="ana@x.com", password_hash="x", role=UserRole.ADMIN, company_id=company.id)
+    db.add(user)
+    db.commit()
+    return user
+
+@pytest.fixture(autouse=True)
+def events(monkeypatch):
+    published = []
+    monkeypatch.setattr(product_import_service, "publish_event", published.append)
+    return published
+
+def run(db, company, user, content, encoding="utf-8", **kwargs):
+    rows = iter_csv_rows(io.BytesIO(content.encode(encoding)))
+    return ProductImportService(db).import_rows(rows, company.id, user.id, **kwargs)
+
+def products(db, company):
+    return {product.sku: product for product in db.query(Product).filter_by(company_id=company.id)}
+
+# -------------------- Leitura do arquivo --------------------
+def test_semicolon_csv_with_portuguese_headers_and_decimal_comma(db, company, user):
+    content = "Código;Nome;Preço;Estoque\nCX-1;Caixa;1.234,50;7\n"
+
+    report = run(db, company, user, content, encoding="cp1252")
+
+    assert report["created"] == 1
+    product = products(db, company)["CX-1"]
+    assert (product.name, float(product.price), product.quantity) == ("Caixa", 1234.5, 7)
+
+def test_missing_required_columns_is_rejected(db, company, user):
+    with pytest.raises(ValueError, match="price"):
+        run(db, company, user, "sku,name\nCX-1,Caixa\n")
+
+def test_unsupported_extension_is_rejected():
+    with pytest.raises(ValueError):
+        iter_rows(io.BytesIO(b""), "produtos.pdf")
+
+# -------------------- Upsert --------------------
+def test_import_creates_and_updates_by_sku(db, company, user):
+    run(db, company, user, "sku,name,price,quantity\nCX-1,Caixa,10,5\n")
+
+    report = run(db, company, user, "sku,name,price\nCX-1,Caixa grande,12\nCX-2,Fita,3\n")
+
+    assert (report["created"], report["updated"], report["failed"]) == (1, 1, 0)
+    current = products(db, company)
+    assert (current["CX-1"].name, float(current["CX-1"].price)) == ("Caixa grande", 12)
+    assert current["CX-1"].quantity == 5  # Coluna ausente no arquivo não é sobrescrita
+    assert current["CX-1"].updated_by == user.id
+
+def test_blank_cells_keep_the_stored_values(db, company, user):
+    run(db, company, user, "sku,name,description,price,quantity\nCX-1,Caixa,Papelão,10,5\n")
+
+    report = run(db, company, user, "sku,name,description,price,quantity\nCX-1,Caixa,,11,\nCX-2,Fita,,3,\n")
+
+    assert (report["created"], report["updated"]) == (1, 1)
+    current = products(db, company)
+    assert (current["CX-1"].description, current["CX-1"].quantity, float(current["CX-1"].price)) == ("Papelão", 5, 11)
+    assert (current["CX-2"].description, current["CX-2"].quantity) == (None, 0)
+
+def test_invalid_rows_are_reported_and_skipped(db, company, user):
+    content = "sku,name,price,quantity\nCX-1,Caixa,10,5\n,Sem SKU,1,1\nCX-3,Fita,abc,1\nCX-4,Cola,2,-1\n"
+
+    report = run(db, company, user, content)
+
+    assert (report["created"], report["failed"]) == (1, 3)
+    assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+    assert "price" in report["errors"][1]["error"]
+    assert set(products(db, company)) == {"CX-1"}
+
+def test_repeated_sku_keeps_the_last_row(db, company, user):
+    report = run(db, company, user, "sku,name,price\nCX-1,Primeira,1\nCX-1,Segunda,2\n")
+
+    assert (report["created"], report["failed"]) == (1, 1)
+    assert report["errors"][0]["row"] == 2
+    assert products(db, company)["CX-1"].name == "Segunda"
+
+def test_error_report_is_capped(db, company, user, monkeypatch):
+    monkeypatch.setattr(product_import_service, "PRODUCT_IMPORT_MAX_ERRORS", 2)
+
+    report = run(db, company, user, "sku,name,price\n" + "X,,1\n" * 5)
+
+    assert report["failed"] == 5
+    assert len(report["errors"]) == 2
+    assert report["errors_truncated"]
+
+# -------------------- Lotes --------------------
+def test_each_batch_writes_one_summary_movement(db, company, user, events):
+    content = "sku,name,price\n" + "".join(f"P-{i},Produto {i},{i}\n" for i in range(5))
+    before = ResourceVersionService(db).validators((PRODUCTS,), company.id).etag
+
+    report = run(db, company, user, content, batch_size=2)
+
+    assert report["created"] == 5
+    movements = db.query(Movement).filter_by(company_id=company.id).order_by(Movement.created_at).all()
+    assert len(movements) == 3
+    assert all(movement.entity_id == company.id for movement in movements)
+    assert ResourceVersionService(db).validators((PRODUCTS,), company.id).etag != before
+    assert events == [{"type": "product.changed", "company_id": str(company.id)}]
+
+def test_skus_are_scoped_per_company(db, company, user):
+    other = Company(name="Outra", cnpj=uuid.uuid4().hex[:14], token="tok-outra")
+    db.add(other)
+    db.commit()
+    run(db, other, user, "sku,name,price\nCX-1,Outra caixa,1\n")
+
+    report = run(db, company, user, "sku,name,price\nCX-1,Caixa,10\n")
+
+    assert report["created"] == 1
+    assert products(db, other)["CX-1"].name == "Outra caixa"
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.rate_limit import InMemoryTokenBucket, LoginRateLimiter, create_backend
+from app.models.login_failure import LoginFailure
+from app.routes import auth
+from app.services import login_failure_service
+from app.services.login_failure_service import LoginFailureBuffer, run_login_failure_flush
+
+# -------------------- Helper: relógio controlado --------------------
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now["t"])
+    return now
+
+# -------------------- Token bucket --------------------
+def test_bucket_allows_capacity_then_denies(clock):
+    bucket = InMemoryTokenBucket()
+
+    assert [bucket.consume("k", 3, 1.0) for _ in range(3)] == [0, 0, 0]
+    assert bucket.consume("k", 3, 1.0) == pytest.approx(1.0)
+
+def test_bucket_refills_over_time(clock):
+    bucket = InMemoryTokenBucket()
+    for _ in range(2):
+        bucket.consume("k", 2, 0.5)
+
+    clock["t"] += 2  # 0.5 ficha/s -> 1 ficha
+    assert bucket.consume("k", 2, 0.5) == 0
+    assert bucket.consume("k", 2, 0.5) > 0
+
+def test_bucket_evicts_least_recently_used_keys(clock):
+    bucket = InMemoryTokenBucket(max_keys=2)
+    for key in ("a", "b", "c"):
+        bucket.consume(key, 1, 1.0)
+
+    # "a" foi descartada e volta com o balde cheio
+    assert bucket.consume("a", 1, 1.0) == 0
+    assert bucket.consume("c", 1, 1.0) > 0
+
+def test_create_backend_accepts_custom_class():
+    assert isinstance(create_backend("memory"), InMemoryTokenBucket)
+    assert isinstance(create_backend("app.core.rate_limit:InMemoryTokenBucket"), InMemoryTokenBucket)
+    with pytest.raises(ValueError):
+        create_backend("memcached")
+
+# -------------------- Limite de login --------------------
+def test_login_limiter_keys_by_user_and_ip(clock):
+    limiter = LoginRateLimiter(InMemoryTokenBucket(), ip_capacity=2, ip_per_minute=1, user_capacity=1, user_per_minute=1)
+
+    assert limiter.check("1.1.1.1", "Alice@Example.com") == 0
+    # Mesmo usuário (sem diferenciar maiúsculas), outro IP: bloqueado pelo balde do usuário
+    assert limiter.check("2.2.2.2", "alice@example.com") > 0
+    # Outros usuários do mesmo IP até esgotar o balde do IP
+    assert limiter.check("1.1.1.1", "bob@example.com") == 0
+    assert limiter.check("1.1.1.1", "carol@example.com") > 0
+
+def test_rate_limited_login_never_touches_db_or_hash(monkeypatch):
+    limiter = LoginRateLimiter(InMemoryTokenBucket(), user_capacity=1, user_per_minute=1)
+    limiter.check("9.9.9.9", "alvo@example.com")
+    monkeypatch.setattr(auth, "get_login_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(auth, "verify_and_update_password", pytest.fail)
+
+    buffer = LoginFailureBuffer()
+    monkeypatch.setattr(auth, "login_failure_buffer", buffer)
+
+    class ExplodingSession:
+        def __getattr__(self, name):
+            pytest.fail(f"db.{name} called on a rate-limited login")
+
+    request = Request({"type": "http", "method": "POST", "path": "/auth/login", "headers": [], "client": ("9.9.9.9", 1)})
+    form = OAuth2PasswordRequestForm(username="alvo@example.com", password="x")
+
+    with pytest.raises(HTTPException) as exc:
+        auth.login(request, form_data=form, db=ExplodingSession())
+
+    assert exc.value.status_code == 429
+    assert int(exc.value.headers["Retry-After"]) >= 1
+    assert buffer._pending == 1
+
+# -------------------- Falhas em lote --------------------
+@pytest.fixture
+def failures_db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    LoginFailure.__table__.create(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def test_rate_limited_login_flushes_a_due_batch(monkeypatch, failures_db):
+    limiter = LoginRateLimiter(InMemoryTokenBucket(), user_capacity=1, user_per_minute=1)
+    limiter.check("9.9.9.9", "alvo@example.com")
+    monkeypatch.setattr(auth, "get_login_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(auth, "login_failure_buffer", LoginFailureBuffer(flush_size=1))
+
+    request = Request({"type": "http", "method": "POST", "path": "/auth/login", "headers": [], "client": ("9.9.9.9", 1)})
+    form = OAuth2PasswordRequestForm(username="alvo@example.com", password="x")
+    db = failures_db()
+
+    with pytest.raises(HTTPException):
+        auth.login(request, form_data=form, db=db)
+
+    assert db.query(LoginFailure).one().rate_limited == 1
+    db.close()
+
+def test_periodic_flush_writes_without_new_attempts(monkeypatch, failures_db):
+    buffer = LoginFailureBuffer(flush_size=100, flush_seconds=0)
+    buffer.record("alice@example.com", "1.1.1.1")
+    monkeypatch.setattr(login_failure_service, "login_failure_buffer", buffer)
+    monkeypatch.setattr(login_failure_service, "SessionLocal", failures_db)
+
+    async def scenario():
+        task = asyncio.create_task(run_login_failure_flush(0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+    with failures_db() as db:
+        assert db.query(LoginFailure).one().username == "alice@example.com"
+    assert buffer._pending == 0
+
+def test_failures_are_aggregated_and_flushed_in_one_insert():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    LoginFailure.__table__.create(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    buffer = LoginFailureBuffer(flush_size=4, flush_seconds=3600)
+    buffer.record("alice@example.com", "1.1.1.1")
+    buffer.record("ALICE@example.com", "1.1.1.1", rate_limited=True)
+    buffer.record("bob@example.com", "1.1.1.1")
+    assert not buffer.should_flush()
+
+    buffer.record("alice@example.com", "2.2.2.2")
+    assert buffer.should_flush()
+
+    assert buffer.flush(db) == 3
+    rows = {(r.username, r.ip_address): r for r in db.query(LoginFailure).all()}
+    assert rows[("alice@example.com", "1.1.1.1")].attempts == 2
+    assert rows[("alice@example.com", "1.1.1.1")].rate_limited == 1
+    assert not buffer.should_flush()
+    db.close()
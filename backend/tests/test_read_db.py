@@ -0,0 +1,49 @@
+from starlette.requests import Request
+from app import database
+from app.database import get_read_db, is_pinned_to_primary, READ_PIN_COOKIE, READ_PIN_HEADER
+
+# -------------------- Helper para criar request --------------------
+def make_request(headers=None):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+# -------------------- Testes de pin no primário --------------------
+def test_request_without_pin_is_not_pinned():
+    assert is_pinned_to_primary(make_request()) is False
+
+def test_pin_cookie_pins_to_primary():
+    request = make_request({"Cookie": f"{READ_PIN_COOKIE}=1"})
+    assert is_pinned_to_primary(request) is True
+
+def test_pin_header_pins_to_primary():
+    request = make_request({READ_PIN_HEADER: "true"})
+    assert is_pinned_to_primary(request) is True
+
+# -------------------- Testes de roteamento --------------------
+def test_read_db_falls_back_to_primary_without_replica(monkeypatch):
+    monkeypatch.setattr(database, "ReadSessionLocal", None)
+    primary = object()
+
+    gen = get_read_db(make_request(), db=primary)
+    assert next(gen) is primary
+
+def test_read_db_uses_replica_when_not_pinned(monkeypatch):
+    class FakeSession:
+        closed = False
+        def close(self):
+            self.closed = True
+
+    replica = FakeSession()
+    monkeypatch.setattr(database, "ReadSessionLocal", lambda: replica)
+
+    gen = get_read_db(make_request(), db=object())
+    assert next(gen) is replica
+    gen.close()
+    assert replica.closed is True
+
+def test_read_db_uses_primary_when_pinned(monkeypatch):
+    monkeypatch.setattr(database, "ReadSessionLocal", lambda: object())
+    primary = object()
+
+    gen = get_read_db(make_request({"Cookie": f"{READ_PIN_COOKIE}=1"}), db=primary)
+    assert next(gen) is primary
@@ -0,0 +1,142 @@
+import uuid
+import pytest
+from fastapi import Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from app.core.dependencies import TokenPrincipal
+from app.models import Base, Company, ResourceVersion, User
+from app.models.enum import UserRole
+from app.routes.products import list_products
+from app.schemas.product import ProductCreate
+from app.services.product_service import ProductService
+from app.services.resource_version_service import (
+    COMPANIES, PARTNERS, PRODUCTS, USERS, ListValidators, ResourceVersionService,
+)
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def add_company(db, name):
+    company = Company(name=name, cnpj=uuid.uuid4().hex[:14], token=f"tok-{name}")
+    db.add(company)
+    db.commit()
+    return company
+
+def add_user(db, company):
+    user = User(name="Ana", email=f"{uuid.uuid4().hex[:8]}@x.com", password_hash="x", role=UserRole.ADMIN, company_id=company.id)
+    db.add(user)
+    db.commit()
+    return user
+
+def conditional_request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/products/", "headers": headers})
+
+# -------------------- Contadores --------------------
+def test_bump_creates_and_increments_rows(db):
+    company = add_company(db, "a")
+    service = ResourceVersionService(db)
+
+    service.bump(company.id, PRODUCTS)
+    service.bump(company.id, PRODUCTS, PARTNERS)
+    db.commit()
+
+    versions = {row.resource: row.version for row in db.query(ResourceVersion).filter_by(scope=str(company.id))}
+    assert versions == {PRODUCTS: 2, PARTNERS: 1}
+
+def test_bump_is_rolled_back_with_the_write(db):
+    company = add_company(db, "a")
+    ResourceVersionService(db).bump(company.id, PRODUCTS)
+    db.rollback()
+
+    assert db.query(ResourceVersion).count() == 0
+
+def test_etag_changes_only_for_the_bumped_company(db):
+    first, second = add_company(db, "a"), add_company(db, "b")
+    service = ResourceVersionService(db)
+    before = service.validators((PRODUCTS, USERS), first.id), service.validators((PRODUCTS, USERS), second.id)
+
+    service.bump(first.id, PRODUCTS)
+    db.commit()
+
+    assert service.validators((PRODUCTS, USERS), first.id).etag != before[0].etag
+    assert service.validators((PRODUCTS, USERS), second.id).etag == before[1].etag
+    assert service.validators((PRODUCTS, USERS), first.id).last_modified is not None
+
+def test_global_etag_covers_every_company(db):
+    first, second = add_company(db, "a"), add_company(db, "b")
+    service = ResourceVersionService(db)
+    service.bump(first.id, COMPANIES)
+    db.commit()
+    before = service.validators((COMPANIES,))
+
+    service.bump(second.id, COMPANIES)
+    db.commit()
+
+    assert service.validators((COMPANIES,)).etag != before.etag
+
+def test_etag_depends_on_the_resources_listed(db):
+    company = add_company(db, "a")
+    service = ResourceVersionService(db)
+
+    assert service.validators((PRODUCTS,), company.id).etag != service.validators((PARTNERS,), company.id).etag
+
+# -------------------- Validadores HTTP --------------------
+def test_if_none_match_uses_weak_comparison():
+    validators = ListValidators(etag='W/"abc"')
+
+    assert validators.matches(conditional_request('W/"abc"'))
+    assert validators.matches(conditional_request('"xyz", "abc"'))
+    assert validators.matches(conditional_request("*"))
+    assert not validators.matches(conditional_request('W/"xyz"'))
+    assert not validators.matches(conditional_request())
+
+def test_not_modified_keeps_validators():
+    response = ListValidators(etag='W/"abc"').not_modified()
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.body == b""
+
+# -------------------- Escritas e listagem --------------------
+def test_product_writes_bump_products(db):
+    company = add_company(db, "a")
+    user = add_user(db, company)
+    service = ResourceVersionService(db)
+    before = service.validators((PRODUCTS,), company.id).etag
+
+    ProductService(db).create_product(company.id, user.id, ProductCreate(name="Caixa", sku="CX-1", price=10, quantity=5))
+
+    assert service.validators((PRODUCTS,), company.id).etag != before
+
+def test_list_products_answers_304_until_a_write(db):
+    company = add_company(db, "a")
+    user = add_user(db, company)
+    principal = TokenPrincipal(id=user.id, role=UserRole.ADMIN, company_id=company.id)
+
+    def get(etag=None):
+        response = Response()
+        result = list_products(conditional_request(etag), response, db, principal)
+        return result if isinstance(result, Response) else response
+
+    etag = get().headers["etag"]
+    assert get(etag).status_code == 304
+
+    ProductService(db).create_product(company.id, user.id, ProductCreate(name="Caixa", sku="CX-1", price=10, quantity=5))
+    refreshed = get(etag)
+    assert refreshed.status_code != 304
+    assert refreshed.headers["etag"] != etag
@@ -0,0 +1,171 @@
+import uuid
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import response_cache
+from app.core.dependencies import get_token_principal
+from app.core.maintenance import maintenance_flag
+from app.core.response_cache import (
+    BYPASS_HEADER, CachedResponse, CachedRoute, InMemoryResponseCache, ResponseCacheStats,
+    cached_response, mark_stale,
+)
+from app.core.security import create_access_token
+from app.models.enum import UserRole
+
+COMPANY_A, COMPANY_B = uuid.uuid4(), uuid.uuid4()
+
+@pytest.fixture
+def cache(monkeypatch):
+    backend = InMemoryResponseCache(max_entries=100)
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: backend)
+    monkeypatch.setattr(response_cache, "response_cache_stats", ResponseCacheStats())
+    return backend
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def entry(body=b"[]"):
+    return CachedResponse(200, (("content-type", "application/json"),), body)
+
+# -------------------- Backend em memória --------------------
+def test_memory_backend_evicts_least_recently_used():
+    backend = InMemoryResponseCache(max_entries=2)
+    backend.set("a", entry(), 60)
+    backend.set("b", entry(), 60)
+    backend.get("a")
+    backend.set("c", entry(), 60)
+
+    assert backend.get("a") is not None
+    assert backend.get("b") is None
+
+def test_memory_backend_expires_entries(monkeypatch):
+    backend = InMemoryResponseCache()
+    backend.set("a", entry(), 10)
+    now = response_cache.time.monotonic()
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now + 11)
+
+    assert backend.get("a") is None
+
+def test_cached_response_round_trips_through_bytes():
+    original = CachedResponse(200, (("content-type", "application/json"), ("etag", 'W/"1"')), b'[{"a":1}]')
+
+    assert CachedResponse.from_bytes(original.to_bytes()) == original
+
+# -------------------- Invalidação após commit --------------------
+def generation(cache, scope, tag):
+    return cache.generations([f"{scope}:{tag}"])[0]
+
+def test_commit_bumps_company_and_global_generations(cache, db):
+    db.execute(text("SELECT 1"))
+    mark_stale(db, COMPANY_A, "products")
+    assert generation(cache, COMPANY_A, "products") == 0
+
+    db.commit()
+
+    assert generation(cache, COMPANY_A, "products") == 1
+    assert generation(cache, "*", "products") == 1
+    assert generation(cache, COMPANY_B, "products") == 0
+
+def test_rollback_discards_stale_tags(cache, db):
+    db.execute(text("SELECT 1"))
+    mark_stale(db, COMPANY_A, "products")
+    db.rollback()
+    db.execute(text("SELECT 1"))
+    db.commit()
+
+    assert generation(cache, COMPANY_A, "products") == 0
+
+def test_savepoint_commit_waits_for_the_outer_commit(cache, db):
+    db.execute(text("SELECT 1"))
+    with db.begin_nested():
+        mark_stale(db, COMPANY_A, "products")
+    assert generation(cache, COMPANY_A, "products") == 0
+
+    db.commit()
+    assert generation(cache, COMPANY_A, "products") == 1
+
+# -------------------- Rotas cacheadas --------------------
+@pytest.fixture
+def client(cache):
+    calls = []
+    router = APIRouter(route_class=CachedRoute)
+
+    @router.get("/items")
+    @cached_response("products")
+    def list_items(page: int = 1, principal=Depends(get_token_principal)):
+        calls.append(page)
+        return {"company": str(principal.company_id), "page": page, "call": len(calls)}
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+def auth(company_id, role=UserRole.MANAGER):
+    token = create_access_token(subject=uuid.uuid4(), role=role.value, company_id=company_id)
+    return {"Authorization": f"Bearer {token}"}
+
+def test_second_request_is_served_from_cache(client):
+    first = client.get("/items", headers=auth(COMPANY_A))
+    second = client.get("/items", headers=auth(COMPANY_A))
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert client.calls == [1]
+
+def test_key_includes_company_and_query(client):
+    client.get("/items", headers=auth(COMPANY_A))
+
+    assert client.get("/items", headers=auth(COMPANY_B)).headers["x-cache"] == "MISS"
+    assert client.get("/items?page=2", headers=auth(COMPANY_A)).headers["x-cache"] == "MISS"
+    assert client.get("/items", headers=auth(COMPANY_A, UserRole.USER)).headers["x-cache"] == "MISS"
+
+def test_invalidation_only_affects_the_written_company(client):
+    client.get("/items", headers=auth(COMPANY_A))
+    client.get("/items", headers=auth(COMPANY_B))
+
+    response_cache.invalidate({(str(COMPANY_A), "products")})
+
+    assert client.get("/items", headers=auth(COMPANY_A)).headers["x-cache"] == "MISS"
+    assert client.get("/items", headers=auth(COMPANY_B)).headers["x-cache"] == "HIT"
+
+def test_bypass_header_skips_the_cache(client):
+    client.get("/items", headers=auth(COMPANY_A))
+    response = client.get("/items", headers={**auth(COMPANY_A), BYPASS_HEADER: "1"})
+
+    assert response.headers["x-cache"] == "BYPASS"
+    assert response.json()["call"] == 2
+
+def test_maintenance_mode_is_not_bypassed_by_hits(client):
+    client.get("/items", headers=auth(COMPANY_A))
+    maintenance_flag.set(True)
+
+    response = client.get("/items", headers=auth(COMPANY_A))
+
+    assert response.status_code == 503
+    assert "x-cache" not in response.headers
+    # SYSTEM_ADMIN continua passando
+    assert client.get("/items", headers=auth(None, UserRole.SYSTEM_ADMIN)).status_code == 200
+
+def test_requests_without_token_are_not_cached(client):
+    assert client.get("/items").status_code == 401
+    assert client.calls == []
+
+def test_stats_report_hit_ratio(client):
+    client.get("/items", headers=auth(COMPANY_A))
+    client.get("/items", headers=auth(COMPANY_A))
+    client.get("/items", headers=auth(COMPANY_A))
+    client.get("/items", headers={**auth(COMPANY_A), BYPASS_HEADER: "1"})
+
+    totals = response_cache.response_cache_stats.snapshot()["totals"]
+    assert totals == {"hits": 2, "misses": 1, "bypasses": 1, "hit_ratio": 0.6667}
@@ -0,0 +1,151 @@
+import json
+import uuid
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from pydantic import TypeAdapter
+from fastapi import Response
+from starlette.requests import Request
+
+from app.models import Base, Company, User, Product, Partner, Operation
+from app.models.enum import UserRole, OperationStatus, OperationType
+from app.core.serialization import rows_to_dicts, serialize_list
+from app.repositories.user_repository import list_user_rows
+from app.schemas.user import UserResponse
+from app.schemas.product import ProductOut
+from app.services.product_service import ProductService
+from app.routes import operations as operations_routes
+from app.routes import partner as partner_routes
+from app.schemas.partner import PartnerResponse
+
+
+def list_request():
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+# -------------------- Fixture de banco em memória --------------------
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    company = Company(name="Empresa Teste", cnpj="12345678000199", token="tok-serialization")
+    session.add(company)
+    session.flush()
+
+    user = User(
+        name="Admin",
+        email="admin@serialization.com",
+        password_hash="x",
+        role=UserRole.ADMIN,
+        company_id=company.id,
+    )
+    session.add(user)
+    session.flush()
+
+    session.add(Product(
+        name="Produto",
+        sku="SKU-1",
+        price=10.5,
+        quantity=3,
+        company_id=company.id,
+        created_by=user.id,
+        updated_by=user.id,
+    ))
+
+    partner = Partner(company_id=company.id, name="Parceiro", document="12345678901")
+    session.add(partner)
+    session.flush()
+
+    for number, partner_id in (("OP-1", partner.id), ("OP-2", None)):
+        session.add(Operation(
+            operation_number=number,
+            reference_code=number,
+            company_id=company.id,
+            partner_id=partner_id,
+            status=OperationStatus.CREATED,
+            type=OperationType.DELIVERY,
+            total_value=10.0,
+            created_by=user.id,
+            updated_at=datetime.now(timezone.utc),
+        ))
+    session.commit()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+# -------------------- Helper: caminho padrão (ORM + response_model) --------------------
+def slow_path(schema, objects):
+    adapter = TypeAdapter(list[schema])
+    return json.loads(adapter.dump_json(adapter.validate_python(objects, from_attributes=True)))
+
+# -------------------- Testes de rows_to_dicts --------------------
+def test_rows_to_dicts_groups_prefixed_columns():
+    rows = [{"id": 1, "company__id": 2, "company__name": "ACME"}]
+    assert rows_to_dicts(rows, nested=("company",)) == [
+        {"id": 1, "company": {"id": 2, "name": "ACME"}}
+    ]
+
+def test_rows_to_dicts_null_join_becomes_none():
+    rows = [{"id": 1, "company__id": None, "company__name": None}]
+    assert rows_to_dicts(rows, nested=("company",)) == [{"id": 1, "company": None}]
+
+# -------------------- Equivalência entre os caminhos --------------------
+def test_user_fast_path_matches_orm_path(db):
+    fast = json.loads(serialize_list(UserResponse, list_user_rows(db)).body)
+    assert fast == slow_path(UserResponse, db.query(User).all())
+    assert fast[0]["company"]["name"] == "Empresa Teste"
+
+def test_product_fast_path_matches_orm_path(db):
+    company_id = db.query(Company.id).scalar()
+    service = ProductService(db)
+
+    fast = json.loads(serialize_list(ProductOut, service.list_product_rows(company_id=company_id)).body)
+    assert fast == slow_path(ProductOut, service.list_products(company_id=company_id))
+    assert fast[0]["updated_by_name"] == "Admin"
+
+def test_operation_fast_path_nests_partner(db, monkeypatch):
+    monkeypatch.setattr(operations_routes, "FAST_JSON_RESPONSES", True)
+
+    user = db.query(User).first()
+    response = operations_routes.list_operations(list_request(), Response(), db=db, current_user=user)
+    payload = {item["operation_number"]: item for item in json.loads(response.body)}
+
+    assert payload["OP-1"]["partner"]["name"] == "Parceiro"
+    assert payload["OP-2"]["partner"] is None
+    assert uuid.UUID(payload["OP-1"]["id"])
+
+@pytest.mark.parametrize("fast", [False, True])
+def test_operation_list_is_scoped_to_the_company(db, monkeypatch, fast):
+    user = db.query(User).first()
+    other = Company(name="Outra", cnpj="98765432000199", token="tok-serialization-2")
+    db.add(other)
+    db.flush()
+    db.add(Operation(
+        operation_number="OP-3", company_id=other.id, status=OperationStatus.CREATED,
+        type=OperationType.DELIVERY, total_value=1.0, created_by=user.id, updated_at=datetime.now(timezone.utc),
+    ))
+    db.commit()
+    monkeypatch.setattr(operations_routes, "FAST_JSON_RESPONSES", fast)
+
+    result = operations_routes.list_operations(list_request(), Response(), db=db, current_user=user)
+    numbers = [item["operation_number"] for item in json.loads(result.body)] if fast else [op.operation_number for op in result]
+
+    assert sorted(numbers) == ["OP-1", "OP-2"]
+
+def test_partner_fast_path_matches_orm_path(db, monkeypatch):
+    user = db.query(User).first()
+
+    slow = slow_path(PartnerResponse, partner_routes.list_partners(list_request(), Response(), db=db, current_user=user))
+    monkeypatch.setattr(partner_routes, "FAST_JSON_RESPONSES", True)
+    fast = json.loads(partner_routes.list_partners(list_request(), Response(), db=db, current_user=user).body)
+
+    assert fast == slow
@@ -0,0 +1,85 @@
+import gzip
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.core.spa import IMMUTABLE_CACHE_CONTROL, SpaManifest
+
+# -------------------- dist de teste --------------------
+@pytest.fixture
+def spa_client(tmp_path):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (tmp_path / "index.html").write_text("<html>app</html>")
+    (tmp_path / "vite.svg").write_text("<svg/>")
+    (tmp_path / "apple-touch-icon.png").write_bytes(b"png")
+    (tmp_path / "login-illustration.svg").write_text("<svg/>")
+    (assets / "index-DFLcuNFa.js").write_text("console.log('app')" * 50)
+    (assets / "index-DFLcuNFa.js.gz").write_bytes(gzip.compress(b"console.log('app')" * 50))
+
+    manifest = SpaManifest(str(tmp_path))
+    app = FastAPI()
+
+    @app.get("/{full_path:path}")
+    async def serve(full_path: str, request: Request):
+        return manifest.serve(full_path, request)
+
+    return TestClient(app)
+
+# -------------------- Testes --------------------
+def test_hashed_asset_is_immutable(spa_client):
+    resp = spa_client.get("/assets/index-DFLcuNFa.js", headers={"Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert "content-encoding" not in resp.headers
+
+def test_precompressed_variant_is_served(spa_client):
+    resp = spa_client.get("/assets/index-DFLcuNFa.js", headers={"Accept-Encoding": "gzip, br"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert resp.text == "console.log('app')" * 50
+
+def test_each_encoding_has_its_own_etag(spa_client):
+    identity = spa_client.get("/assets/index-DFLcuNFa.js", headers={"Accept-Encoding": "identity"})
+    gzipped = spa_client.get("/assets/index-DFLcuNFa.js", headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+    assert identity.headers["vary"] == gzipped.headers["vary"] == "Accept-Encoding"
+
+    # O ETag de uma codificação não valida a outra
+    stale = spa_client.get("/assets/index-DFLcuNFa.js", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": identity.headers["etag"],
+    })
+    assert stale.status_code == 200
+    fresh = spa_client.get("/assets/index-DFLcuNFa.js", headers={
+        "Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"],
+    })
+    assert fresh.status_code == 304
+
+def test_unhashed_file_revalidates(spa_client):
+    resp = spa_client.get("/vite.svg")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-cache"
+
+@pytest.mark.parametrize("path", ["/apple-touch-icon.png", "/login-illustration.svg"])
+def test_public_file_with_dash_revalidates(spa_client, path):
+    resp = spa_client.get(path)
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "no-cache"
+
+def test_unknown_route_serves_index_with_etag(spa_client):
+    resp = spa_client.get("/dashboard/operations")
+    assert resp.status_code == 200
+    assert resp.text == "<html>app</html>"
+    etag = resp.headers["etag"]
+
+    resp_304 = spa_client.get("/dashboard/operations", headers={"If-None-Match": etag})
+    assert resp_304.status_code == 304
+    assert resp_304.content == b""
+
+def test_missing_asset_returns_404(spa_client):
+    assert spa_client.get("/assets/missing-AAAAAAAA.js").status_code == 404
+
+def test_path_traversal_is_not_served(spa_client):
+    resp = spa_client.get("/../../etc/passwd")
+    assert resp.text == "<html>app</html>"
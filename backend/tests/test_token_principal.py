@@ -0,0 +1,99 @@
+import time
+import uuid
+import pytest
+from fastapi import HTTPException
+
+from app.core import dependencies, maintenance
+from app.core.dependencies import TokenPrincipal, get_stream_principal, get_token_principal
+from app.core.security import create_access_token
+from app.core.maintenance import MaintenanceFlag
+from app.core.token_denylist import TokenDenylist
+from app.models.enum import UserRole
+
+USER_ID = uuid.uuid4()
+COMPANY_ID = uuid.uuid4()
+
+# -------------------- Denylist isolada por teste --------------------
+@pytest.fixture(autouse=True)
+def denylist(monkeypatch):
+    fresh = TokenDenylist(ttl_seconds=60)
+    monkeypatch.setattr(dependencies, "token_denylist", fresh)
+    return fresh
+
+@pytest.fixture(autouse=True)
+def maintenance_flag(monkeypatch):
+    flag = MaintenanceFlag(ttl_seconds=60)
+    flag.set(False)
+    monkeypatch.setattr(maintenance, "maintenance_flag", flag)
+    return flag
+
+def make_token(role=UserRole.ADMIN, company_id=COMPANY_ID):
+    return create_access_token(subject=USER_ID, role=role, company_id=company_id)
+
+# -------------------- Validação sem banco --------------------
+def test_principal_comes_from_claims():
+    principal = get_token_principal(make_token())
+
+    assert principal == TokenPrincipal(id=USER_ID, role=UserRole.ADMIN, company_id=COMPANY_ID)
+    # Papel continua comparável com strings, como o User.role do ORM
+    assert principal.role == "ADMIN"
+
+def test_system_admin_without_company_is_accepted():
+    principal = get_token_principal(make_token(role=UserRole.SYSTEM_ADMIN, company_id=None))
+    assert principal.company_id is None
+
+@pytest.mark.parametrize("token", [
+    "not-a-jwt",
+    create_access_token(subject=USER_ID, role=UserRole.USER, company_id=None),
+    create_access_token(subject=USER_ID, role="ROOT", company_id=COMPANY_ID),
+])
+def test_invalid_tokens_are_rejected(token):
+    with pytest.raises(HTTPException) as exc:
+        get_token_principal(token)
+    assert exc.value.status_code == 401
+
+def test_stream_principal_accepts_query_token():
+    assert get_stream_principal(bearer=None, token=make_token()).id == USER_ID
+
+    with pytest.raises(HTTPException) as exc:
+        get_stream_principal(bearer=None, token=None)
+    assert exc.value.status_code == 401
+
+# -------------------- Revogação --------------------
+def test_revoked_subject_rejects_older_tokens_only(denylist):
+    old_token = make_token()
+    denylist.revoke_subject(USER_ID)
+
+    with pytest.raises(HTTPException):
+        get_token_principal(old_token)
+
+    # Token emitido depois da revogação (ex: usuário reativado) é aceito
+    time.sleep(0.01)
+    assert get_token_principal(make_token()).id == USER_ID
+
+def test_revoked_company_rejects_its_tokens(denylist):
+    token = make_token()
+    denylist.revoke_company(COMPANY_ID)
+
+    with pytest.raises(HTTPException):
+        get_token_principal(token)
+
+def test_purge_drops_entries_older_than_token_lifetime(denylist):
+    denylist.revoke_subject(USER_ID, at=time.time() - 120)
+    assert denylist.purge() == 1
+
+    # Novas revogações também limpam as expiradas
+    denylist.revoke_subject(USER_ID, at=time.time() - 120)
+    denylist.revoke_company(COMPANY_ID)
+    assert len(denylist) == 1
+
+# -------------------- Manutenção --------------------
+def test_maintenance_mode_blocks_all_but_system_admins(maintenance_flag):
+    maintenance_flag.set(True)
+
+    with pytest.raises(HTTPException) as exc:
+        get_token_principal(make_token())
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "3600"
+
+    assert get_token_principal(make_token(role=UserRole.SYSTEM_ADMIN, company_id=None)).company_id is None
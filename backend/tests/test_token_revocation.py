@@ -0,0 +1,96 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.security import create_access_token, decode_access_token
+from app.core.token_denylist import BloomFilter, TokenDenylist
+from app.models.token_revocation import TokenRevocation
+from app.services.token_revocation_service import TokenRevocationService
+
+# -------------------- Banco em memória --------------------
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TokenRevocation.__table__.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+def make_payload():
+    return decode_access_token(
+        create_access_token(subject=uuid.uuid4(), role="ADMIN", company_id=uuid.uuid4())
+    )
+
+# -------------------- Bloom filter --------------------
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [uuid.uuid4().hex for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(5000))
+    assert false_positives < 5000 * 0.03
+
+# -------------------- Denylist por jti --------------------
+def test_tokens_carry_unique_jti():
+    assert make_payload()["jti"] != make_payload()["jti"]
+
+def test_revoked_jti_is_rejected_until_it_expires():
+    denylist = TokenDenylist(bloom_capacity=4)
+    payload = make_payload()
+    denylist.revoke_token(payload["jti"], payload["exp"])
+
+    assert denylist.is_revoked(payload)
+    assert not denylist.is_revoked(make_payload())
+
+    # Depois da expiração a entrada sai do conjunto e do Bloom filter
+    assert denylist.purge(now=payload["exp"] + 1) == 1
+    assert not denylist.is_revoked(payload)
+
+def test_bloom_grows_past_its_capacity():
+    denylist = TokenDenylist(bloom_capacity=2)
+    payloads = [make_payload() for _ in range(5)]
+    for payload in payloads:
+        denylist.revoke_token(payload["jti"], payload["exp"])
+
+    assert all(denylist.is_revoked(payload) for payload in payloads)
+
+# -------------------- Persistência --------------------
+def test_revocations_are_persisted_and_synced_by_other_instances(db):
+    payload = make_payload()
+    user_id = uuid.uuid4()
+
+    local = TokenRevocationService(db, TokenDenylist())
+    assert local.revoke_token(payload)
+    local.revoke_subject(user_id)
+    assert local.denylist.is_revoked(payload)
+
+    # Outra instância, com a denylist vazia, lê o que foi gravado
+    other = TokenRevocationService(db, TokenDenylist())
+    watermark = other.sync()
+
+    assert other.denylist.is_revoked(payload)
+    assert other.denylist.is_revoked({"sub": str(user_id), "iat": time.time() - 60})
+    assert watermark is not None
+
+def test_token_without_jti_is_not_persisted(db):
+    service = TokenRevocationService(db, TokenDenylist())
+    assert service.revoke_token({"sub": "x", "exp": time.time() + 60}) is False
+    assert db.query(TokenRevocation).count() == 0
+
+def test_purge_removes_expired_rows(db):
+    service = TokenRevocationService(db, TokenDenylist())
+    now = datetime.now(timezone.utc)
+    db.add_all([
+        TokenRevocation(kind="jti", key="expired", revoked_at=now - timedelta(hours=2), expires_at=now - timedelta(hours=1)),
+        TokenRevocation(kind="jti", key="active", revoked_at=now, expires_at=now + timedelta(hours=1)),
+    ])
+    db.commit()
+
+    assert service.purge_expired() == 1
+    assert [row.key for row in db.query(TokenRevocation).all()] == ["active"]